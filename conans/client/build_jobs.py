@@ -0,0 +1,86 @@
+"""
+Support to build several independent packages at the same time, in different threads.
+
+The current directory, the environment variables and the sys.path are process-wide, and the
+recipes and build helpers rely heavily on them (tools.chdir(), tools.environment_append(),
+self.run()...). To keep them consistent, the python code of the concurrent jobs is serialized,
+each job holds the process state while it runs, and only releases it while waiting for a
+subprocess (the compiler, cmake, make...) to finish. That state is saved before releasing it
+and restored after acquiring it again, so every job always sees its own current directory
+and environment.
+
+So the jobs only really run at the same time while waiting for their subprocesses: the python
+code of the recipes, the generators and the cache operations (copying sources, packaging...)
+of all the jobs run one after the other. Some installer state (the processed package references,
+the env_info of the build requirements) is shared by the jobs without other locks, relying on
+this serialization: it must be protected before relaxing the _process_state lock.
+"""
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+# Serializes all the python side of the jobs, not only the cwd, environ and sys.path changes
+_process_state = threading.Lock()
+_current = threading.local()
+
+
+class _ProcessState(object):
+
+    def __init__(self):
+        self._cwd = os.getcwd()
+        self._environ = os.environ.copy()
+        self._sys_path = sys.path[:]
+
+    def restore(self):
+        if os.getcwd() != self._cwd:
+            os.chdir(self._cwd)
+        if os.environ != self._environ:
+            os.environ.clear()
+            os.environ.update(self._environ)
+        if sys.path != self._sys_path:
+            sys.path[:] = self._sys_path
+
+
+def current_job():
+    """ the name of the job running in the current thread, None if not running a job
+    """
+    return getattr(_current, "name", None)
+
+
+@contextmanager
+def build_job(name, cpu_count=None):
+    """ runs the block as a concurrent job, holding the process state during all the time
+    except when waiting for subprocesses
+    :param name: name of the job, used to prefix the output of the subprocesses
+    :param cpu_count: the job budget assigned to this job (CONAN_CPU_COUNT), so concurrent jobs
+                      do not oversubscribe the machine
+    """
+    with _process_state:
+        state = _ProcessState()
+        _current.name = name
+        try:
+            if cpu_count is not None:
+                os.environ["CONAN_CPU_COUNT"] = str(cpu_count)
+            yield
+        finally:
+            _current.name = None
+            state.restore()
+
+
+@contextmanager
+def subprocess_wait():
+    """ to be used while waiting for a subprocess that has already been launched: it allows
+    other jobs to run their python code meanwhile. Does nothing outside of a job
+    """
+    if current_job() is None:
+        yield
+        return
+
+    state = _ProcessState()
+    _process_state.release()
+    try:
+        yield
+    finally:
+        _process_state.acquire()
+        state.restore()
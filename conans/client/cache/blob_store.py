@@ -0,0 +1,107 @@
+"""
+Content-addressed storage of the package files of the local cache.
+
+Many packages contain identical files (the same headers in every binary configuration, for
+example). When deduplicated, the files of the package folders are hardlinks to a single copy of
+their contents stored in the blob store, named after their md5 (as recorded in the package
+conanmanifest.txt) and permissions. The files that are no longer referenced by any package
+(the blob is the only remaining link) can be removed with BlobStore.clean().
+
+Package files are never modified in place by Conan, removing or rebuilding a package replaces
+its files, so sharing them is safe as long as the users do not edit the files of the cache.
+"""
+import os
+import stat
+
+import six
+
+from conans.model.manifest import FileTreeManifest
+from conans.util.files import md5sum, mkdir
+from conans.util.log import logger
+
+BLOBS_FOLDER = ".blobs"
+
+
+def _replace(src, dst):
+    if six.PY2:
+        if os.path.exists(dst) and os.name == "nt":
+            os.remove(dst)
+        os.rename(src, dst)
+    else:
+        os.replace(src, dst)
+
+
+class BlobStore(object):
+
+    def __init__(self, folder):
+        self._folder = folder
+
+    @property
+    def folder(self):
+        return self._folder
+
+    def _blob_path(self, md5, mode):
+        return os.path.join(self._folder, md5[:2], "%s_%o" % (md5, stat.S_IMODE(mode)))
+
+    def dedup_folder(self, folder, manifest=None):
+        """ replaces the files of folder by hardlinks to the blob store, adding to the store the
+        files whose contents were not there yet
+        :param folder: a package folder
+        :param manifest: the FileTreeManifest of the folder, read from the folder if None
+        :return: (number of files that were replaced by an existing blob, bytes saved)
+        """
+        if manifest is None:
+            manifest = FileTreeManifest.load(folder)
+        linked, saved = 0, 0
+        for filename, md5 in sorted(manifest.file_sums.items()):
+            path = os.path.join(folder, filename)
+            try:
+                if os.path.islink(path) or not os.path.isfile(path):
+                    continue
+                file_stat = os.stat(path)
+                blob = self._blob_path(md5, file_stat.st_mode)
+                try:
+                    blob_stat = os.stat(blob)
+                except OSError:
+                    # New contents. Do not trust blindly the manifest, the store is shared
+                    if md5sum(path) != md5:
+                        logger.warning("DEDUP: %s doesn't match its manifest md5" % path)
+                        continue
+                    mkdir(os.path.dirname(blob))
+                    os.link(path, blob)
+                    continue
+                if (blob_stat.st_ino == file_stat.st_ino and
+                        blob_stat.st_dev == file_stat.st_dev):
+                    continue  # Already deduplicated
+                if blob_stat.st_size != file_stat.st_size:
+                    logger.warning("DEDUP: %s size doesn't match blob %s" % (path, blob))
+                    continue
+                tmp = path + ".dedup"
+                os.link(blob, tmp)
+                _replace(tmp, path)
+                linked += 1
+                saved += file_stat.st_size
+            except OSError as e:
+                # Different devices (short_paths), file systems without hardlinks...
+                logger.warning("DEDUP: cannot deduplicate %s: %s" % (path, str(e)))
+        return linked, saved
+
+    def clean(self):
+        """ removes the blobs that are not used by any package anymore
+        :return: (number of blobs removed, bytes freed)
+        """
+        removed, freed = 0, 0
+        if not os.path.isdir(self._folder):
+            return removed, freed
+        for subfolder in os.listdir(self._folder):
+            subfolder = os.path.join(self._folder, subfolder)
+            for blob in os.listdir(subfolder):
+                blob = os.path.join(subfolder, blob)
+                blob_stat = os.stat(blob)
+                if blob_stat.st_nlink == 1:
+                    os.remove(blob)
+                    removed += 1
+                    freed += blob_stat.st_size
+            if not os.listdir(subfolder):
+                os.rmdir(subfolder)
+        return removed, freed
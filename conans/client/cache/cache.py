@@ -1,3 +1,5 @@
+import hashlib
+import marshal
 import os
 import platform
 import shutil
@@ -6,7 +8,9 @@ from collections import OrderedDict
 from jinja2 import Environment, select_autoescape, FileSystemLoader, ChoiceLoader
 
 from conans.assets.templates import dict_loader
+from conans.client.cache.blob_store import BLOBS_FOLDER, BlobStore
 from conans.client.cache.editable import EditablePackages
+from conans.client.cache.index import CACHE_INDEX, CacheIndex
 from conans.client.cache.remote_registry import RemoteRegistry
 from conans.client.conf import ConanClientConfigParser, get_default_client_conf, \
     get_default_settings_yml
@@ -24,15 +28,21 @@ from conans.paths.package_layouts.package_editable_layout import PackageEditable
 from conans.unicode import get_cwd
 from conans.util.files import list_folder_subdirs, load, normalize, save, remove
 from conans.util.locks import Lock
+from conans.util.log import logger
 
 CONAN_CONF = 'conan.conf'
 CONAN_SETTINGS = "settings.yml"
+CONAN_SETTINGS_CACHE = "settings.yml.cache"
 LOCALDB = ".conan.db"
 REMOTES = "remotes.json"
 PROFILES_FOLDER = "profiles"
 HOOKS_FOLDER = "hooks"
 TEMPLATES_FOLDER = "templates"
 GENERATORS_FOLDER = "generators"
+ACCESS_TIMES_FOLDER = "access_times"
+
+# The settings.yml already parsed in this process, by hash of its contents
+_parsed_settings = {}
 
 
 def _is_case_insensitive_os():
@@ -76,7 +86,9 @@ class ClientCache(object):
 
         # Caching
         self._no_lock = None
+        self._fcntl_lock = None
         self._config = None
+        self._index = None
         self.editable_packages = EditablePackages(self.cache_folder)
         # paths
         self._store_folder = self.config.storage_path or os.path.join(self.cache_folder, "data")
@@ -84,6 +96,8 @@ class ClientCache(object):
         _ = self.config.short_paths_home
 
     def all_refs(self):
+        if self.index is not None:
+            return self.index.refs()
         subdirs = list_folder_subdirs(basedir=self._store_folder, level=4)
         return [ConanFileReference.load_dir_repr(folder) for folder in subdirs]
 
@@ -91,6 +105,26 @@ class ClientCache(object):
     def store(self):
         return self._store_folder
 
+    @property
+    def index(self):
+        """ The CacheIndex of the storage folder if general.cache_index is enabled, None otherwise.
+        A disabled index is removed, as it is not updated anymore
+        """
+        if self._index is None:
+            index_path = os.path.join(self._store_folder, CACHE_INDEX)
+            if self.config.cache_index:
+                self._index = CacheIndex.create(index_path, self._store_folder)
+            else:
+                if os.path.exists(index_path):
+                    remove(index_path)
+                self._index = False
+        return self._index or None
+
+    @property
+    def blob_store(self):
+        # Inside the store, so the package folders can be hardlinked to it
+        return BlobStore(os.path.join(self._store_folder, BLOBS_FOLDER))
+
     def installed_as_editable(self, ref):
         return isinstance(self.package_layout(ref), PackageEditableLayout)
 
@@ -109,8 +143,11 @@ class ClientCache(object):
         else:
             _check_ref_case(ref, self.store)
             base_folder = os.path.normpath(os.path.join(self.store, ref.dir_repr()))
+            access_folder = os.path.join(self.cache_folder, ACCESS_TIMES_FOLDER, ref.dir_repr())
             return PackageCacheLayout(base_folder=base_folder, ref=ref,
-                                      short_paths=short_paths, no_lock=self._no_locks())
+                                      short_paths=short_paths, no_lock=self._no_locks(),
+                                      index=self.index, access_folder=access_folder,
+                                      fcntl_locks=self._fcntl_locks())
 
     @property
     def remotes_path(self):
@@ -125,6 +162,14 @@ class ClientCache(object):
             self._no_lock = self.config.cache_no_locks
         return self._no_lock
 
+    def _fcntl_locks(self):
+        if self._fcntl_lock is None:
+            self._fcntl_lock = self.config.cache_locks == "fcntl"
+            if self._fcntl_lock and platform.system() == "Windows":
+                raise ConanException("The 'fcntl' cache locks are not available in Windows, "
+                                     "use 'cache_locks = count'")
+        return self._fcntl_lock
+
     @property
     def artifacts_properties_path(self):
         return os.path.join(self.cache_folder, ARTIFACTS_PROPERTIES_FILE)
@@ -207,7 +252,33 @@ class ClientCache(object):
            settings without values"""
         self.initialize_settings()
         content = load(self.settings_path)
-        return Settings.loads(content)
+        content_hash = hashlib.sha1(content.encode("utf-8")).digest()
+        settings = _parsed_settings.get(content_hash)
+        if settings is None:
+            settings = Settings.from_definition(self._settings_definition(content, content_hash))
+            _parsed_settings[content_hash] = settings
+        # The copies are copy-on-write, it is cheap to give each caller its own
+        return settings.copy()
+
+    def _settings_definition(self, content, content_hash):
+        """ parsing the YAML of the default settings.yml is slow, it is also stored parsed in a
+        binary file next to it, valid while the settings.yml contents don't change
+        """
+        cache_path = os.path.join(self.cache_folder, CONAN_SETTINGS_CACHE)
+        header = content_hash + str(marshal.version).encode()
+        try:
+            data = load(cache_path, binary=True)
+            if data.startswith(header):
+                return marshal.loads(data[len(header):])
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            pass
+
+        definition = Settings.loads_definition(content)
+        try:
+            save(cache_path, header + marshal.dumps(definition))
+        except (IOError, OSError, ValueError) as e:
+            logger.debug("SETTINGS: cannot store the parsed settings.yml: %s" % str(e))
+        return definition
 
     @property
     def hooks(self):
@@ -231,10 +302,12 @@ class ClientCache(object):
 
     def delete_empty_dirs(self, deleted_refs):
         """ Method called by ConanRemover.remove() to clean up from the cache empty folders
+        and the index
         :param deleted_refs: The recipe references that the remove() has been removed
         """
         for ref in deleted_refs:
-            ref_path = self.package_layout(ref).base_folder()
+            layout = self.package_layout(ref)
+            ref_path = layout.base_folder()
             for _ in range(4):
                 if os.path.exists(ref_path):
                     try:  # Take advantage that os.rmdir does not delete non-empty dirs
@@ -242,12 +315,15 @@ class ClientCache(object):
                     except OSError:
                         break  # not empty
                 ref_path = os.path.dirname(ref_path)
+            if self.index is not None and isinstance(layout, PackageCacheLayout):
+                self.index.update_ref(layout)
+        PackageCacheLayout.writes += 1
 
     def remove_locks(self):
         folders = list_folder_subdirs(self._store_folder, 4)
         for folder in folders:
             conan_folder = os.path.join(self._store_folder, folder)
-            Lock.clean(conan_folder)
+            Lock.clean(conan_folder, fcntl_locks=True)
             shutil.rmtree(os.path.join(conan_folder, "locks"), ignore_errors=True)
 
     def get_template(self, template_name, user_overrides=False):
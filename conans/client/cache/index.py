@@ -0,0 +1,204 @@
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from conans.errors import ConanException, RecipeNotFoundException
+from conans.model.info import ConanInfo
+from conans.model.package_metadata import PackageMetadata
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import CONANINFO
+from conans.paths.package_layouts.package_cache_layout import PackageCacheLayout
+from conans.util.files import list_folder_subdirs, load, mkdir
+from conans.util.log import logger
+
+CACHE_INDEX = ".conan_index.db"
+INDEX_VERSION = "1"
+RECIPES_TABLE = "recipes"
+PACKAGES_TABLE = "packages"
+INFO_TABLE = "index_info"
+
+
+class CacheIndex(object):
+    """ sqlite index of the references, revisions and packages in the storage folder of the
+    cache, with the conaninfo.txt of every package already serialized for the searches.
+
+    The PackageCacheLayout keeps it updated every time it saves the metadata of a reference or
+    removes a package, the folders of the storage are still the source of truth and
+    'rebuild()' recreates it from them.
+    """
+
+    def __init__(self, dbfile, store_folder):
+        self.dbfile = dbfile
+        self._store_folder = store_folder
+
+    @staticmethod
+    def create(dbfile, store_folder):
+        """ opens the index, creating it and populating it from the storage folder if it
+        doesn't exist or it was not completely built
+        """
+        mkdir(os.path.dirname(dbfile))
+        index = CacheIndex(dbfile, store_folder)
+        with index._connect() as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("create table if not exists %s (key TEXT UNIQUE, value TEXT)"
+                               % INFO_TABLE)
+                cursor.execute("create table if not exists %s (ref TEXT UNIQUE, name TEXT, "
+                               "version TEXT, user TEXT, channel TEXT, revision TEXT)"
+                               % RECIPES_TABLE)
+                cursor.execute("create table if not exists %s (ref TEXT, package_id TEXT, "
+                               "recipe_revision TEXT, revision TEXT, info TEXT, "
+                               "UNIQUE (ref, package_id))" % PACKAGES_TABLE)
+                cursor.execute("create index if not exists recipes_name on %s (name)"
+                               % RECIPES_TABLE)
+                connection.commit()
+                cursor.execute("select value from %s where key='version'" % INFO_TABLE)
+                version = cursor.fetchone()
+            except Exception as e:
+                raise ConanException("Could not initialize the cache index '%s': %s"
+                                     % (dbfile, str(e)))
+        if version is None or version[0] != INDEX_VERSION:
+            index.rebuild()
+        return index
+
+    @contextmanager
+    def _connect(self):
+        # Several Conan processes can share the cache, wait for the write transactions of others
+        connection = sqlite3.connect(self.dbfile, timeout=60)
+        connection.text_factory = str
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def rebuild(self):
+        """ Drops the contents of the index and indexes again all the references in the storage
+        folder. Everything is done in a single transaction, an interrupted rebuild leaves the
+        previous index
+        """
+        with self._connect() as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("DELETE FROM %s" % RECIPES_TABLE)
+                cursor.execute("DELETE FROM %s" % PACKAGES_TABLE)
+                for folder in list_folder_subdirs(basedir=self._store_folder, level=4):
+                    ref = ConanFileReference.load_dir_repr(folder)
+                    layout = PackageCacheLayout(os.path.join(self._store_folder, folder), ref,
+                                                short_paths=None, no_lock=True)
+                    self._update_ref(cursor, layout)
+                cursor.execute("INSERT OR REPLACE INTO %s (key, value) VALUES ('version', ?)"
+                               % INFO_TABLE, (INDEX_VERSION, ))
+                connection.commit()
+            except Exception as e:
+                raise ConanException("Could not rebuild the cache index '%s': %s"
+                                     % (self.dbfile, str(e)))
+
+    def update_ref(self, layout, metadata=None):
+        """ indexes again the recipe and the packages of the layout reference, or drops them if
+        its folder doesn't exist anymore. Only the conaninfo.txt of the new packages or the ones
+        with different revisions are read
+        """
+        with self._connect() as connection:
+            try:
+                cursor = connection.cursor()
+                self._update_ref(cursor, layout, metadata)
+                connection.commit()
+            except Exception as e:
+                raise ConanException("Could not update the cache index '%s': %s"
+                                     % (self.dbfile, str(e)))
+
+    @staticmethod
+    def _update_ref(cursor, layout, metadata=None):
+        ref = layout.ref.copy_clear_rev()
+        key = repr(ref)
+        if not os.path.isdir(layout.base_folder()):
+            cursor.execute("DELETE FROM %s WHERE ref=?" % RECIPES_TABLE, (key, ))
+            cursor.execute("DELETE FROM %s WHERE ref=?" % PACKAGES_TABLE, (key, ))
+            return
+
+        if metadata is None:
+            try:
+                metadata = layout.load_metadata()
+            except RecipeNotFoundException:
+                metadata = PackageMetadata()
+        cursor.execute("INSERT OR REPLACE INTO %s (ref, name, version, user, channel, revision) "
+                       "VALUES (?, ?, ?, ?, ?, ?)" % RECIPES_TABLE,
+                       (key, ref.name, ref.version, ref.user, ref.channel,
+                        metadata.recipe.revision))
+
+        cursor.execute("SELECT package_id, recipe_revision, revision FROM %s WHERE ref=?"
+                       % PACKAGES_TABLE, (key, ))
+        indexed = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        package_ids = layout.package_ids()
+        for package_id in package_ids:
+            package_metadata = metadata.packages.get(package_id)
+            revisions = ((package_metadata.recipe_revision, package_metadata.revision)
+                         if package_metadata else (None, None))
+            if revisions[1] is not None and indexed.get(package_id) == revisions:
+                continue
+            info_path = os.path.join(layout.package(PackageReference(layout.ref, package_id)),
+                                     CONANINFO)
+            if not os.path.exists(info_path):  # Not finished yet, or broken
+                cursor.execute("DELETE FROM %s WHERE ref=? AND package_id=?" % PACKAGES_TABLE,
+                               (key, package_id))
+                continue
+            info = ConanInfo.loads(load(info_path)).serialize_min()
+            cursor.execute("INSERT OR REPLACE INTO %s (ref, package_id, recipe_revision, "
+                           "revision, info) VALUES (?, ?, ?, ?, ?)" % PACKAGES_TABLE,
+                           (key, package_id, revisions[0], revisions[1], json.dumps(info)))
+        for package_id in set(indexed).difference(package_ids):
+            cursor.execute("DELETE FROM %s WHERE ref=? AND package_id=?" % PACKAGES_TABLE,
+                           (key, package_id))
+
+    def remove_package(self, pref):
+        with self._connect() as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("DELETE FROM %s WHERE ref=? AND package_id=?" % PACKAGES_TABLE,
+                               (repr(pref.ref.copy_clear_rev()), pref.id))
+                connection.commit()
+            except Exception as e:
+                raise ConanException("Could not update the cache index '%s': %s"
+                                     % (self.dbfile, str(e)))
+
+    def _query(self, statement, parameters=()):
+        with self._connect() as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute(statement, parameters)
+                return cursor.fetchall()
+            except Exception as e:
+                logger.error("Error querying the cache index: %s" % str(e))
+                raise ConanException("Could not read the cache index, rebuild it with 'conan "
+                                     "cache rebuild-index' or remove '%s'" % self.dbfile)
+
+    def refs(self, name=None):
+        """ all the references in the cache, or the ones with the given name (case insensitive)
+        """
+        if name is None:
+            rows = self._query("SELECT ref FROM %s" % RECIPES_TABLE)
+        else:
+            rows = self._query("SELECT ref FROM %s WHERE name=? COLLATE NOCASE" % RECIPES_TABLE,
+                               (name, ))
+        return [ConanFileReference.loads(row[0]) for row in rows]
+
+    def packages_infos(self, ref):
+        """ same as reading the conaninfo.txt of every package of the reference:
+        {package_id: ConanInfo.serialize_min()}, only the packages of the ref revision if any
+        """
+        rows = self._query("SELECT package_id, recipe_revision, info FROM %s WHERE ref=? "
+                           "ORDER BY package_id" % PACKAGES_TABLE,
+                           (repr(ref.copy_clear_rev()), ))
+        result = OrderedDict()
+        for package_id, recipe_revision, info in rows:
+            if ref.revision and recipe_revision and recipe_revision != ref.revision:
+                continue
+            result[package_id] = json.loads(info)
+        return result
+
+    def count(self):
+        recipes = self._query("SELECT COUNT(*) FROM %s" % RECIPES_TABLE)[0][0]
+        packages = self._query("SELECT COUNT(*) FROM %s" % PACKAGES_TABLE)[0][0]
+        return recipes, packages
@@ -0,0 +1,180 @@
+import os
+import time
+
+from conans.client.downloaders.cached_file_downloader import CachedFileDownloader
+from conans.client.graph.graph_cache import GraphCache
+from conans.client.tools.files import human_size
+from conans.errors import ConanException
+from conans.model.ref import PackageReference
+from conans.paths import BUILD_FOLDER, PACKAGES_FOLDER, SRC_FOLDER, rm_conandir
+from conans.util.dates import size_from_text, timedelta_from_text
+from conans.util.locks import LockBusy
+from conans.util.log import logger
+
+
+def cmd_cache_dedup(cache, output):
+    """ deduplicates the files of all the packages in the cache, and removes the blobs that are
+    not used anymore
+    """
+    blob_store = cache.blob_store
+    linked, saved = 0, 0
+    for ref in cache.all_refs():
+        if cache.installed_as_editable(ref):
+            continue
+        layout = cache.package_layout(ref, short_paths=None)
+        for package_id in layout.package_ids():
+            pref = PackageReference(ref, package_id)
+            if layout.package_is_dirty(pref):
+                output.warn("%s: Package is corrupted, skipping it" % str(pref))
+                continue
+            with layout.package_lock(pref):
+                try:
+                    files, size = blob_store.dedup_folder(layout.package(pref))
+                except (IOError, OSError) as e:  # No manifest
+                    logger.warning("DEDUP: cannot deduplicate %s: %s" % (str(pref), str(e)))
+                    output.warn("%s: Cannot read the package manifest, skipping it" % str(pref))
+                    continue
+            linked += files
+            saved += size
+    removed, freed = blob_store.clean()
+    output.info("Deduplicated %s files, %s saved" % (linked, human_size(saved)))
+    output.info("Removed %s unused blobs, %s freed" % (removed, human_size(freed)))
+    return {"deduplicated": linked, "saved": saved, "removed": removed, "freed": freed}
+
+
+def cmd_cache_rebuild_index(cache, output):
+    """ indexes again all the recipes and packages of the cache, to recover from an index out of
+    sync with the folders (modified manually, or by Conan versions without the index)
+    """
+    index = cache.index
+    if index is None:
+        raise ConanException("The cache index is not enabled, enable it with "
+                             "'conan config set general.cache_index=True'")
+    index.rebuild()
+    recipes, packages = index.count()
+    output.info("Indexed %s recipes and %s packages" % (recipes, packages))
+    return {"recipes": recipes, "packages": packages}
+
+
+def _folder_size(folder, seen, excluded=()):
+    """ size of the files in the folder, the hardlinked ones (cache dedup) are counted once
+    """
+    size = 0
+    for root, dirs, files in os.walk(folder):
+        if root == folder:
+            dirs[:] = [d for d in dirs if d not in excluded]
+        for f in files:
+            try:
+                file_stat = os.lstat(os.path.join(root, f))
+            except OSError:
+                continue
+            if (file_stat.st_dev, file_stat.st_ino) not in seen:
+                seen.add((file_stat.st_dev, file_stat.st_ino))
+                size += file_stat.st_size
+    return size
+
+
+def _evict(layout, kind, pref, output):
+    """ removes the package, build or source folder, unless other process is using them
+    :return: True if it was removed
+    """
+    try:
+        if kind == "package":
+            with layout.package_lock(pref, blocking=False):
+                layout.package_remove(pref)
+                with layout.update_metadata() as metadata:
+                    metadata.clear_package(pref.id)
+        else:
+            with layout.conanfile_write_lock(output, blocking=False):
+                rm_conandir(layout.build(pref) if kind == "build" else layout.source())
+    except LockBusy:
+        output.warn("%s: The %s folder is being used by other process, skipping it"
+                    % (str(pref or layout.ref), kind))
+        return False
+    except (OSError, ConanException) as e:
+        output.warn("%s: Cannot remove the %s folder: %s" % (str(pref or layout.ref), kind, e))
+        return False
+    return True
+
+
+def _clean_download_cache(cache, output):
+    config = cache.config
+    max_size, max_age = config.download_cache_max_size, config.download_cache_max_age
+    if not config.download_cache or (max_size is None and max_age is None):
+        return None
+    if not os.path.isdir(config.download_cache):
+        return None
+    downloader = CachedFileDownloader(config.download_cache, None)
+    removed, freed, size = downloader.evict(max_size, max_age)
+    output.info("Removed %s files of the download cache, %s freed. Download cache size: %s"
+                % (removed, human_size(freed), human_size(size)))
+    return {"removed": removed, "freed": freed, "size": size}
+
+
+def cmd_cache_clean(cache, output, max_size=None, max_age=None):
+    """ removes the package, build and source folders of the cache not used in more than max_age,
+    and then the least recently used ones until the cache is smaller than max_size. The recipes
+    are kept, and the folders in use by other Conan processes are skipped.
+    The download cache is cleaned too, with its own limits (storage.download_cache_max_size and
+    storage.download_cache_max_age in conan.conf), and the stored graphs of general.graph_cache
+    not used in more than max_age
+    """
+    download_cache = _clean_download_cache(cache, output)
+    if max_size is None and max_age is None:
+        if download_cache is not None:
+            return {"download_cache": download_cache}
+        raise ConanException("Define the maximum size (--max-size) and/or the maximum age "
+                             "(--max-age) of the cache")
+    max_size = size_from_text(max_size) if max_size is not None else None
+    max_age = timedelta_from_text(max_age).total_seconds() if max_age is not None else None
+
+    graphs = GraphCache(cache).evict(max_age=max_age) if max_age is not None else 0
+
+    seen = set()
+    total = 0
+    items = []  # [(last access, size, kind, layout, pref)]
+    for ref in cache.all_refs():
+        if cache.installed_as_editable(ref):
+            continue
+        layout = cache.package_layout(ref, short_paths=None)
+        total += _folder_size(layout.base_folder(), seen,
+                              excluded=(SRC_FOLDER, BUILD_FOLDER, PACKAGES_FOLDER))
+        folders = [("source", None, layout.source())]
+        for package_id in layout.conan_builds():
+            pref = PackageReference(ref, package_id)
+            folders.append(("build", pref, layout.build(pref)))
+        for package_id in layout.package_ids():
+            pref = PackageReference(ref, package_id)
+            folders.append(("package", pref, layout.package(pref)))
+        for kind, pref, folder in folders:
+            if not os.path.isdir(folder):
+                continue
+            # The build and source folders are only used while building
+            access = layout.last_access(pref) if kind == "package" else os.path.getmtime(folder)
+            size = _folder_size(folder, seen)
+            total += size
+            items.append((access or 0, size, kind, layout, pref))
+
+    items.sort(key=lambda item: item[0])
+    removed = {"package": 0, "build": 0, "source": 0}
+    freed = 0
+    now = time.time()
+    for access, size, kind, layout, pref in items:
+        too_old = max_age is not None and now - access > max_age
+        too_big = max_size is not None and total > max_size
+        if not too_old and not too_big:
+            continue
+        if _evict(layout, kind, pref, output):
+            removed[kind] += 1
+            freed += size
+            total -= size
+    cache.blob_store.clean()  # The files of the removed packages that were deduplicated
+
+    output.info("Removed %s packages, %s build folders and %s source folders, %s freed"
+                % (removed["package"], removed["build"], removed["source"], human_size(freed)))
+    if graphs:
+        output.info("Removed %s stored dependency graphs" % graphs)
+    output.info("Cache size: %s" % human_size(total))
+    return {"packages": removed["package"], "builds": removed["build"],
+            "sources": removed["source"], "freed": freed, "size": total,
+            "graphs": graphs, "download_cache": download_cache}
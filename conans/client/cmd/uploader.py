@@ -15,10 +15,11 @@ from conans.errors import ConanException, NotFoundException
 from conans.model.manifest import gather_files, FileTreeManifest
 from conans.model.ref import ConanFileReference, PackageReference, check_valid_ref
 from conans.paths import (CONAN_MANIFEST, CONANFILE, EXPORT_SOURCES_TGZ_NAME,
-                          EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO)
+                          EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO, PACKAGE_ARCHIVE_NAMES)
 from conans.search.search import search_packages, search_recipes
-from conans.util.files import (load, clean_dirty, is_dirty,
-                               gzopen_without_timestamps, set_dirty_context_manager)
+from conans.util.files import (load, clean_dirty, is_dirty, gzopen_without_timestamps,
+                               parallel_gzopen_without_timestamps, taropen_without_timestamps,
+                               set_dirty_context_manager)
 from conans.util.log import logger
 from conans.util.tracer import log_recipe_upload, log_compressed_files, log_package_upload
 from conans.tools import cpu_count
@@ -435,12 +436,19 @@ class CmdUpload(object):
                                  "Remove it with 'conan remove %s -p=%s'"
                                  % (pref, pref.ref, pref.id))
 
+        compression = self._cache.config.compression_format
+        package_tgz_name = PACKAGE_ARCHIVE_NAMES[compression]
         download_pkg_folder = layout.download_package(pref)
-        package_tgz = os.path.join(download_pkg_folder, PACKAGE_TGZ_NAME)
+        package_tgz = os.path.join(download_pkg_folder, package_tgz_name)
         if is_dirty(package_tgz):
-            self._output.warn("%s: Removing %s, marked as dirty" % (str(pref), PACKAGE_TGZ_NAME))
+            self._output.warn("%s: Removing %s, marked as dirty" % (str(pref), package_tgz_name))
             os.remove(package_tgz)
             clean_dirty(package_tgz)
+        # Archives of other compression formats, from previous uploads, are no longer valid
+        for name in PACKAGE_ARCHIVE_NAMES.values():
+            other = os.path.join(download_pkg_folder, name)
+            if name != package_tgz_name and os.path.isfile(other):
+                os.remove(other)
 
         # Get all the files in that directory
         # existing package, will use short paths if defined
@@ -462,12 +470,13 @@ class CmdUpload(object):
                 self._output.writeln("Compressing package...")
             tgz_files = {f: path for f, path in files.items() if
                          f not in [CONANINFO, CONAN_MANIFEST]}
-            tgz_path = compress_files(tgz_files, symlinks, PACKAGE_TGZ_NAME, download_pkg_folder,
-                                      self._output)
+            tgz_path = compress_files(tgz_files, symlinks, package_tgz_name, download_pkg_folder,
+                                      self._output, compression=compression,
+                                      threads=self._cache.config.parallel_compression)
             assert tgz_path == package_tgz
             assert os.path.exists(package_tgz)
 
-        return {PACKAGE_TGZ_NAME: package_tgz,
+        return {package_tgz_name: package_tgz,
                 CONANINFO: files[CONANINFO],
                 CONAN_MANIFEST: files[CONAN_MANIFEST]}
 
@@ -515,6 +524,8 @@ class CmdUpload(object):
                 raise ConanException("Local package is different from the remote package. Forbidden"
                                      " overwrite.")
         deleted = set(remote_snapshot).difference(the_files)
+        # The archive of a different compression format is replaced by the server
+        deleted.difference_update(PACKAGE_ARCHIVE_NAMES.values())
         return the_files, deleted
 
     def _upload_recipe_end_msg(self, ref, remote):
@@ -588,12 +599,21 @@ class CmdUpload(object):
             self._output.info("Error printing information about the diff: %s" % str(e))
 
 
-def compress_files(files, symlinks, name, dest_dir, output=None):
+def compress_files(files, symlinks, name, dest_dir, output=None, compression="gzip",
+                   threads=None):
     t1 = time.time()
     # FIXME, better write to disk sequentially and not keep tgz contents in memory
     tgz_path = os.path.join(dest_dir, name)
+    if os.path.exists(tgz_path):  # It might be a hardlink to the download cache
+        os.remove(tgz_path)
     with set_dirty_context_manager(tgz_path), open(tgz_path, "wb") as tgz_handle:
-        tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle)
+        if compression == "gzip" and threads and threads > 1:
+            tgz = parallel_gzopen_without_timestamps(name, fileobj=tgz_handle, threads=threads)
+        elif compression == "gzip":
+            tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle)
+        else:
+            tgz = taropen_without_timestamps(name, compression, fileobj=tgz_handle,
+                                             threads=threads)
 
         for filename, dest in sorted(symlinks.items()):
             info = tarfile.TarInfo(name=filename)
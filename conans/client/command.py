@@ -339,6 +339,7 @@ class Command(object):
 
         _add_manifests_arguments(parser)
         _add_common_install_arguments(parser, build_help=_help_build_policies.format("package name"))
+        _add_parallel_builds_argument(parser)
 
         args = parser.parse_args(*args)
         self._warn_python_version()
@@ -373,7 +374,8 @@ class Command(object):
                                       lockfile=args.lockfile,
                                       lockfile_out=args.lockfile_out,
                                       ignore_dirty=args.ignore_dirty,
-                                      profile_build=profile_build)
+                                      profile_build=profile_build,
+                                      parallel_builds=args.parallel_builds)
         except ConanException as exc:
             info = exc.info
             raise
@@ -475,6 +477,7 @@ class Command(object):
         _add_common_install_arguments(parser, build_help=_help_build_policies.format("never"))
         parser.add_argument("--lockfile-node-id", action=OnceArgument,
                             help="NodeID of the referenced package in the lockfile")
+        _add_parallel_builds_argument(parser)
 
         args = parser.parse_args(*args)
         self._check_lockfile_args(args)
@@ -505,7 +508,8 @@ class Command(object):
                                            no_imports=args.no_imports,
                                            install_folder=args.install_folder,
                                            lockfile=args.lockfile,
-                                           lockfile_out=args.lockfile_out)
+                                           lockfile_out=args.lockfile_out,
+                                           parallel_builds=args.parallel_builds)
             else:
                 if args.reference:
                     raise ConanException("A full reference was provided as first argument, second "
@@ -528,7 +532,8 @@ class Command(object):
                                                      install_folder=args.install_folder,
                                                      lockfile=args.lockfile,
                                                      lockfile_out=args.lockfile_out,
-                                                     lockfile_node_id=args.lockfile_node_id)
+                                                     lockfile_node_id=args.lockfile_node_id,
+                                                     parallel_builds=args.parallel_builds)
 
         except ConanException as exc:
             info = exc.info
@@ -1851,6 +1856,49 @@ class Command(object):
                 self._out.writeln("    Path: %s" % v["path"])
                 self._out.writeln("    Layout: %s" % v["layout"])
 
+    def cache(self, *args):
+        """
+        Manages the local cache.
+
+        Use the subcommand 'dedup' to share the identical files of the packages in the cache,
+        'clean' to remove the least recently used packages, build and source folders, and
+        'rebuild-index' to recreate the index of the cache (general.cache_index).
+        """
+        parser = argparse.ArgumentParser(description=self.cache.__doc__,
+                                         prog="conan cache",
+                                         formatter_class=SmartFormatter)
+        subparsers = parser.add_subparsers(dest='subcommand', help='sub-command help')
+        subparsers.required = True
+
+        subparsers.add_parser('dedup', help='Replace the identical files of the packages by '
+                                            'hardlinks to a single copy, and remove the copies '
+                                            'not used anymore')
+        clean_subcommand = subparsers.add_parser('clean', help='Remove the least recently used '
+                                                               'packages, build and source '
+                                                               'folders of the cache, and the '
+                                                               'files of the download cache '
+                                                               '(storage.download_cache_max_size'
+                                                               ' and download_cache_max_age)')
+        clean_subcommand.add_argument('--max-size', default=None, action=OnceArgument,
+                                      help='Remove the least recently used ones until the cache '
+                                           'is smaller than this size, e.g. 10GB or 500MB')
+        clean_subcommand.add_argument('--max-age', default=None, action=OnceArgument,
+                                      help='Remove the ones not used for this time, in minutes, '
+                                           'hours or days, e.g. 30d or 12h')
+        subparsers.add_parser('rebuild-index', help='Index again all the recipes and packages '
+                                                    'in the cache, if general.cache_index is '
+                                                    'enabled')
+
+        args = parser.parse_args(*args)
+        self._warn_python_version()
+
+        if args.subcommand == "dedup":
+            self._conan.cache_dedup()
+        elif args.subcommand == "clean":
+            self._conan.cache_clean(max_size=args.max_size, max_age=args.max_age)
+        elif args.subcommand == "rebuild-index":
+            self._conan.cache_rebuild_index()
+
     def frogarian(self, *args):
         """
         Conan The Frogarian
@@ -1950,7 +1998,8 @@ class Command(object):
                 ("Package development commands", ("source", "build", "package", "editable",
                                                   "workspace")),
                 ("Misc commands", ("profile", "remote", "user", "imports", "copy", "remove",
-                                   "alias", "download", "inspect", "help", "lock", "frogarian"))]
+                                   "alias", "download", "inspect", "help", "lock", "cache",
+                                   "frogarian"))]
 
         def check_all_commands_listed():
             """Keep updated the main directory, raise if don't"""
@@ -2177,6 +2226,15 @@ def _add_common_install_arguments(parser, build_help, update_help=None, lockfile
     _add_profile_arguments(parser)
 
 
+def _add_parallel_builds_argument(parser):
+    parser.add_argument("--parallel-builds", type=int, action=OnceArgument,
+                        help="Number of independent packages to build from sources at the same "
+                             "time. The CPUs are distributed among them. Only the build "
+                             "subprocesses (compilers, cmake...) run concurrently, the python "
+                             "code of the recipes is serialized. Overrides the "
+                             "'general.parallel_builds' conan.conf value")
+
+
 def _add_profile_arguments(parser):
     # Arguments that can apply to the build or host machines (easily extend to target machine)
     def environment_args(machine, short_suffix="", long_suffix=""):
@@ -10,6 +10,7 @@ import conans
 from conans import __version__ as client_version
 from conans.client.cache.cache import ClientCache
 from conans.client.cmd.build import cmd_build
+from conans.client.cmd.cache import cmd_cache_clean, cmd_cache_dedup, cmd_cache_rebuild_index
 from conans.client.cmd.create import create
 from conans.client.cmd.download import download
 from conans.client.cmd.export import cmd_export, export_alias
@@ -203,7 +204,7 @@ class ConanApp(object):
                                                   self.generator_manager)
         self.pyreq_loader = PyRequireLoader(self.proxy, self.range_resolver)
         self.loader = ConanFileLoader(self.runner, self.out, self.python_requires,
-                                      self.generator_manager, self.pyreq_loader)
+                                      self.generator_manager, self.pyreq_loader, self.cache)
 
         self.binaries_analyzer = GraphBinariesAnalyzer(self.cache, self.out, self.remote_manager)
         self.graph_manager = GraphManager(self.out, self.cache, self.remote_manager, self.loader,
@@ -340,7 +341,8 @@ class ConanAPIV1(object):
                keep_source=False, keep_build=False, verify=None,
                manifests=None, manifests_interactive=None,
                remote_name=None, update=False, cwd=None, test_build_folder=None,
-               lockfile=None, lockfile_out=None, ignore_dirty=False, profile_build=None):
+               lockfile=None, lockfile_out=None, ignore_dirty=False, profile_build=None,
+               parallel_builds=None):
         """
         API method to create a conan package
 
@@ -385,7 +387,8 @@ class ConanAPIV1(object):
             recorder.add_recipe_being_developed(ref)
             create(self.app, ref, graph_info, remotes, update, build_modes,
                    manifest_folder, manifest_verify, manifest_interactive, keep_build,
-                   test_build_folder, test_folder, conanfile_path, recorder=recorder)
+                   test_build_folder, test_folder, conanfile_path, recorder=recorder,
+                   parallel_builds=parallel_builds)
 
             if lockfile_out:
                 lockfile_out = _make_abs_path(lockfile_out, cwd)
@@ -531,7 +534,7 @@ class ConanAPIV1(object):
                           manifests_interactive=None, build=None, profile_names=None,
                           update=False, generators=None, install_folder=None, cwd=None,
                           lockfile=None, lockfile_out=None, profile_build=None,
-                          lockfile_node_id=None):
+                          lockfile_node_id=None, parallel_builds=None):
         profile_host = ProfileData(profiles=profile_names, settings=settings, options=options,
                                    env=env)
         recorder = ActionRecorder()
@@ -557,7 +560,8 @@ class ConanAPIV1(object):
                          manifest_verify=manifest_verify,
                          manifest_interactive=manifest_interactive,
                          generators=generators, recorder=recorder,
-                         lockfile_node_id=lockfile_node_id)
+                         lockfile_node_id=lockfile_node_id,
+                         parallel_builds=parallel_builds)
 
             if lockfile_out:
                 lockfile_out = _make_abs_path(lockfile_out, cwd)
@@ -576,7 +580,7 @@ class ConanAPIV1(object):
                 remote_name=None, verify=None, manifests=None,
                 manifests_interactive=None, build=None, profile_names=None,
                 update=False, generators=None, no_imports=False, install_folder=None, cwd=None,
-                lockfile=None, lockfile_out=None, profile_build=None):
+                lockfile=None, lockfile_out=None, profile_build=None, parallel_builds=None):
         profile_host = ProfileData(profiles=profile_names, settings=settings, options=options,
                                    env=env)
         recorder = ActionRecorder()
@@ -607,7 +611,8 @@ class ConanAPIV1(object):
                          manifest_interactive=manifest_interactive,
                          generators=generators,
                          no_imports=no_imports,
-                         recorder=recorder)
+                         recorder=recorder,
+                         parallel_builds=parallel_builds)
 
             if lockfile_out:
                 lockfile_out = _make_abs_path(lockfile_out, cwd)
@@ -1110,6 +1115,18 @@ class ConanAPIV1(object):
     def remove_locks(self):
         self.app.cache.remove_locks()
 
+    @api_method
+    def cache_dedup(self):
+        return cmd_cache_dedup(self.app.cache, self.app.out)
+
+    @api_method
+    def cache_clean(self, max_size=None, max_age=None):
+        return cmd_cache_clean(self.app.cache, self.app.out, max_size, max_age)
+
+    @api_method
+    def cache_rebuild_index(self):
+        return cmd_cache_rebuild_index(self.app.cache, self.app.out)
+
     @api_method
     def profile_list(self):
         return cmd_profile_list(self.app.cache.profiles_path, self.app.out)
@@ -7,9 +7,9 @@ from six.moves.configparser import ConfigParser, NoSectionError
 
 from conans.errors import ConanException
 from conans.model.env_info import unquote
-from conans.paths import DEFAULT_PROFILE_NAME, conan_expand_user, CACERT_FILE
+from conans.paths import DEFAULT_PROFILE_NAME, conan_expand_user, CACERT_FILE, PACKAGE_ARCHIVE_NAMES
 from conans.util.conan_v2_mode import CONAN_V2_MODE_ENVVAR
-from conans.util.dates import timedelta_from_text
+from conans.util.dates import size_from_text, timedelta_from_text
 from conans.util.env_reader import get_env
 from conans.util.files import load
 
@@ -182,12 +182,29 @@ _t_default_client_conf = Template(textwrap.dedent("""
     # required_conan_version = >=1.26
 
     # keep_python_files = False           # environment CONAN_KEEP_PYTHON_FILES
+    # stream_package_download = False     # environment CONAN_STREAM_PACKAGE_DOWNLOAD
+    # compression_format = gzip           # environment CONAN_COMPRESSION_FORMAT (gzip, xz, zstd, none)
+    # parallel_compression = 4            # threads compressing the package archives (gzip, zstd)
+    # parallel_lookups = 8                # threads checking the binaries in the remotes
+    # download_segments = 4               # connections downloading each big file (byte ranges)
+    # graph_cache = False                 # environment CONAN_GRAPH_CACHE, reuse resolved graphs (not with recipes reading other env vars)
+    # cache_index = False                 # environment CONAN_CACHE_INDEX, index the cache in sqlite
+    # cache_locks = fcntl                 # environment CONAN_CACHE_LOCKS (count/fcntl), fcntl blocks in flock() (not Windows)
+
+    # http_pool_maxsize = 10              # connections kept alive for every host
+    # http_max_host_connections = 8       # limit of simultaneous connections to a host
+    # http_keep_alive = True              # reuse the connections (and enable TCP keep-alive)
 
     [storage]
     # This is the default path, but you can write your own. It must be an absolute path or a
     # path beginning with "~" (if the environment var CONAN_USER_HOME is specified, this directory, even
     # with "~/", will be relative to the conan user home, not to the system user home)
     path = ./data
+    # Share the identical files of the packages with hardlinks to a content-addressed store
+    # dedup = False                       # environment CONAN_CACHE_DEDUP
+    # Limits of the download_cache, the least recently used files are removed
+    # download_cache_max_size = 10GB
+    # download_cache_max_age = 30d
 
     [proxies]
     # Empty (or missing) section will try to use system proxies.
@@ -417,6 +434,42 @@ class ConanClientConfigParser(ConfigParser, object):
         except ValueError:
             raise ConanException("Specify a numeric parameter for 'request_timeout'")
 
+    @property
+    def http_pool_maxsize(self):
+        """ connections kept alive for every host, None for the default
+        """
+        try:
+            maxsize = self.get_item("general.http_pool_maxsize")
+        except ConanException:
+            return None
+
+        try:
+            return int(maxsize) if maxsize is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'http_pool_maxsize'")
+
+    @property
+    def http_max_host_connections(self):
+        """ maximum number of simultaneous connections to a host, None for no limit
+        """
+        try:
+            max_connections = self.get_item("general.http_max_host_connections")
+        except ConanException:
+            return None
+
+        try:
+            return int(max_connections) if max_connections is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'http_max_host_connections'")
+
+    @property
+    def http_keep_alive(self):
+        try:
+            keep_alive = self.get_item("general.http_keep_alive")
+            return str(keep_alive).lower() not in ("0", "false")
+        except ConanException:
+            return True
+
     @property
     def revisions_enabled(self):
         try:
@@ -439,6 +492,123 @@ class ConanClientConfigParser(ConfigParser, object):
         except ValueError:
             raise ConanException("Specify a numeric parameter for 'parallel_download'")
 
+    @property
+    def parallel_builds(self):
+        try:
+            parallel = self.get_item("general.parallel_builds")
+        except ConanException:
+            return None
+
+        try:
+            return int(parallel) if parallel is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_builds'")
+
+    @property
+    def parallel_lookups(self):
+        try:
+            parallel = self.get_item("general.parallel_lookups")
+        except ConanException:
+            return None
+
+        try:
+            return int(parallel) if parallel is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_lookups'")
+
+    @property
+    def graph_cache(self):
+        try:
+            graph_cache = get_env("CONAN_GRAPH_CACHE")
+            if graph_cache is None:
+                graph_cache = self.get_item("general.graph_cache")
+            return str(graph_cache).lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def cache_index(self):
+        try:
+            cache_index = get_env("CONAN_CACHE_INDEX")
+            if cache_index is None:
+                cache_index = self.get_item("general.cache_index")
+            return str(cache_index).lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def cache_locks(self):
+        try:
+            cache_locks = get_env("CONAN_CACHE_LOCKS")
+            if cache_locks is None:
+                cache_locks = self.get_item("general.cache_locks")
+        except ConanException:
+            return "count"
+        cache_locks = str(cache_locks).lower()
+        if cache_locks not in ("count", "fcntl"):
+            raise ConanException("Invalid cache_locks '%s', allowed values: count, fcntl"
+                                 % cache_locks)
+        return cache_locks
+
+    @property
+    def download_segments(self):
+        try:
+            segments = self.get_item("general.download_segments")
+        except ConanException:
+            return None
+
+        try:
+            return int(segments) if segments is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'download_segments'")
+
+    @property
+    def parallel_compression(self):
+        try:
+            parallel = self.get_item("general.parallel_compression")
+        except ConanException:
+            return None
+
+        try:
+            return int(parallel) if parallel is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_compression'")
+
+    @property
+    def stream_package_download(self):
+        try:
+            stream = get_env("CONAN_STREAM_PACKAGE_DOWNLOAD")
+            if stream is None:
+                stream = self.get_item("general.stream_package_download")
+            return str(stream).lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def compression_format(self):
+        """ the compression format of the package archives that are uploaded
+        """
+        try:
+            compression = get_env("CONAN_COMPRESSION_FORMAT")
+            if compression is None:
+                compression = self.get_item("general.compression_format")
+        except ConanException:
+            return "gzip"
+        if compression not in PACKAGE_ARCHIVE_NAMES:
+            raise ConanException("Invalid 'compression_format' value '%s', possible values: %s"
+                                 % (compression, ", ".join(sorted(PACKAGE_ARCHIVE_NAMES))))
+        return compression
+
+    @property
+    def cache_dedup(self):
+        try:
+            dedup = get_env("CONAN_CACHE_DEDUP")
+            if dedup is None:
+                dedup = self.get_item("storage.dedup")
+            return str(dedup).lower() in ("1", "true")
+        except ConanException:
+            return False
+
     @property
     def download_cache(self):
         try:
@@ -447,6 +617,22 @@ class ConanClientConfigParser(ConfigParser, object):
         except ConanException:
             return None
 
+    @property
+    def download_cache_max_size(self):
+        try:
+            max_size = self.get_item("storage.download_cache_max_size")
+        except ConanException:
+            return None
+        return size_from_text(max_size)
+
+    @property
+    def download_cache_max_age(self):
+        try:
+            max_age = self.get_item("storage.download_cache_max_age")
+        except ConanException:
+            return None
+        return timedelta_from_text(max_age).total_seconds()
+
     @property
     def scm_to_conandata(self):
         try:
@@ -1,5 +1,8 @@
+import errno
 import os
 import shutil
+import stat
+import time
 from contextlib import contextmanager
 from threading import Lock
 
@@ -8,26 +11,55 @@ from six.moves.urllib_parse import urlsplit, urlunsplit
 from conans.client.downloaders.file_downloader import check_checksum
 from conans.errors import ConanException
 from conans.util.files import mkdir
-from conans.util.locks import SimpleLock
+from conans.util.locks import LockBusy, SimpleLock
+from conans.util.log import logger
 from conans.util.sha import sha256 as sha256_sum
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FICLONE = 0x40049409  # Linux ioctl cloning the extents of a file (btrfs, xfs...)
+EVICTION_INTERVAL = 60  # seconds between the automatic evictions of the same process
+
+
+def _reflink(src, dst):
+    """ copy-on-write clone of src, the files share the disk blocks until one of them is
+    modified. Raises OSError/IOError if the file system (or the platform) doesn't support it
+    """
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflinks not supported")
+    with open(src, "rb") as src_handle:
+        with open(dst, "wb") as dst_handle:
+            fcntl.ioctl(dst_handle.fileno(), FICLONE, src_handle.fileno())
+    shutil.copystat(src, dst)
+
 
 class CachedFileDownloader(object):
     _thread_locks = {}  # Needs to be shared among all instances
+    _last_eviction = 0
 
-    def __init__(self, cache_folder, file_downloader, user_download=False):
+    def __init__(self, cache_folder, file_downloader, user_download=False, max_size=None,
+                 max_age=None):
         self._cache_folder = cache_folder
         self._file_downloader = file_downloader
         self._user_download = user_download
+        self._max_size = max_size  # bytes
+        self._max_age = max_age  # seconds
+
+    def _lock_file(self, lock_id):
+        return os.path.join(self._cache_folder, "locks", lock_id)
 
     @contextmanager
-    def _lock(self, lock_id):
-        lock = os.path.join(self._cache_folder, "locks", lock_id)
-        with SimpleLock(lock):
+    def _lock(self, lock_id, blocking=True):
+        lock = self._lock_file(lock_id)
+        with SimpleLock(lock, blocking=blocking):
             # Once the process has access, make sure multithread is locked too
             # as SimpleLock doesn't work multithread
             thread_lock = self._thread_locks.setdefault(lock, Lock())
-            thread_lock.acquire()
+            if not thread_lock.acquire(blocking):
+                raise LockBusy(lock)
             try:
                 yield
             finally:
@@ -43,7 +75,8 @@ class CachedFileDownloader(object):
 
         with self._lock(h):
             cached_path = os.path.join(self._cache_folder, h)
-            if not os.path.exists(cached_path):
+            downloaded = not os.path.exists(cached_path)
+            if downloaded:
                 self._file_downloader.download(url=url, file_path=cached_path, md5=md5,
                                                sha1=sha1, sha256=sha256, **kwargs)
             else:
@@ -55,14 +88,96 @@ class CachedFileDownloader(object):
                     raise ConanException("%s\nCached downloaded file corrupted: %s"
                                          % (str(e), cached_path))
 
+            # The modification time of the lock file is the last access, for the eviction
+            os.utime(self._lock_file(h), None)
+
             if file_path is not None:
                 file_path = os.path.abspath(file_path)
                 mkdir(os.path.dirname(file_path))
-                shutil.copy2(cached_path, file_path)
+                self._materialize(cached_path, file_path)
             else:
                 with open(cached_path, 'rb') as handle:
                     tmp = handle.read()
-                return tmp
+
+        if downloaded and (self._max_size is not None or self._max_age is not None):
+            now = time.time()
+            if now - CachedFileDownloader._last_eviction > EVICTION_INTERVAL:
+                CachedFileDownloader._last_eviction = now
+                self.evict(self._max_size, self._max_age)
+
+        if file_path is None:
+            return tmp
+
+    def _materialize(self, cached_path, file_path):
+        """ puts the cached file in file_path without copying its contents when possible: a
+        reflink (copy-on-write, independent of the cached file), or a hardlink for the files
+        that Conan manages (never modified in place, a new download or compression replaces
+        them). The files of tools.download() are copied, the users might modify them
+        """
+        if os.path.lexists(file_path):
+            os.remove(file_path)  # Never write through an existing hardlink to the cache
+        try:
+            _reflink(cached_path, file_path)
+            return
+        except (IOError, OSError):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        if not self._user_download:
+            try:
+                os.link(cached_path, file_path)
+                return
+            except OSError as e:  # Different file systems, no hardlinks support...
+                logger.debug("DOWNLOAD CACHE: cannot link %s: %s" % (file_path, str(e)))
+        shutil.copy2(cached_path, file_path)
+
+    def evict(self, max_size=None, max_age=None):
+        """ removes the cached files not used in more than max_age seconds, and then the least
+        recently used ones until the download cache is smaller than max_size bytes. The files
+        being downloaded or copied by other threads or processes are skipped.
+        The lock files are kept, removing them while other process waits for them would break
+        the mutual exclusion
+        :return: (number of files removed, bytes freed, size of the download cache)
+        """
+        items = []  # [(last access, size, hash)]
+        total = 0
+        for h in os.listdir(self._cache_folder):
+            path = os.path.join(self._cache_folder, h)
+            try:
+                file_stat = os.stat(path)
+            except OSError:  # Removed meanwhile
+                continue
+            if not stat.S_ISREG(file_stat.st_mode):  # The locks folder
+                continue
+            try:
+                access = os.path.getmtime(self._lock_file(h))
+            except OSError:
+                access = file_stat.st_mtime
+            total += file_stat.st_size
+            items.append((access, file_stat.st_size, h))
+
+        items.sort()
+        removed, freed = 0, 0
+        now = time.time()
+        for access, size, h in items:
+            too_old = max_age is not None and now - access > max_age
+            too_big = max_size is not None and total > max_size
+            if not too_old and not too_big:
+                continue
+            path = os.path.join(self._cache_folder, h)
+            try:
+                with self._lock(h, blocking=False):
+                    links = os.stat(path).st_nlink
+                    os.remove(path)
+            except LockBusy:
+                continue
+            except OSError as e:
+                logger.warning("DOWNLOAD CACHE: cannot remove %s: %s" % (path, str(e)))
+                continue
+            removed += 1
+            total -= size
+            if links == 1:  # Otherwise the space is still used by the hardlinked files
+                freed += size
+        return removed, freed, total
 
     def _get_hash(self, url, checksum=None):
         """ For Api V2, the cached downloads always have recipe and package REVISIONS in the URL,
@@ -1,7 +1,10 @@
+import hashlib
 import os
 import re
+import threading
 import time
 import traceback
+from multiprocessing.pool import ThreadPool
 
 import six
 
@@ -10,11 +13,15 @@ from conans.client.tools.files import check_md5, check_sha1, check_sha256
 from conans.errors import ConanException, NotFoundException, AuthenticationException, \
     ForbiddenException, ConanConnectionError, RequestErrorException
 from conans.util import progress_bar
-from conans.util.files import mkdir
+from conans.util.files import mkdir, rmdir, tar_extract
 from conans.util.log import logger
 from conans.util.tracer import log_download
 
 
+# Files are only downloaded in segments if every segment has at least this size
+_MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+
+
 def check_checksum(file_path, md5, sha1, sha256):
     if md5:
         check_md5(file_path, md5)
@@ -24,6 +31,49 @@ def check_checksum(file_path, md5, sha1, sha256):
         check_sha256(file_path, sha256)
 
 
+class _ChunksReader(object):
+    """ Minimal file-like object that reads from an iterator of chunks, so a response can be
+    consumed as a stream, computing the checksums of the data on the fly
+    """
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = bytearray()
+        self._md5 = hashlib.md5()
+        self._sha1 = hashlib.sha1()
+        self.size = 0
+
+    def _next_chunk(self):
+        chunk = next(self._chunks, None)
+        if chunk:
+            self._md5.update(chunk)
+            self._sha1.update(chunk)
+            self.size += len(chunk)
+        return chunk
+
+    def read(self, size=-1):
+        while size is None or size < 0 or len(self._buffer) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self._buffer.extend(chunk)
+        if size is None or size < 0:
+            size = len(self._buffer)
+        ret = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return ret
+
+    def consume(self):
+        """ reads the remaining data (as the tar padding), needed for complete checksums
+        """
+        while self._next_chunk():
+            pass
+        self._buffer = bytearray()
+
+    @property
+    def checksums(self):
+        return {"md5": self._md5.hexdigest(), "sha1": self._sha1.hexdigest()}
+
+
 class FileDownloader(object):
 
     def __init__(self, requester, output, verify, config):
@@ -46,6 +96,8 @@ class FileDownloader(object):
             if overwrite:
                 if self._output:
                     self._output.warn("file '%s' already exists, overwriting" % file_path)
+                # It might be a hardlink to the download cache, don't write through it
+                os.remove(file_path)
             else:
                 # Should not happen, better to raise, probably we had to remove
                 # the dest folder before
@@ -62,15 +114,21 @@ class FileDownloader(object):
                 os.remove(file_path)
             raise
 
-    def _download_file(self, url, auth, headers, file_path, try_resume=False):
-        t1 = time.time()
-        if try_resume and file_path and os.path.exists(file_path):
-            range_start = os.path.getsize(file_path)
-            headers = headers.copy() if headers else {}
-            headers["range"] = "bytes={}-".format(range_start)
-        else:
-            range_start = 0
+    def download_extract(self, url, dest_folder, auth=None, retry=None, retry_wait=None,
+                         headers=None, description=None):
+        """ downloads a tgz file extracting it into dest_folder while it arrives, without
+        writing the compressed file to disk.
+        :return: the {"md5": , "sha1": } checksums of the downloaded (compressed) file
+        """
+        retry = retry if retry is not None else self._config.retry
+        retry = retry if retry is not None else 2
+        retry_wait = retry_wait if retry_wait is not None else self._config.retry_wait
+        retry_wait = retry_wait if retry_wait is not None else 0
 
+        return _call_with_retry(self._output, retry, retry_wait, self._download_extract, url,
+                                auth, headers, dest_folder, description)
+
+    def _get_response(self, url, auth, headers):
         try:
             response = self._requester.get(url, stream=True, verify=self._verify_ssl, auth=auth,
                                            headers=headers)
@@ -88,6 +146,44 @@ class FileDownloader(object):
             elif response.status_code == 401:
                 raise AuthenticationException()
             raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+        return response
+
+    def _download_extract(self, url, auth, headers, dest_folder, description):
+        t1 = time.time()
+        response = self._get_response(url, auth, headers)
+        try:
+            logger.debug("DOWNLOAD: %s" % url)
+            total_length = int(response.headers.get('Content-Length') or 0)
+            progress = progress_bar.Progress(total_length, self._output, description)
+            reader = _ChunksReader(progress.update(response.iter_content(1024 * 100)))
+            tar_extract(reader, dest_folder, stream=True)
+            reader.consume()
+            gzip = (response.headers.get("content-encoding") == "gzip")
+            response.close()
+            if total_length and reader.size != total_length and not gzip:
+                raise ConanException("Transfer interrupted before complete: %s < %s"
+                                     % (reader.size, total_length))
+            duration = time.time() - t1
+            log_download(url, duration)
+            return reader.checksums
+        except Exception as e:
+            logger.debug(e.__class__)
+            logger.debug(traceback.format_exc())
+            # Do not leave partially extracted files, a retry will start from scratch
+            rmdir(dest_folder)
+            raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
+                                       % str(e))
+
+    def _download_file(self, url, auth, headers, file_path, try_resume=False):
+        t1 = time.time()
+        if try_resume and file_path and os.path.exists(file_path):
+            range_start = os.path.getsize(file_path)
+            headers = headers.copy() if headers else {}
+            headers["range"] = "bytes={}-".format(range_start)
+        else:
+            range_start = 0
+
+        response = self._get_response(url, auth, headers)
 
         def read_response(size):
             for chunk in response.iter_content(size):
@@ -130,6 +226,15 @@ class FileDownloader(object):
             total_length = get_total_length()
             action = "Downloading" if range_start == 0 else "Continuing download of"
             description = "{} {}".format(action, os.path.basename(file_path)) if file_path else None
+            if (file_path and not range_start and total_length >= 2 * _MIN_SEGMENT_SIZE and
+                    response.headers.get("Accept-Ranges") == "bytes" and
+                    not response.headers.get("content-encoding") and
+                    (self._config.download_segments or 0) > 1):
+                self._download_segments(url, auth, headers, file_path, response, total_length,
+                                        self._config.download_segments, description)
+                duration = time.time() - t1
+                log_download(url, duration)
+                return None
             progress = progress_bar.Progress(total_length, self._output, description)
             progress.initial_value(range_start)
 
@@ -161,6 +266,78 @@ class FileDownloader(object):
             raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
                                        % str(e))
 
+    def _download_segments(self, url, auth, headers, file_path, response, total_length,
+                           segments, description):
+        """ downloads the file in several byte ranges at the same time, written directly to
+        their position of the preallocated file. The first range is read from the response that
+        was already received, the others are requested with a Range header
+        """
+        segment_size = max(_MIN_SEGMENT_SIZE, -(-total_length // segments))
+        ranges = [(start, min(start + segment_size, total_length))
+                  for start in range(0, total_length, segment_size)]
+        mkdir(os.path.dirname(file_path))
+        with open(file_path, "wb") as file_handler:
+            file_handler.truncate(total_length)
+
+        progress = progress_bar.Progress(total_length, self._output, description)
+        progress_lock = threading.Lock()
+        validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+        def write_segment(segment_response, start, end):
+            downloaded_size = 0
+            with open(file_path, "r+b") as segment_handler:
+                segment_handler.seek(start)
+                for chunk in segment_response.iter_content(1024 * 100):
+                    chunk = chunk[:end - start - downloaded_size]
+                    segment_handler.write(chunk)
+                    downloaded_size += len(chunk)
+                    with progress_lock:
+                        progress.update_size(len(chunk))
+                    if downloaded_size == end - start:
+                        break
+            segment_response.close()
+            if downloaded_size != end - start:
+                raise ConanException("Transfer interrupted before complete: %s < %s"
+                                     % (start + downloaded_size, end))
+
+        def download_segment(start, end):
+            range_headers = headers.copy() if headers else {}
+            range_headers["range"] = "bytes={}-{}".format(start, end - 1)
+            segment_response = self._get_response(url, auth, range_headers)
+            content_range = segment_response.headers.get("Content-Range", "")
+            match = re.match(r"^bytes (\d+)-(\d+)/(\d+)", content_range)
+            if (segment_response.status_code != 206 or not match or
+                    int(match.group(1)) != start or int(match.group(3)) != total_length):
+                segment_response.close()
+                raise ConanException("Error in segmented download from %s\n"
+                                     "Incorrect Content-Range header %s" % (url, content_range))
+            segment_validator = (segment_response.headers.get("ETag") or
+                                 segment_response.headers.get("Last-Modified"))
+            if validator != segment_validator:
+                segment_response.close()
+                raise ConanException("Error in segmented download from %s\n"
+                                     "The file changed during the download" % url)
+            write_segment(segment_response, start, end)
+
+        logger.debug("DOWNLOAD: %s in %d segments" % (url, len(ranges)))
+        thread_pool = ThreadPool(len(ranges) - 1)
+        try:
+            pending = [thread_pool.apply_async(download_segment, segment)
+                       for segment in ranges[1:]]
+            thread_pool.close()
+            write_segment(response, *ranges[0])
+            for segment in pending:
+                segment.get()
+        finally:
+            thread_pool.terminate()
+            thread_pool.join()
+        progress.pb_close()
+
+        # Servers like Artifactory send the checksums of the file, verify the assembled file
+        check_checksum(file_path, response.headers.get("X-Checksum-Md5"),
+                       response.headers.get("X-Checksum-Sha1"),
+                       response.headers.get("X-Checksum-Sha256"))
+
 
 def _call_with_retry(out, retry, retry_wait, method, *args, **kwargs):
     for counter in range(retry + 1):
@@ -61,16 +61,32 @@ class BuildMode(object):
             return True
 
         # Patterns to match, if package matches pattern, build is forced
+        pattern = self._matching_pattern(ref)
+        if pattern is not None:
+            try:
+                self._unused_patterns.remove(pattern)
+            except ValueError:
+                pass
+            return True
+        return False
+
+    def will_force(self, conan_file, ref):
+        """ same as forced() for the nodes that will be built whatever their dependencies are
+        (cascade is not known until they are evaluated), without the output and without marking
+        the patterns as used
+        """
+        if self.never:
+            return False
+        return (self.all or conan_file.build_policy_always or
+                self._matching_pattern(ref) is not None)
+
+    def _matching_pattern(self, ref):
         for pattern in self.patterns:
             if (fnmatch.fnmatchcase(ref.name, pattern) or
                     fnmatch.fnmatchcase(repr(ref.copy_clear_rev()), pattern) or
                     fnmatch.fnmatchcase(repr(ref), pattern)):
-                try:
-                    self._unused_patterns.remove(pattern)
-                except ValueError:
-                    pass
-                return True
-        return False
+                return pattern
+        return None
 
     def allowed(self, conan_file):
         if self.missing or self.outdated:
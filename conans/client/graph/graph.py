@@ -27,35 +27,113 @@ CONTEXT_HOST = "host"
 CONTEXT_BUILD = "build"
 
 
+class _NodeLayer(object):
+    """ frozen chunk of the contents of one or more _NodeOrderedDict, on top of the previous
+    (older) ones. It is never modified, as it can be shared by many of them
+    """
+    __slots__ = ("nodes", "parent", "depth")
+
+    def __init__(self, nodes, parent):
+        self.nodes = nodes
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent is not None else 1
+
+    def get(self, key):
+        layer = self
+        while layer is not None:
+            node = layer.nodes.get(key)
+            if node is not None:
+                return node
+            layer = layer.parent
+        return None
+
+    def items(self):
+        layers = []
+        layer = self
+        while layer is not None:
+            layers.append(layer.nodes)
+            layer = layer.parent
+        for nodes in reversed(layers):
+            for item in nodes.items():
+                yield item
+
+
 class _NodeOrderedDict(object):
+    """ {(name, context): node}, keeping the insertion order
+
+    The closures of a new node start as a copy of the closures of its parent, so assign() doesn't
+    copy anything: the current contents of the other dict are frozen in a _NodeLayer shared by
+    both, and every dict stores only its own additions (copy-on-write). The nodes in the shared
+    layers are never removed or replaced, pop(), sort() and replacing a node flatten the layers
+    in a new private dict. The length of the chains of layers is also limited, to keep get()
+    fast and to release the intermediate layers.
+    """
+    __slots__ = ("_base", "_nodes")
+    _MAX_DEPTH = 16
 
     def __init__(self):
-        self._nodes = OrderedDict()
+        self._base = None  # _NodeLayer (shared) or None
+        self._nodes = OrderedDict()  # Own nodes, not in _base
 
     @staticmethod
     def _key(node):
-        return node.name, node.context
+        return node.closure_key
+
+    def _items(self):
+        if self._base is not None:
+            for item in self._base.items():
+                yield item
+        for item in self._nodes.items():
+            yield item
+
+    def _flatten(self):
+        if self._base is not None:
+            self._nodes = OrderedDict(self._items())
+            self._base = None
+
+    def _freeze(self):
+        if self._nodes:
+            self._base = _NodeLayer(self._nodes, self._base)
+            self._nodes = OrderedDict()
+        if self._base is not None and self._base.depth > self._MAX_DEPTH:
+            self._base = _NodeLayer(OrderedDict(self._base.items()), None)
 
     def add(self, node):
         key = self._key(node)
+        if self._base is not None and key not in self._nodes:
+            existing = self._base.get(key)
+            if existing is node:
+                return
+            if existing is not None:  # Replaced, keeping its position
+                self._flatten()
         self._nodes[key] = node
 
     def get(self, name, context):
-        return self._nodes.get((name, context))
+        key = name, context
+        node = self._nodes.get(key)
+        if node is None and self._base is not None:
+            node = self._base.get(key)
+        return node
 
     def pop(self, name, context):
-        return self._nodes.pop((name, context))
+        key = name, context
+        if key not in self._nodes:
+            self._flatten()
+        return self._nodes.pop(key)
 
     def sort(self, key_fn):
-        sorted_nodes = sorted(self._nodes.items(), key=lambda n: key_fn(n[1]))
+        sorted_nodes = sorted(self._items(), key=lambda n: key_fn(n[1]))
         self._nodes = OrderedDict(sorted_nodes)
+        self._base = None
 
     def assign(self, other):
         assert isinstance(other, _NodeOrderedDict), "Unexpected type: {}".format(type(other))
-        self._nodes = other._nodes.copy()
+        other._freeze()
+        self._base = other._base
+        self._nodes = OrderedDict()
 
     def __iter__(self):
-        for _, item in self._nodes.items():
+        for _, item in self._items():
             yield item
 
 
@@ -85,6 +163,7 @@ class Node(object):
         self._transitive_closure = OrderedDict()
         self.inverse_closure = set()  # set of nodes that have this one in their public
         self._ancestors = _NodeOrderedDict()  # set{ref.name}
+        self._closure_key = None
         self._id = None  # Unique ID (uuid at the moment) of a node in the graph
         self.graph_lock_node = None  # the locking information can be None
         self.id_direct_prefs = None
@@ -111,6 +190,13 @@ class Node(object):
     def name(self):
         return self.ref.name if self.ref else None
 
+    @property
+    def closure_key(self):
+        # The same tuple for all the closures this node is part of, they can be many
+        if self._closure_key is None:
+            self._closure_key = self.name, self.context
+        return self._closure_key
+
     @property
     def pref(self):
         assert self.ref is not None and self.package_id is not None, "Node %s" % self.recipe
@@ -352,19 +438,34 @@ class DepsGraph(object):
         first level nodes, and so on
         return [[node1, node34], [node3], [node23, node8],...]
         """
-        result = []
-        opened = nodes_subset if nodes_subset is not None else self.nodes
-        while opened:
-            current_level = []
-            for o in opened:
-                o_neighs = o.neighbors() if direct else o.inverse_neighbors()
-                if not any(n in opened for n in o_neighs):
-                    current_level.append(o)
+        nodes = nodes_subset if nodes_subset is not None else self.nodes
+        # Number of neighbors of every node that haven't been leveled yet, and the inverse
+        # relation, the nodes waiting for every node, so each edge is visited only once.
+        # Indexed by id(), hashing the Node (the reference and conanfile) is expensive
+        node_ids = set(id(node) for node in nodes)
+        pending = {}
+        waiting = {}
+        current_level = []
+        for node in nodes:
+            neighbors = node.neighbors() if direct else node.inverse_neighbors()
+            neighbor_ids = set(id(n) for n in neighbors).intersection(node_ids)
+            pending[id(node)] = len(neighbor_ids)
+            for neighbor_id in neighbor_ids:
+                waiting.setdefault(neighbor_id, []).append(node)
+            if not neighbor_ids:
+                current_level.append(node)
 
+        result = []
+        while current_level:
             current_level.sort()
             result.append(current_level)
-            # now initialize new level
-            opened = opened.difference(current_level)
+            next_level = []
+            for node in current_level:
+                for waiting_node in waiting.get(id(node), ()):
+                    pending[id(waiting_node)] -= 1
+                    if not pending[id(waiting_node)]:
+                        next_level.append(waiting_node)
+            current_level = next_level
 
         return result
 
@@ -1,14 +1,18 @@
+import time
+
 from conans.client.graph.build_mode import BuildMode
 from conans.client.graph.graph import (BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLOAD, BINARY_MISSING,
                                        BINARY_UPDATE, RECIPE_EDITABLE, BINARY_EDITABLE,
                                        RECIPE_CONSUMER, RECIPE_VIRTUAL, BINARY_SKIP, BINARY_UNKNOWN,
                                        BINARY_INVALID)
 from conans.errors import NoRemoteAvailable, NotFoundException, conanfile_exception_formatter, \
-    ConanException, ConanInvalidConfiguration
+    ConanException, ConanInvalidConfiguration, PackageNotFoundException
 from conans.model.info import ConanInfo, PACKAGE_ID_UNKNOWN, PACKAGE_ID_INVALID
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference
 from conans.util.conan_v2_mode import conan_v2_property
+from conans.util.log import logger
+from conans.util.tracer import log_package_ids_computed
 
 
 class GraphBinariesAnalyzer(object):
@@ -19,7 +23,17 @@ class GraphBinariesAnalyzer(object):
         self._remote_manager = remote_manager
         # These are the nodes with pref (not including PREV) that have been evaluated
         self._evaluated = {}  # {pref: [nodes]}
+        # Remote package infos retrieved in advance for a whole level of the graph
+        self._remote_infos = {}  # {(remote name, pref): (ConanInfo, pref) or None}
         self._fixed_package_id = cache.config.full_transitive_package_id
+        # Counters of the package_ids computed by the current evaluate_graph(), to report their
+        # cost
+        self._reset_package_ids_counters()
+
+    def _reset_package_ids_counters(self):
+        self._package_ids_computed = 0
+        self._package_ids_duration = 0.0
+        self._package_id_methods = {}  # {str(ref): seconds spent in its package_id() method}
 
     @staticmethod
     def _check_update(upstream_manifest, package_folder, output):
@@ -95,7 +109,64 @@ class GraphBinariesAnalyzer(object):
             assert node.prev, "PREV for %s is None: %s" % (str(pref), metadata.dumps())
 
     def _get_package_info(self, node, pref, remote):
-        return self._remote_manager.get_package_info(pref, remote, info=node.conanfile.info)
+        try:
+            remote_info = self._remote_infos[(remote.name, pref)]
+        except KeyError:
+            return self._remote_manager.get_package_info(pref, remote, info=node.conanfile.info)
+        if remote_info is None:
+            raise PackageNotFoundException(pref, remote=remote)
+        return remote_info
+
+    def _prefetch_remote_infos(self, nodes, build_mode, remotes):
+        """ retrieves from the remotes, in one batch per remote (or concurrently if the remote
+        doesn't support batches and general.parallel_lookups is defined), the info of the binaries
+        of these nodes that will be needed by _evaluate_remote_pkg(), the ones that are not in the
+        cache and won't be built. Other lookups (compatible packages, other remotes) will be done
+        one by one when evaluating the nodes, as the ones of a batch that failed
+        """
+        if build_mode.all:
+            return
+        parallel = self._cache.config.parallel_lookups
+        pending = {}  # {remote name: (remote, [(pref, node)])}
+        for node in nodes:
+            if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL, RECIPE_EDITABLE):
+                continue
+            if node.package_id in (PACKAGE_ID_UNKNOWN, PACKAGE_ID_INVALID):
+                continue
+            if build_mode.will_force(node.conanfile, node.ref):
+                continue
+            locked = node.graph_lock_node
+            if locked and locked.package_id:
+                pref = PackageReference(locked.ref, node.package_id, locked.prev)
+            else:
+                pref = PackageReference(node.ref, node.package_id)
+            if pref in self._evaluated:
+                continue
+            package_layout = self._cache.package_layout(pref.ref,
+                                                        short_paths=node.conanfile.short_paths)
+            if package_layout.package_id_exists(pref.id):
+                continue
+            remote = remotes.selected
+            if not remote:
+                metadata = package_layout.load_metadata()
+                remote_name = metadata.packages[pref.id].remote or metadata.recipe.remote
+                remote = remotes.get(remote_name)
+            if remote:
+                pending.setdefault(remote.name, (remote, []))[1].append((pref, node))
+
+        for remote, nodes in pending.values():
+            prefs = [pref for pref, _ in nodes]
+            infos = {pref: node.conanfile.info for pref, node in nodes}
+            try:
+                remote_infos = self._remote_manager.get_packages_info(prefs, remote, infos,
+                                                                      parallel)
+            except Exception as e:
+                # Looked up one by one later, reporting the errors of the nodes that fail
+                logger.warning("Cannot retrieve the info of %s binary packages from remote '%s' "
+                               "in a batch: %s" % (len(prefs), remote.name, str(e)))
+                continue
+            for pref, remote_info in remote_infos.items():
+                self._remote_infos[(remote.name, pref)] = remote_info
 
     def _evaluate_remote_pkg(self, node, pref, remote, remotes):
         remote_info = None
@@ -178,7 +249,7 @@ class GraphBinariesAnalyzer(object):
                 if node.conanfile.compatible_packages:
                     compatible_build_mode = BuildMode(None, self._out)
                     for compatible_package in node.conanfile.compatible_packages:
-                        package_id = compatible_package.package_id()
+                        package_id = self._package_id(compatible_package)
                         if package_id == node.package_id:
                             node.conanfile.output.info("Compatible package ID %s equal to the "
                                                        "default package ID" % package_id)
@@ -341,10 +412,14 @@ class GraphBinariesAnalyzer(object):
                                           default_python_requires_id_mode)
 
         # Once we are done, call package_id() to narrow and change possible values
+        t1 = time.time()
         with conanfile_exception_formatter(str(conanfile), "package_id"):
             with conan_v2_property(conanfile, 'cpp_info',
                                    "'self.cpp_info' access in package_id() method is deprecated"):
                 conanfile.package_id()
+        method_key = str(node.ref or conanfile.display_name)
+        self._package_id_methods[method_key] = (self._package_id_methods.get(method_key, 0.0) +
+                                                time.time() - t1)
 
         if hasattr(conanfile, "validate") and callable(conanfile.validate):
             with conanfile_exception_formatter(str(conanfile), "validate"):
@@ -354,35 +429,66 @@ class GraphBinariesAnalyzer(object):
                     conanfile.info.invalid = str(e)
 
         info = conanfile.info
-        node.package_id = info.package_id()
+        node.package_id = self._package_id(info)
+
+    def _package_id(self, info):
+        t1 = time.time()
+        try:
+            return info.package_id()
+        finally:
+            self._package_ids_computed += 1
+            self._package_ids_duration += time.time() - t1
+
+    def _report_package_ids(self):
+        methods_duration = sum(self._package_id_methods.values())
+        slowest = sorted(self._package_id_methods.items(), key=lambda x: x[1], reverse=True)[:10]
+        logger.debug("PACKAGE_ID: %d package_ids computed in %.3fs, %.3fs in package_id() "
+                     "methods" % (self._package_ids_computed, self._package_ids_duration,
+                                  methods_duration))
+        log_package_ids_computed(self._package_ids_computed, self._package_ids_duration,
+                                 methods_duration, [list(s) for s in slowest])
 
     def evaluate_graph(self, deps_graph, build_mode, update, remotes, nodes_subset=None, root=None):
         default_package_id_mode = self._cache.config.default_package_id_mode
         default_python_requires_id_mode = self._cache.config.default_python_requires_id_mode
-        for node in deps_graph.ordered_iterate(nodes_subset=nodes_subset):
-            self._propagate_options(node)
-
-            # Make sure that locked options match
-            if (node.graph_lock_node is not None and
-                    node.graph_lock_node.options is not None and
-                    node.conanfile.options.values != node.graph_lock_node.options):
-                raise ConanException("{}: Locked options do not match computed options\n"
-                                     "Locked options:\n{}\n"
-                                     "Computed options:\n{}".format(node.ref,
-                                                                    node.graph_lock_node.options,
-                                                                    node.conanfile.options.values))
-
-            self._compute_package_id(node, default_package_id_mode, default_python_requires_id_mode)
-            if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
-                continue
-            if node.package_id == PACKAGE_ID_UNKNOWN:
-                assert node.binary is None, "Node.binary should be None"
-                node.binary = BINARY_UNKNOWN
-                # annotate pattern, so unused patterns in --build are not displayed as errors
-                build_mode.forced(node.conanfile, node.ref)
-                continue
-            self._evaluate_node(node, build_mode, update, remotes)
+        self._reset_package_ids_counters()
+        try:
+            # The nodes of the same level don't depend on each other, all their package_ids can
+            # be computed before evaluating them, and their remote infos retrieved at once
+            for level in deps_graph.by_levels(nodes_subset=nodes_subset):
+                for node in level:
+                    self._propagate_options(node)
+
+                    # Make sure that locked options match
+                    if (node.graph_lock_node is not None and
+                            node.graph_lock_node.options is not None and
+                            node.conanfile.options.values != node.graph_lock_node.options):
+                        raise ConanException("{}: Locked options do not match computed options\n"
+                                             "Locked options:\n{}\n"
+                                             "Computed options:\n{}"
+                                             .format(node.ref, node.graph_lock_node.options,
+                                                     node.conanfile.options.values))
+
+                    self._compute_package_id(node, default_package_id_mode,
+                                             default_python_requires_id_mode)
+
+                self._prefetch_remote_infos(level, build_mode, remotes)
+
+                for node in level:
+                    if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
+                        continue
+                    if node.package_id == PACKAGE_ID_UNKNOWN:
+                        assert node.binary is None, "Node.binary should be None"
+                        node.binary = BINARY_UNKNOWN
+                        # annotate pattern, so unused patterns in --build are not displayed as
+                        # errors
+                        build_mode.forced(node.conanfile, node.ref)
+                        continue
+                    self._evaluate_node(node, build_mode, update, remotes)
+        finally:
+            self._remote_infos.clear()
         deps_graph.mark_private_skippable(nodes_subset=nodes_subset, root=root)
+        self._report_package_ids()
 
     def reevaluate_node(self, node, remotes, build_mode, update):
         """ reevaluate the node is necessary when there is some PACKAGE_ID_UNKNOWN due to
@@ -0,0 +1,226 @@
+"""
+Cache of the resolved dependency graphs of "conan install", enabled with general.graph_cache.
+
+Repeating an install with the same inputs (consumer conanfile, its conandata.yml and sibling
+python files, profiles, build modes, remotes, CONAN_* environment, conan.conf, settings.yml,
+hooks...) resolves the same graph again and again. When everything was already installed, the
+resolved graph is stored as a lockfile, keyed by the hash of those inputs, together with the
+revisions of the recipes and packages that it uses, as they were in the local cache, and the
+references in the cache with the same names (new versions could change the resolution of
+version ranges). The next install with the same inputs reuses that lockfile if the cache still
+contains exactly the same, so the version ranges, the diamonds and the binaries don't need to
+be resolved again. Only the GRAPH_CACHE_MAX_ENTRIES most recently used graphs are kept, and
+"conan cache clean --max-age" removes the ones not used for that time.
+
+Only the CONAN_* environment variables and the ones defined in the [env] of the profiles are
+part of the inputs. Recipes whose requirements or options depend on other environment variables
+must disable the graph cache (CONAN_GRAPH_CACHE=0).
+"""
+import hashlib
+import json
+import os
+import time
+
+from conans import __version__
+from conans.client.graph.graph import BINARY_CACHE, BINARY_SKIP, RECIPE_CONSUMER, RECIPE_VIRTUAL
+from conans.errors import ConanException
+from conans.model.graph_lock import GraphLock
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import DATA_YML
+from conans.util.files import list_folder_subdirs, load, save
+from conans.util.log import logger
+
+GRAPH_CACHE_FOLDER = "graph_cache"
+GRAPH_CACHE_MAX_ENTRIES = 100  # The least recently used graphs beyond this are removed
+
+
+def _file_contents(path):
+    try:
+        return load(path)
+    except IOError:
+        return None
+
+
+class GraphCache(object):
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._folder = os.path.join(cache.cache_folder, GRAPH_CACHE_FOLDER)
+
+    def key(self, reference, create_reference, graph_info, build_mode, update, remotes,
+            apply_build_requires, lockfile_node_id):
+        """ hash of all the inputs of the graph computation, None if it cannot be cached
+        """
+        if (update or create_reference or lockfile_node_id or graph_info.graph_lock or
+                isinstance(reference, list)):
+            return None
+        if isinstance(reference, ConanFileReference):
+            consumer = [repr(reference)]
+        else:
+            consumer = [reference, self._consumer_files(reference)]
+        profile_build = graph_info.profile_build
+        inputs = [__version__,
+                  self._cache.config.revisions_enabled,
+                  consumer,
+                  repr(graph_info.root) if graph_info.root else None,
+                  graph_info.profile_host.dumps(),
+                  profile_build.dumps() if profile_build else None,
+                  build_mode,
+                  [(r.name, r.url) for r in remotes.values()] if remotes else None,
+                  remotes.selected.name if remotes and remotes.selected else None,
+                  apply_build_requires,
+                  sorted(str(ref) for ref in self._cache.editable_packages.edited_refs),
+                  self._environment(graph_info.profile_host, profile_build),
+                  _file_contents(self._cache.conan_conf_path),
+                  _file_contents(self._cache.settings_path),
+                  self._hooks()]
+        return hashlib.sha1(json.dumps(inputs).encode()).hexdigest()
+
+    @staticmethod
+    def _consumer_files(conanfile_path):
+        """ the consumer conanfile, its conandata.yml and the python files next to it, that it can
+        import, with their contents
+        """
+        folder, conanfile = os.path.split(conanfile_path)
+        names = sorted(name for name in os.listdir(folder)
+                       if name.endswith(".py") and name != conanfile)
+        return [[name, _file_contents(os.path.join(folder, name))]
+                for name in [conanfile, DATA_YML] + names]
+
+    @staticmethod
+    def _environment(*profiles):
+        """ the CONAN_* environment variables, as they define part of the config, and the ones
+        that the profiles [env] define too, as their values are appended to the existing ones
+        """
+        names = set()
+        for profile in profiles:
+            if profile is not None:
+                for values in profile.env_values.data.values():
+                    names.update(values)
+        return sorted((name, value) for name, value in os.environ.items()
+                      if name.startswith("CONAN_") or name in names)
+
+    def _hooks(self):
+        """ the hooks enabled in the conan.conf, with their code, as they can change the recipes
+        """
+        hooks = []
+        for hook_name in self._cache.config.hooks:
+            if not hook_name.endswith(".py"):
+                hook_name = "%s.py" % hook_name
+            hook_path = os.path.join(self._cache.hooks_path, hook_name)
+            hooks.append([hook_name, _file_contents(hook_path)])
+        return hooks
+
+    def _path(self, key):
+        return os.path.join(self._folder, "%s.json" % key)
+
+    def _refs(self, name):
+        """ all the references in the cache with this name, as "version/user/channel"
+        """
+        return sorted(list_folder_subdirs(os.path.join(self._cache.store, name), level=3))
+
+    def load(self, key):
+        """ the GraphLock of the graph computed with these inputs, None if there is no such
+        graph or the recipes or packages in the cache changed since then
+        """
+        try:
+            data = json.loads(load(self._path(key)))
+        except (IOError, ValueError):
+            return None
+        try:
+            for ref, revision, package_id, prev in data["revisions"]:
+                ref = ConanFileReference.loads(ref)
+                if self._cache.installed_as_editable(ref):
+                    return None
+                layout = self._cache.package_layout(ref)
+                metadata = layout.load_metadata()
+                if metadata.recipe.revision != revision:
+                    return None
+                if package_id is not None:
+                    if (package_id not in metadata.packages or
+                            metadata.packages[package_id].revision != prev or
+                            not os.path.isdir(layout.package(PackageReference(ref, package_id)))):
+                        return None
+            for name, refs in data["refs"].items():
+                if self._refs(name) != refs:
+                    return None
+            graph_lock = GraphLock.deserialize(data["graph_lock"],
+                                               self._cache.config.revisions_enabled)
+        except (ConanException, KeyError, ValueError) as e:
+            logger.debug("GRAPH CACHE: invalid entry %s: %s" % (key, str(e)))
+            return None
+        try:  # The modification time is the last use, for the eviction
+            os.utime(self._path(key), None)
+        except OSError:
+            pass
+        return graph_lock
+
+    def save(self, key, deps_graph, graph_lock):
+        """ stores the graph, only if it doesn't need to build or retrieve anything, as it was
+        not installed yet, the revisions in the cache will change
+        """
+        revisions = []
+        python_requires = set()
+        try:
+            for node in deps_graph.nodes:
+                if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
+                    continue
+                if node.binary not in (BINARY_CACHE, BINARY_SKIP):
+                    return
+                metadata = self._cache.package_layout(node.ref).load_metadata()
+                if node.binary == BINARY_CACHE:
+                    package_id = node.package_id
+                    prev = metadata.packages[package_id].revision
+                else:
+                    package_id = prev = None
+                revisions.append((repr(node.ref.copy_clear_rev()), metadata.recipe.revision,
+                                  package_id, prev))
+            for lock_node in graph_lock.nodes.values():
+                python_requires.update(lock_node.python_requires or [])
+            for ref in python_requires:
+                metadata = self._cache.package_layout(ref).load_metadata()
+                revisions.append((repr(ref.copy_clear_rev()), metadata.recipe.revision, None,
+                                  None))
+        except (ConanException, KeyError) as e:
+            logger.debug("GRAPH CACHE: cannot store the graph: %s" % str(e))
+            return
+        names = set(ConanFileReference.loads(ref).name for ref, _, _, _ in revisions)
+        data = {"graph_lock": graph_lock.serialize(),
+                "revisions": revisions,
+                "refs": {name: self._refs(name) for name in names}}
+        save(self._path(key), json.dumps(data))
+        self.evict(max_entries=GRAPH_CACHE_MAX_ENTRIES)
+
+    def remove(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def evict(self, max_entries=None, max_age=None):
+        """ removes the stored graphs not used in more than max_age seconds, and the least
+        recently used ones beyond max_entries. Returns the number of removed graphs
+        """
+        try:
+            names = [name for name in os.listdir(self._folder) if name.endswith(".json")]
+        except OSError:
+            return 0
+        entries = []
+        for name in names:
+            path = os.path.join(self._folder, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:  # Removed by another process
+                pass
+        entries.sort(reverse=True)  # The most recently used first
+        now = time.time()
+        removed = 0
+        for i, (last_use, path) in enumerate(entries):
+            if ((max_entries is not None and i >= max_entries) or
+                    (max_age is not None and now - last_use > max_age)):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
@@ -107,9 +107,46 @@ class GraphManager(object):
         return conanfile
 
     def load_graph(self, reference, create_reference, graph_info, build_mode, check_updates, update,
-                   remotes, recorder, apply_build_requires=True, lockfile_node_id=None):
+                   remotes, recorder, apply_build_requires=True, lockfile_node_id=None,
+                   graph_cache=None):
         """ main entry point to compute a full dependency graph
+        :param graph_cache: GraphCache to reuse the graph resolved by a previous call with the same
+                            inputs, and to store it for the next ones
         """
+        cache_key = None
+        if graph_cache is not None:
+            cache_key = graph_cache.key(reference, create_reference, graph_info, build_mode,
+                                        check_updates or update, remotes, apply_build_requires,
+                                        lockfile_node_id)
+            if cache_key is not None:
+                graph_info.graph_lock = graph_cache.load(cache_key)
+                if graph_info.graph_lock is not None:
+                    try:
+                        deps_graph = self._load_graph_from_inputs(reference, create_reference,
+                                                                  graph_info, build_mode,
+                                                                  check_updates, update, remotes,
+                                                                  recorder, apply_build_requires,
+                                                                  lockfile_node_id)
+                    except ConanException as e:
+                        # Something not tracked by the key changed, computing it again
+                        self._output.warn("The cached dependency graph cannot be used: %s"
+                                          % str(e))
+                        graph_cache.remove(cache_key)
+                        graph_info.graph_lock = None
+                    else:
+                        self._output.info("Using the cached dependency graph")
+                        return deps_graph
+
+        deps_graph = self._load_graph_from_inputs(reference, create_reference, graph_info,
+                                                  build_mode, check_updates, update, remotes,
+                                                  recorder, apply_build_requires, lockfile_node_id)
+        if cache_key is not None:
+            graph_cache.save(cache_key, deps_graph, graph_info.graph_lock)
+        return deps_graph
+
+    def _load_graph_from_inputs(self, reference, create_reference, graph_info, build_mode,
+                                check_updates, update, remotes, recorder, apply_build_requires,
+                                lockfile_node_id):
         root_node = self._load_root_node(reference, create_reference, graph_info, lockfile_node_id)
         deps_graph = self._resolve_graph(root_node, graph_info, build_mode, check_updates, update,
                                          remotes, recorder,
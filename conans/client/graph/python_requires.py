@@ -2,7 +2,7 @@ import os
 from collections import namedtuple
 from contextlib import contextmanager
 
-from conans.client.loader import parse_conanfile
+from conans.client.loader import parse_conanfile, recipe_bytecode_path
 from conans.client.recorder.action_recorder import ActionRecorder
 from conans.errors import ConanException, NotFoundException
 from conans.model.ref import ConanFileReference
@@ -185,8 +185,10 @@ class ConanPythonRequire(object):
                                             remotes=self._remotes,
                                             recorder=ActionRecorder())
             path, _, _, new_ref = result
+            bytecode_path = recipe_bytecode_path(self._proxy._cache, path)
             module, conanfile = parse_conanfile(conanfile_path=path, python_requires=self,
-                                                generator_manager=self._generator_manager)
+                                                generator_manager=self._generator_manager,
+                                                bytecode_path=bytecode_path)
 
             # Check for alias
             if getattr(conanfile, "alias", None):
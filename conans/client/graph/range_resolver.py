@@ -2,11 +2,16 @@ import re
 
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference
+from conans.paths.package_layouts.package_cache_layout import PackageCacheLayout
 from conans.search.search import search_recipes
 
 re_param = re.compile(r"^(?P<function>include_prerelease|loose)\s*=\s*(?P<value>True|False)$")
 re_version = re.compile(r"^((?!(include_prerelease|loose))[a-zA-Z0-9_+.\-~<>=|*^\s])*$")
 
+# The version range expressions already parsed in this process
+# {versionexpr: (semver Range, loose, include_prerelease, warnings)}
+_parsed_ranges = {}
+
 
 def _parse_versionexpr(versionexpr, result):
     expression = [it.strip() for it in versionexpr.split(",")]
@@ -51,19 +56,31 @@ def _parse_versionexpr(versionexpr, result):
     return version_range, loose, include_prerelease
 
 
+def _parse_range(versionexpr):
+    parsed = _parsed_ranges.get(versionexpr)
+    if parsed is None:
+        from semver import Range
+        warnings = []
+        version_range, loose, include_prerelease = _parse_versionexpr(versionexpr, warnings)
+        # Check version range expression
+        try:
+            act_range = Range(version_range, loose)
+        except ValueError:
+            raise ConanException("version range expression '%s' is not valid" % version_range)
+        parsed = act_range, loose, include_prerelease, warnings
+        _parsed_ranges[versionexpr] = parsed
+    return parsed
+
+
 def satisfying(list_versions, versionexpr, result):
     """ returns the maximum version that satisfies the expression
     if some version cannot be converted to loose SemVer, it is discarded with a msg
     This provides some workaround for failing comparisons like "2.1" not matching "<=2.1"
     """
-    from semver import SemVer, Range, max_satisfying
-    version_range, loose, include_prerelease = _parse_versionexpr(versionexpr, result)
-
-    # Check version range expression
-    try:
-        act_range = Range(version_range, loose)
-    except ValueError:
-        raise ConanException("version range expression '%s' is not valid" % version_range)
+    from semver import SemVer, max_satisfying
+    act_range, loose, include_prerelease, warnings = _parse_range(versionexpr)
+    for warning in warnings:
+        result.append(warning)
 
     # Validate all versions
     candidates = {}
@@ -87,6 +104,8 @@ class RangeResolver(object):
         self._cache = cache
         self._remote_manager = remote_manager
         self._cached_remote_found = {}
+        # {(name, user, channel): (PackageCacheLayout.writes, refs found in the cache)}
+        self._cached_local_found = {}
         self._result = []
 
     @property
@@ -140,10 +159,14 @@ class RangeResolver(object):
                                  % (version_range, require, base_conanref, origin))
 
     def _resolve_local(self, search_ref, version_range):
-        local_found = search_recipes(self._cache, search_ref)
-        local_found = [ref for ref in local_found
-                       if ref.user == search_ref.user and
-                       ref.channel == search_ref.channel]
+        key = search_ref.name, search_ref.user, search_ref.channel
+        writes, local_found = self._cached_local_found.get(key, (None, None))
+        if writes != PackageCacheLayout.writes:  # Not searched yet, or the cache changed
+            local_found = search_recipes(self._cache, search_ref)
+            local_found = [ref for ref in local_found
+                           if ref.user == search_ref.user and
+                           ref.channel == search_ref.channel]
+            self._cached_local_found[key] = PackageCacheLayout.writes, local_found
         if local_found:
             return self._resolve_version(version_range, local_found)
 
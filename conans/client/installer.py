@@ -1,10 +1,14 @@
+import bisect
 import os
 import shutil
 import textwrap
 import time
 from multiprocessing.pool import ThreadPool
 
+from six.moves.queue import Queue
+
 from conans.client import tools
+from conans.client.build_jobs import build_job
 from conans.client.conanfile.build import run_build_method
 from conans.client.conanfile.package import run_package_method
 from conans.client.file_copier import report_copied_files
@@ -20,10 +24,10 @@ from conans.client.tools.env import no_op
 from conans.client.tools.env import pythonpath
 from conans.errors import (ConanException, ConanExceptionInUserConanfileMethod,
                            conanfile_exception_formatter, ConanInvalidConfiguration)
-from conans.model.build_info import CppInfo, DepCppInfo
+from conans.model.build_info import CppInfo, DepCppInfo, DepsCppInfo
 from conans.model.conan_file import ConanFile
 from conans.model.editable_layout import EditableLayout
-from conans.model.env_info import EnvInfo
+from conans.model.env_info import DepsEnvInfo, EnvInfo
 from conans.model.graph_info import GraphInfo
 from conans.model.graph_lock import GraphLockFile
 from conans.model.info import PACKAGE_ID_UNKNOWN
@@ -59,6 +63,53 @@ def add_env_conaninfo(conan_file, subtree_libnames):
                 conan_file.info.env_values.add(name, value, package_name)
 
 
+def _pending_download(node, pending_downloads):
+    if node.binary not in (BINARY_DOWNLOAD, BINARY_UPDATE):
+        return None
+    return pending_downloads.get(node.pref)
+
+
+class _PendingNodes(object):
+    """ Kahn's algorithm over the nodes to install, as Graph._order_levels() does: the number of
+    unfinished upstream nodes of every node and the nodes waiting for each one, so every edge is
+    visited only once. The ready nodes (all their upstream nodes finished) are kept in the order
+    of nodes_by_level
+    """
+
+    def __init__(self, nodes_by_level):
+        nodes = [node for level in nodes_by_level for node in level]
+        # Indexed by id(), hashing the Node (the reference and conanfile) is expensive
+        self._position = {id(node): i for i, node in enumerate(nodes)}
+        self._pending = {}
+        self._waiting = {}
+        self.ready = []  # [(position, node)], sorted
+        self.unfinished = len(nodes)
+        for node in nodes:
+            neighbor_ids = set(id(n) for n in node.neighbors()).intersection(self._position)
+            self._pending[id(node)] = len(neighbor_ids)
+            for neighbor_id in neighbor_ids:
+                self._waiting.setdefault(neighbor_id, []).append(node)
+            if not neighbor_ids:
+                self.ready.append((self._position[id(node)], node))
+
+    def take(self, index):
+        """ removes from the ready ones the node at that index, to be processed """
+        return self.ready.pop(index)[1]
+
+    def finish(self, node):
+        """ marks a taken node as processed, its downstream nodes might be ready now """
+        self.unfinished -= 1
+        for waiting_node in self._waiting.get(id(node), ()):
+            self._pending[id(waiting_node)] -= 1
+            if not self._pending[id(waiting_node)]:
+                bisect.insort(self.ready, (self._position[id(waiting_node)], waiting_node))
+
+
+def _recipe_key(node):
+    # Different revisions of the same recipe share the same folders in the cache
+    return node.ref.copy_clear_rev() if node.ref else None
+
+
 class _PackageBuilder(object):
     def __init__(self, cache, output, hook_manager, remote_manager, generators):
         self._cache = cache
@@ -292,20 +343,37 @@ class BinaryInstaller(object):
         self._binaries_analyzer = app.binaries_analyzer
         self._hook_manager = app.hook_manager
         self._generator_manager = app.generator_manager
+        # {node: EnvInfo} of the build context dependencies, the same for all their consumers.
+        # Shared by the threads of the parallel builds without a lock of its own, it relies on
+        # conans.client.build_jobs serializing the python side of the jobs
+        self._build_env_infos = {}
+        # {node: [node and its transitive dependencies sorted by inverse levels]}, to compute the
+        # closures of their consumers, shared like self._build_env_infos
+        self._transitive_closures = {}
+        # {node: (DepsCppInfo, DepsEnvInfo) of _transitive_closures[node]}, for the consumers
+        self._transitive_merged_infos = {}
+        self._inverse_levels = {}  # {id(node): inverse level}, the order of the closures
         # Load custom generators from the cache, generators are part of the binary
         # build and install. Generators loaded here from the cache will have precedence
         # and overwrite possible generators loaded from packages (requires)
         for generator_path in app.cache.generators:
             app.loader.load_generators(generator_path)
 
-    def install(self, deps_graph, remotes, build_mode, update, keep_build=False, graph_info=None):
+    def install(self, deps_graph, remotes, build_mode, update, keep_build=False, graph_info=None,
+                parallel_builds=None):
         # order by levels and separate the root node (ref=None) from the rest
         nodes_by_level = deps_graph.by_levels()
         root_level = nodes_by_level.pop()
         root_node = root_level[0]
+        inverse_levels = deps_graph.inverse_levels()
+        self._inverse_levels.update((id(n), i) for i, level in enumerate(inverse_levels)
+                                    for n in level)
         # Get the nodes in order and if we have to build them
         self._out.info("Installing (downloading, building) binaries...")
-        self._build(nodes_by_level, keep_build, root_node, graph_info, remotes, build_mode, update)
+        if parallel_builds is None:
+            parallel_builds = self._cache.config.parallel_builds
+        self._build(nodes_by_level, keep_build, root_node, graph_info, remotes, build_mode, update,
+                    parallel_builds)
 
     @staticmethod
     def _classify(nodes_by_level):
@@ -365,13 +433,17 @@ class BinaryInstaller(object):
             Or read 'http://docs.conan.io/en/latest/faq/troubleshooting.html#error-missing-prebuilt-package'
             ''' % (missing_pkgs, build_str)))
 
-    def _download(self, downloads, processed_package_refs):
+    def _download(self, downloads, processed_package_refs, events=None):
         """ executes the download of packages (both download and update), only once for a given
         PREF, even if node duplicated
         :param downloads: all nodes to be downloaded or updated, included repetitions
+        :param events: Queue where the background downloads post ("download", pref) when they
+                       finish, successfully or not
+        :return: (thread_pool, {pref: AsyncResult}) of the downloads still running in background
+                 when parallel_download is defined, so builds can start before they finish
         """
         if not downloads:
-            return
+            return None, {}
 
         download_nodes = []
         for node in downloads:
@@ -387,25 +459,131 @@ class BinaryInstaller(object):
             layout = self._cache.package_layout(npref.ref, n.conanfile.short_paths)
             # We cannot embed the package_lock inside the remote.get_package()
             # because the handle_node_cache has its own lock
-            with layout.package_lock(pref):
+            with layout.package_lock(npref):
                 self._download_pkg(layout, n)
 
+        def _background_download(n):
+            try:
+                _download(n)
+            finally:
+                if events is not None:
+                    events.put(("download", n.pref))
+
         parallel = self._cache.config.parallel_download
         if parallel is not None:
             self._out.info("Downloading binary packages in %s parallel threads" % parallel)
             thread_pool = ThreadPool(parallel)
-            thread_pool.map(_download, [n for n in download_nodes])
+            pending = {n.pref: thread_pool.apply_async(_background_download, (n, ))
+                       for n in download_nodes}
             thread_pool.close()
-            thread_pool.join()
-        else:
-            for node in download_nodes:
-                _download(node)
+            return thread_pool, pending
+
+        for node in download_nodes:
+            _download(node)
+        return None, {}
 
     def _download_pkg(self, layout, node):
         self._remote_manager.get_package(node.conanfile, node.pref, layout, node.binary_remote,
                                          node.conanfile.output, self._recorder)
+        self._dedup_package(layout, node.pref)
+
+    def _dedup_package(self, layout, pref):
+        if self._cache.config.cache_dedup:
+            self._cache.blob_store.dedup_folder(layout.package(pref))
+
+    @staticmethod
+    def _pipeline(nodes_by_level, pending_downloads):
+        """ yields the nodes in an order that respects dependencies, but without waiting for all
+        the background downloads to finish: a node is ready as soon as all its upstream nodes
+        have been processed (the caller processes each yielded node before asking for the next)
+        and its own package, if being downloaded, is already in the cache.
+        Without pending downloads the order is exactly the one defined by nodes_by_level
+        """
+        pending = _PendingNodes(nodes_by_level)
+        while pending.unfinished:
+            assert pending.ready, "Cannot schedule nodes, there is a dependency loop"
+            index = 0  # The first one in order, will wait for it if nothing else is ready
+            for i, (_, node) in enumerate(pending.ready):
+                download = _pending_download(node, pending_downloads)
+                if download is None or download.ready():
+                    index = i
+                    break
+            candidate = pending.take(index)
+            download = _pending_download(candidate, pending_downloads)
+            if download is not None:
+                download.get()  # Blocks until downloaded, raises the download exception if any
+            yield candidate
+            pending.finish(candidate)
+
+    def _parallel_jobs(self, nodes_by_level, pending_downloads, events, parallel_builds,
+                       install_node):
+        """ processes the nodes in a pool of 'parallel_builds' threads, so independent nodes are
+        built at the same time. A node is submitted once all its upstream nodes are finished and
+        its package, if downloaded, is in the cache. Nodes of the same recipe are never processed
+        at the same time, as they share the cache folders and locks.
+        The scheduler blocks in the 'events' queue, where both the background downloads and the
+        jobs post when they finish.
+        The CPUs (CONAN_CPU_COUNT) are evenly distributed among the jobs
+        """
+        self._out.info("Building binary packages in %s parallel jobs" % parallel_builds)
+        cpu_count = max(1, tools.cpu_count(self._out) // parallel_builds)
+        pending = _PendingNodes(nodes_by_level)
+        running = {}  # {recipe reference: node}
+        errors = []
+
+        def _job(n):
+            error = None
+            try:
+                with build_job(str(n.conanfile), cpu_count):
+                    install_node(n)
+            except BaseException as e:
+                error = e
+            events.put(("job", n, error))
+
+        thread_pool = ThreadPool(parallel_builds)
+        try:
+            while (pending.unfinished and not errors) or running:
+                waiting_download = False
+                index = 0
+                while not errors and index < len(pending.ready):
+                    node = pending.ready[index][1]
+                    if _recipe_key(node) in running:
+                        index += 1
+                        continue
+                    download = _pending_download(node, pending_downloads)
+                    if download is not None:
+                        if not download.ready():
+                            waiting_download = True
+                            index += 1
+                            continue
+                        if not download.successful():
+                            download.get()  # Raises the download exception
+                    pending.take(index)
+                    running[_recipe_key(node)] = node
+                    thread_pool.apply_async(_job, (node, ))
+
+                if not running:
+                    # Nothing being processed, everything ready is waiting for a download
+                    assert waiting_download, "Cannot schedule nodes, there is a dependency loop"
+                event = events.get()
+                if event[0] == "download":
+                    # Posted right before the download result is set
+                    pending_downloads[event[1]].wait()
+                    continue
+                _, node, error = event
+                running.pop(_recipe_key(node))
+                if error is not None:
+                    errors.append(error)
+                else:
+                    pending.finish(node)
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+        if errors:
+            raise errors[0]
 
-    def _build(self, nodes_by_level, keep_build, root_node, graph_info, remotes, build_mode, update):
+    def _build(self, nodes_by_level, keep_build, root_node, graph_info, remotes, build_mode, update,
+               parallel_builds=None):
         using_build_profile = bool(graph_info.profile_build)
         missing, invalid, downloads = self._classify(nodes_by_level)
         if invalid:
@@ -414,34 +592,54 @@ class BinaryInstaller(object):
                 msg.append("{}: Invalid ID: {}".format(node.conanfile, node.conanfile.info.invalid))
             raise ConanInvalidConfiguration("\n".join(msg))
         self._raise_missing(missing)
+        # Shared by the threads of the parallel builds, only safe because the python side of the
+        # jobs is serialized by conans.client.build_jobs, as self._build_env_infos
         processed_package_refs = set()
-        self._download(downloads, processed_package_refs)
+        events = Queue()  # The background downloads and the parallel jobs post when finished
+        download_pool, pending_downloads = self._download(downloads, processed_package_refs,
+                                                          events)
 
-        for level in nodes_by_level:
-            for node in level:
-                ref, conan_file = node.ref, node.conanfile
-                output = conan_file.output
-
-                self._propagate_info(node, using_build_profile)
-                if node.binary == BINARY_EDITABLE:
-                    self._handle_node_editable(node, graph_info)
-                    # Need a temporary package revision for package_revision_mode
-                    # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
-                    node.prev = "editable"
-                else:
-                    if node.binary == BINARY_SKIP:  # Privates not necessary
-                        continue
-                    assert ref.revision is not None, "Installer should receive RREV always"
-                    if node.binary == BINARY_UNKNOWN:
-                        self._binaries_analyzer.reevaluate_node(node, remotes, build_mode, update)
-                        if node.binary == BINARY_MISSING:
-                            self._raise_missing([node])
-                    _handle_system_requirements(conan_file, node.pref, self._cache, output)
-                    self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+        def _install_node(node):
+            self._install_node(node, keep_build, graph_info, remotes, build_mode, update,
+                               using_build_profile, processed_package_refs)
+
+        try:
+            if parallel_builds and parallel_builds > 1:
+                self._parallel_jobs(nodes_by_level, pending_downloads, events, parallel_builds,
+                                    _install_node)
+            else:
+                for node in self._pipeline(nodes_by_level, pending_downloads):
+                    _install_node(node)
+        finally:
+            if download_pool is not None:
+                # Do not leave background downloads running (and holding package locks)
+                download_pool.join()
 
         # Finally, propagate information to root node (ref=None)
         self._propagate_info(root_node, using_build_profile)
 
+    def _install_node(self, node, keep_build, graph_info, remotes, build_mode, update,
+                      using_build_profile, processed_package_refs):
+        ref, conan_file = node.ref, node.conanfile
+        output = conan_file.output
+
+        self._propagate_info(node, using_build_profile)
+        if node.binary == BINARY_EDITABLE:
+            self._handle_node_editable(node, graph_info)
+            # Need a temporary package revision for package_revision_mode
+            # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
+            node.prev = "editable"
+        else:
+            if node.binary == BINARY_SKIP:  # Privates not necessary
+                return
+            assert ref.revision is not None, "Installer should receive RREV always"
+            if node.binary == BINARY_UNKNOWN:
+                self._binaries_analyzer.reevaluate_node(node, remotes, build_mode, update)
+                if node.binary == BINARY_MISSING:
+                    self._raise_missing([node])
+            _handle_system_requirements(conan_file, node.pref, self._cache, output)
+            self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+
     def _handle_node_editable(self, node, graph_info):
         # Get source of information
         package_layout = self._cache.package_layout(node.ref)
@@ -500,6 +698,7 @@ class BinaryInstaller(object):
                     layout.package_remove(pref)
                     with layout.set_dirty_context_manager(pref):
                         pref = self._build_package(node, output, keep_build, remotes)
+                    self._dedup_package(layout, pref)
                     assert node.prev, "Node PREV shouldn't be empty"
                     assert node.pref.revision, "Node PREF revision shouldn't be empty"
                     assert pref.revision is not None, "PREV for %s to be built is None" % str(pref)
@@ -515,6 +714,8 @@ class BinaryInstaller(object):
             package_folder = layout.package(pref)
             assert os.path.isdir(package_folder), ("Package '%s' folder must exist: %s\n"
                                                    % (str(pref), package_folder))
+            # For the LRU eviction of "conan cache clean"
+            layout.record_access(pref)
             # Call the info method
             self._call_package_info(conanfile, package_folder, ref=pref.ref)
             self._recorder.package_cpp_info(pref, conanfile.cpp_info)
@@ -550,12 +751,12 @@ class BinaryInstaller(object):
         conan_file = node.conanfile
         # FIXME: Not the best place to assign the _conan_using_build_profile
         conan_file._conan_using_build_profile = using_build_profile
-        transitive = [it for it in node.transitive_closure.values()]
+        transitive = set(node.transitive_closure.values())
 
-        br_host = []
+        br_host = set()
         for it in node.dependencies:
             if it.require.build_require_context == CONTEXT_HOST:
-                br_host.extend(it.dst.transitive_closure.values())
+                br_host.update(it.dst.transitive_closure.values())
 
         # Initialize some members if we are using different contexts
         if using_build_profile:
@@ -565,34 +766,144 @@ class BinaryInstaller(object):
             if n not in transitive:
                 conan_file.output.info("Applying build-requirement: %s" % str(n.ref))
 
-            dep_cpp_info = n.conanfile._conan_dep_cpp_info
-
             if not using_build_profile:  # Do not touch anything
                 conan_file.deps_user_info[n.ref.name] = n.conanfile.user_info
-                conan_file.deps_cpp_info.add(n.ref.name, dep_cpp_info)
-                conan_file.deps_env_info.update(n.conanfile.env_info, n.ref.name)
             else:
                 if n in transitive or n in br_host:
                     conan_file.deps_user_info[n.ref.name] = n.conanfile.user_info
-                    conan_file.deps_cpp_info.add(n.ref.name, dep_cpp_info)
                 else:
                     conan_file.user_info_build[n.ref.name] = n.conanfile.user_info
-                    env_info = EnvInfo()
-                    env_info._values_ = n.conanfile.env_info._values_.copy()
-                    # Add cpp_info.bin_paths/lib_paths to env_info (it is needed for runtime)
-                    env_info.DYLD_LIBRARY_PATH.extend(dep_cpp_info.lib_paths)
-                    env_info.DYLD_LIBRARY_PATH.extend(dep_cpp_info.framework_paths)
-                    env_info.LD_LIBRARY_PATH.extend(dep_cpp_info.lib_paths)
-                    env_info.PATH.extend(dep_cpp_info.bin_paths)
-                    conan_file.deps_env_info.update(env_info, n.ref.name)
+                    conan_file.deps_env_info.update(self._build_env_info(n), n.ref.name)
+
+        # The runs of dependencies that are the transitive closure of a direct dependency reuse
+        # its already merged info, instead of adding them one by one
+        if not using_build_profile:
+            for n, whole in self._closure_runs(list(node.public_closure), node.neighbors()):
+                if whole:
+                    cpp_info, env_info = self._transitive_infos(n)
+                    conan_file.deps_cpp_info.update_deps_cpp_info(cpp_info)
+                    conan_file.deps_env_info.update_deps_env_info(env_info)
+                else:
+                    conan_file.deps_cpp_info.add(n.ref.name, n.conanfile._conan_dep_cpp_info)
+                    conan_file.deps_env_info.update(n.conanfile.env_info, n.ref.name)
+        else:  # Only the host ones, the build ones env_info was already added
+            host = lambda n: n in transitive or n in br_host
+            for n, whole in self._closure_runs(list(node.public_closure), node.neighbors(), host):
+                if whole:
+                    cpp_info, _ = self._transitive_infos(n)
+                    conan_file.deps_cpp_info.update_deps_cpp_info(cpp_info)
+                else:
+                    conan_file.deps_cpp_info.add(n.ref.name, n.conanfile._conan_dep_cpp_info)
 
         conan_file.deps_cpp_info.direct_host_deps = [n.name for n in node.neighbors()
                                                      if n.context == CONTEXT_HOST]
         # Update the info but filtering the package values that not apply to the subtree
         # of this current node and its dependencies.
-        subtree_libnames = [node.ref.name for node in node_order]
+        subtree_libnames = set(node.ref.name for node in node_order)
         add_env_conaninfo(conan_file, subtree_libnames)
 
+    def _transitive_deps(self, node):
+        """ the node and the dependencies that it propagates to its consumers (its
+        transitive_closure), sorted by inverse levels. Computed once per node, from the ones of
+        its direct dependencies
+        """
+        deps = self._transitive_closures.get(node)
+        if deps is None:
+            closures = [self._transitive_deps(edge.dst) for edge in node.dependencies
+                        if not edge.private and not edge.build_require]
+            deps = [node] + self._merge_levels(closures)
+            self._transitive_closures[node] = deps
+        return deps
+
+    def _merge_levels(self, closures):
+        """ the union of several lists of nodes sorted by inverse levels, sorted too. The nodes of
+        the same level keep the order in which they appear in the lists
+        """
+        if len(closures) == 1:
+            return closures[0]
+        levels = self._inverse_levels
+        by_level = {}
+        seen = set()
+        for closure in closures:
+            for n in closure:
+                if id(n) not in seen:
+                    seen.add(id(n))
+                    by_level.setdefault(levels[id(n)], []).append(n)
+        return [n for level in sorted(by_level) for n in by_level[level]]
+
+    def _closure_runs(self, closure, dependencies, included=None):
+        """ [(node, whole)] to add the info of the nodes of the closure (not skipped, and
+        included) in order. "whole" if the node is a direct dependency that starts a run of
+        nodes that is exactly its transitive closure, all of them can be added at once with
+        its already merged infos
+        """
+        closures = {id(n): self._transitive_deps(n) for n in dependencies}
+        runs = []
+        i = 0
+        while i < len(closure):
+            n = closure[i]
+            dep_closure = closures.get(id(n))
+            if (dep_closure is not None and 1 < len(dep_closure) <= len(closure) - i and
+                    all(d is closure[i + j] for j, d in enumerate(dep_closure)) and
+                    (included is None or all(included(d) for d in dep_closure))):
+                runs.append((n, True))
+                i += len(dep_closure)
+                continue
+            if n.binary != BINARY_SKIP and (included is None or included(n)):
+                runs.append((n, False))
+            i += 1
+        return runs
+
+    def _transitive_infos(self, node):
+        """ DepsCppInfo and DepsEnvInfo of the node and its transitive dependencies, merged once
+        and reused by all the consumers. The ones of its dependencies are computed first, without
+        recursion, the graph can be very deep
+        """
+        infos = self._transitive_merged_infos
+        pending = [node]
+        while pending:
+            n = pending[-1]
+            if n in infos:
+                pending.pop()
+                continue
+            dependencies = [edge.dst for edge in n.dependencies
+                            if not edge.private and not edge.build_require]
+            runs = self._closure_runs(self._transitive_deps(n)[1:], dependencies)
+            missing = [dep for dep, whole in runs if whole and dep not in infos]
+            if missing:
+                pending.extend(missing)
+                continue
+            pending.pop()
+            cpp_info, env_info = DepsCppInfo(), DepsEnvInfo()
+            if n.binary != BINARY_SKIP:
+                runs.insert(0, (n, False))
+            for dep, whole in runs:
+                if whole:
+                    dep_cpp_info, dep_env_info = infos[dep]
+                    cpp_info.update_deps_cpp_info(dep_cpp_info)
+                    env_info.update_deps_env_info(dep_env_info)
+                else:
+                    cpp_info.add(dep.ref.name, dep.conanfile._conan_dep_cpp_info)
+                    env_info.update(dep.conanfile.env_info, dep.ref.name)
+            infos[n] = cpp_info, env_info
+        return infos[node]
+
+    def _build_env_info(self, node):
+        """ the env_info of a build context dependency, including the paths of its cpp_info, as
+        they are needed at runtime. Computed once, it is the same for all the consumers
+        """
+        env_info = self._build_env_infos.get(node)
+        if env_info is None:
+            dep_cpp_info = node.conanfile._conan_dep_cpp_info
+            env_info = EnvInfo()
+            env_info._values_ = node.conanfile.env_info._values_.copy()
+            env_info.DYLD_LIBRARY_PATH.extend(dep_cpp_info.lib_paths)
+            env_info.DYLD_LIBRARY_PATH.extend(dep_cpp_info.framework_paths)
+            env_info.LD_LIBRARY_PATH.extend(dep_cpp_info.lib_paths)
+            env_info.PATH.extend(dep_cpp_info.bin_paths)
+            self._build_env_infos[node] = env_info
+        return env_info
+
     def _call_package_info(self, conanfile, package_folder, ref):
         conanfile.cpp_info = CppInfo(conanfile.name, package_folder)
         conanfile.cpp_info.version = conanfile.version
@@ -627,3 +938,4 @@ class BinaryInstaller(object):
                         conanfile._conan_dep_cpp_info = DepCppInfo(conanfile.cpp_info)
                     self._hook_manager.execute("post_package_info", conanfile=conanfile,
                                                reference=ref)
+
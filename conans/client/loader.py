@@ -1,10 +1,14 @@
 import fnmatch
-import imp
+import hashlib
 import inspect
+import marshal
 import os
 import sys
+import types
 import uuid
+from collections import OrderedDict
 
+import six
 import yaml
 
 from conans.client.conf.required_version import validate_conan_version
@@ -17,15 +21,23 @@ from conans.model.conan_generator import Generator
 from conans.model.options import OptionsValues
 from conans.model.ref import ConanFileReference
 from conans.model.settings import Settings
-from conans.paths import DATA_YML
+from conans.paths import DATA_YML, EXPORT_FOLDER
 from conans.util.conan_v2_mode import CONAN_V2_MODE_ENVVAR
-from conans.util.files import load
+from conans.util.files import load, mkdir
+from conans.util.log import logger
+
+if six.PY3:
+    import importlib.util
+
+RECIPE_BYTECODE_FOLDER = "recipe_bytecode"
 
 
 class ConanFileLoader(object):
 
-    def __init__(self, runner, output, python_requires, generator_manager=None, pyreq_loader=None):
+    def __init__(self, runner, output, python_requires, generator_manager=None, pyreq_loader=None,
+                 cache=None):
         self._runner = runner
+        self._cache = cache
         self._generator_manager = generator_manager
         self._output = output
         self._pyreq_loader = pyreq_loader
@@ -56,8 +68,9 @@ class ConanFileLoader(object):
             self._python_requires.locked_versions = {r.name: r for r in lock_python_requires}
         try:
             self._python_requires.valid = True
+            bytecode_path = recipe_bytecode_path(self._cache, conanfile_path)
             module, conanfile = parse_conanfile(conanfile_path, self._python_requires,
-                                                self._generator_manager)
+                                                self._generator_manager, bytecode_path)
             self._python_requires.valid = False
 
             self._python_requires.locked_versions = None
@@ -341,9 +354,9 @@ def _parse_module(conanfile_module, module_id, generator_manager):
     return result
 
 
-def parse_conanfile(conanfile_path, python_requires, generator_manager):
+def parse_conanfile(conanfile_path, python_requires, generator_manager, bytecode_path=None):
     with python_requires.capture_requires() as py_requires:
-        module, filename = _parse_conanfile(conanfile_path)
+        module, filename = _parse_conanfile(conanfile_path, bytecode_path)
         try:
             conanfile = _parse_module(module, filename, generator_manager)
 
@@ -365,7 +378,107 @@ def parse_conanfile(conanfile_path, python_requires, generator_manager):
             raise ConanException("%s: %s" % (conanfile_path, str(e)))
 
 
-def _parse_conanfile(conan_file_path):
+def _recipe_bytecode_name(export_folder):
+    return hashlib.sha1(os.path.abspath(export_folder).encode("utf-8")).hexdigest()
+
+
+def recipe_bytecode_path(cache, conanfile_path):
+    """ The compiled code of the recipes exported to the cache is stored in the conan home, by
+    the hash of their path, one file per Python version. None for the recipes in user space, and
+    in Python 2 (only the in-process memo is used)
+    """
+    if cache is None or not six.PY3:
+        return None
+    export_folder = os.path.dirname(os.path.abspath(conanfile_path))
+    if (os.path.basename(export_folder) != EXPORT_FOLDER or
+            not export_folder.startswith(os.path.abspath(cache.store) + os.sep)):
+        return None
+    return os.path.join(cache.cache_folder, RECIPE_BYTECODE_FOLDER,
+                        "%s.%s" % (_recipe_bytecode_name(export_folder),
+                                   sys.implementation.cache_tag))
+
+
+def remove_recipe_bytecode(cache, export_folder):
+    """ removes the bytecode files (of every Python version) of a recipe removed from the cache
+    """
+    folder = os.path.join(cache.cache_folder, RECIPE_BYTECODE_FOLDER)
+    if not os.path.isdir(folder):
+        return
+    prefix = _recipe_bytecode_name(export_folder) + "."
+    for filename in os.listdir(folder):
+        if filename.startswith(prefix):
+            try:
+                os.remove(os.path.join(folder, filename))
+            except OSError as e:
+                logger.debug("RECIPE BYTECODE: cannot remove %s: %s" % (filename, str(e)))
+
+
+# Code objects of the recipes recently compiled in this process, by path and source hash. Least
+# recently used first, bounded so long-lived processes (API, TestClient) don't keep them all
+_compiled_conanfiles = OrderedDict()
+_COMPILED_CONANFILES_MAX = 512
+
+
+def _compile_conanfile(conan_file_path, bytecode_path=None):
+    """ Compiling the recipes dominates the loading of big graphs, the code objects are reused
+    from memory or from the bytecode file, as long as the conanfile source and the Python
+    version are the same
+    """
+    with open(conan_file_path, "rb") as f:
+        source = f.read()
+    source_hash = hashlib.sha1(source).digest()
+    key = (conan_file_path, source_hash)
+    code = _compiled_conanfiles.pop(key, None)
+    if code is not None:
+        _compiled_conanfiles[key] = code  # The most recently used, the last
+        return code
+
+    if bytecode_path:  # Only Python 3
+        # The path is part of the header, the code objects contain it (tracebacks)
+        header = importlib.util.MAGIC_NUMBER + hashlib.sha1(conan_file_path.encode("utf-8") +
+                                                            source_hash).digest()
+        try:
+            with open(bytecode_path, "rb") as f:
+                data = f.read()
+            if data.startswith(header):
+                code = marshal.loads(data[len(header):])
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            pass
+
+    if code is None:
+        code = compile(source, conan_file_path, "exec", dont_inherit=True)
+        if bytecode_path:
+            try:
+                mkdir(os.path.dirname(bytecode_path))
+                tmp_path = "%s.%s" % (bytecode_path, uuid.uuid4().hex)
+                with open(tmp_path, "wb") as f:
+                    f.write(header + marshal.dumps(code))
+                os.replace(tmp_path, bytecode_path)
+            except (IOError, OSError) as e:
+                logger.debug("RECIPE BYTECODE: cannot store %s: %s" % (bytecode_path, str(e)))
+
+    _compiled_conanfiles[key] = code
+    while len(_compiled_conanfiles) > _COMPILED_CONANFILES_MAX:
+        _compiled_conanfiles.popitem(last=False)
+    return code
+
+
+def _load_module(module_id, conan_file_path, bytecode_path=None):
+    """ equivalent to imp.load_source(), from the compiled code of the conanfile
+    """
+    code = _compile_conanfile(conan_file_path, bytecode_path)
+    module = types.ModuleType(module_id)
+    module.__file__ = conan_file_path
+    sys.modules[module_id] = module
+    try:
+        exec(code, module.__dict__)
+    except BaseException:
+        sys.modules.pop(module_id, None)
+        raise
+    return module
+
+
+def _parse_conanfile(conan_file_path, bytecode_path=None):
     """ From a given path, obtain the in memory python import module
     """
 
@@ -379,8 +492,10 @@ def _parse_conanfile(conan_file_path):
         old_modules = list(sys.modules.keys())
         with chdir(current_dir):
             sys.dont_write_bytecode = True
-            loaded = imp.load_source(module_id, conan_file_path)
-            sys.dont_write_bytecode = False
+            try:
+                loaded = _load_module(module_id, conan_file_path, bytecode_path)
+            finally:
+                sys.dont_write_bytecode = False
 
         required_conan_version = getattr(loaded, "required_conan_version", None)
         if required_conan_version:
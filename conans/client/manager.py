@@ -2,6 +2,7 @@ import os
 
 from conans.client.graph.build_mode import BuildMode
 from conans.client.graph.graph import RECIPE_CONSUMER, RECIPE_VIRTUAL
+from conans.client.graph.graph_cache import GraphCache
 from conans.client.graph.printer import print_graph
 from conans.client.importer import run_deploy, run_imports
 from conans.client.installer import BinaryInstaller, call_system_requirements
@@ -21,7 +22,8 @@ from conans.util.files import normalize, save
 def deps_install(app, ref_or_path, install_folder, graph_info, remotes=None, build_modes=None,
                  update=False, manifest_folder=None, manifest_verify=False,
                  manifest_interactive=False, generators=None, no_imports=False,
-                 create_reference=None, keep_build=False, recorder=None, lockfile_node_id=None):
+                 create_reference=None, keep_build=False, recorder=None, lockfile_node_id=None,
+                 parallel_builds=None):
     """ Fetch and build all dependencies for the given reference
     @param app: The ConanApp instance with all collaborators
     @param ref_or_path: ConanFileReference or path to user space conanfile
@@ -35,6 +37,7 @@ def deps_install(app, ref_or_path, install_folder, graph_info, remotes=None, bui
     @param generators: List of generators from command line. If False, no generator will be
     written
     @param no_imports: Install specified packages but avoid running imports
+    @param parallel_builds: Number of independent packages to build at the same time
 
     """
     out, user_io, graph_manager, cache = app.out, app.user_io, app.graph_manager, app.cache
@@ -52,9 +55,11 @@ def deps_install(app, ref_or_path, install_folder, graph_info, remotes=None, bui
         out.info("Configuration:")
         out.writeln(graph_info.profile_host.dumps())
 
+    graph_cache = GraphCache(cache) if cache.config.graph_cache else None
     deps_graph = graph_manager.load_graph(ref_or_path, create_reference, graph_info, build_modes,
                                           False, update, remotes, recorder,
-                                          lockfile_node_id=lockfile_node_id)
+                                          lockfile_node_id=lockfile_node_id,
+                                          graph_cache=graph_cache)
     root_node = deps_graph.root
     conanfile = root_node.conanfile
     if root_node.recipe == RECIPE_VIRTUAL:
@@ -75,7 +80,7 @@ def deps_install(app, ref_or_path, install_folder, graph_info, remotes=None, bui
     # TODO: Extract this from the GraphManager, reuse same object, check args earlier
     build_modes = BuildMode(build_modes, out)
     installer.install(deps_graph, remotes, build_modes, update, keep_build=keep_build,
-                      graph_info=graph_info)
+                      graph_info=graph_info, parallel_builds=parallel_builds)
 
     graph_info.graph_lock.complete_matching_prevs()
 
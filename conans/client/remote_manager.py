@@ -2,6 +2,7 @@ import os
 import shutil
 import time
 import traceback
+from multiprocessing.pool import ThreadPool
 
 from requests.exceptions import ConnectionError
 
@@ -9,7 +10,8 @@ from conans import DEFAULT_REVISION_V1
 from conans.client.cache.remote_registry import Remote
 from conans.errors import ConanConnectionError, ConanException, NotFoundException, \
     NoRestV2Available, PackageNotFoundException
-from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, rm_conandir
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_ARCHIVE_NAMES, \
+    rm_conandir
 from conans.search.search import filter_packages
 from conans.util import progress_bar
 from conans.util.env_reader import get_env
@@ -90,6 +92,45 @@ class RemoteManager(object):
         # FIXME Conan 2.0: With revisions, it is not needed to pass headers to this second function
         return self._call_remote(remote, "get_package_info", pref, headers=headers), pref
 
+    def get_packages_info(self, prefs, remote, infos=None, parallel=None):
+        """ Read the ConanInfo of several packages from remote, in a single request if the remote
+        supports it, or one by one otherwise
+        :param infos: {pref: local ConanInfo}, to send the same headers as get_package_info()
+        :param parallel: number of threads doing the requests one by one
+        :return: {pref: (ConanInfo, pref with PREV) or None if not found}
+        """
+        ret = None
+        batch = [pref for pref in prefs if pref.ref.revision is not None]
+        if batch:
+            try:
+                ret = self._call_remote(remote, "get_packages_info", batch)
+            except NoRestV2Available:
+                pass
+        if ret is None:
+            ret = {}
+        infos = infos or {}
+
+        def _get_package_info(pref_):
+            try:
+                return pref_, self.get_package_info(pref_, remote, info=infos.get(pref_))
+            except NotFoundException:
+                return pref_, None
+
+        missing = [pref for pref in prefs if pref not in ret]
+        if parallel and len(missing) > 1:
+            # The first one alone, so the authentication (that might ask for the user and
+            # password) and the check of the remote capabilities happen only once
+            ret.update([_get_package_info(missing.pop(0))])
+            thread_pool = ThreadPool(min(parallel, len(missing)))
+            try:
+                ret.update(thread_pool.map(_get_package_info, missing))
+            finally:
+                thread_pool.close()
+                thread_pool.join()
+        else:
+            ret.update(_get_package_info(pref) for pref in missing)
+        return ret
+
     def get_recipe(self, ref, remote):
         """
         Read the conans from remotes
@@ -180,11 +221,20 @@ class RemoteManager(object):
                 raise PackageNotFoundException(pref)
 
             download_pkg_folder = layout.download_package(pref)
+            package_folder = layout.package(pref)
             # Download files to the pkg_tgz folder, not to the final one
-            zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder)
+            if self._cache.config.stream_package_download:
+                # The tgz is directly extracted to the package folder while downloading
+                zipped_files, tgz_checksums = self._call_remote(remote, "get_package_streamed",
+                                                                pref, download_pkg_folder,
+                                                                package_folder)
+            else:
+                zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder)
+                tgz_checksums = {}
 
             # Compute and update the package metadata
             package_checksums = calc_files_checksum(zipped_files)
+            package_checksums.update(tgz_checksums)
             with layout.update_metadata() as metadata:
                 metadata.packages[pref.id].revision = pref.revision
                 metadata.packages[pref.id].recipe_revision = pref.ref.revision
@@ -194,9 +244,7 @@ class RemoteManager(object):
             duration = time.time() - t1
             log_package_download(pref, duration, remote, zipped_files)
 
-            tgz_file = zipped_files.pop(PACKAGE_TGZ_NAME, None)
-            check_compressed_files(PACKAGE_TGZ_NAME, zipped_files)
-            package_folder = layout.package(pref)
+            tgz_file = zipped_files.pop(check_package_archive(zipped_files), None)
             if tgz_file:  # This must happen always, but just in case
                 # TODO: The output could be changed to the package one, but
                 uncompress_file(tgz_file, package_folder, output=self._output)
@@ -208,6 +256,8 @@ class RemoteManager(object):
             touch_folder(package_folder)
             if get_env("CONAN_READ_ONLY_CACHE", False):
                 make_read_only(package_folder)
+            if layout.index is not None:  # The metadata was saved before having the conaninfo.txt
+                layout.index.update_ref(layout)
             recorder.package_downloaded(pref, remote.url)
             output.success('Package installed %s' % pref.id)
             output.info("Downloaded package revision %s" % pref.revision)
@@ -315,6 +365,18 @@ def check_compressed_files(tgz_name, files):
                                  "Please upgrade conan client." % f)
 
 
+def check_package_archive(files):
+    """ returns the name of the package archive among the files, None if there is no archive,
+    and fails if its compression format is unknown
+    """
+    archives = [f for f in files if f in PACKAGE_ARCHIVE_NAMES.values()]
+    if len(archives) > 1:
+        raise ConanException("Several package archives found: %s" % ", ".join(sorted(archives)))
+    archive = archives[0] if archives else None
+    check_compressed_files(archive or PACKAGE_ARCHIVE_NAMES["gzip"], files)
+    return archive
+
+
 def uncompress_file(src_path, dest_folder, output):
     t1 = time.time()
     try:
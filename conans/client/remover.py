@@ -1,6 +1,7 @@
 import os
 
 from conans.client.cache.remote_registry import Remote
+from conans.client.loader import remove_recipe_bytecode
 from conans.errors import ConanException, PackageNotFoundException, RecipeNotFoundException
 from conans.errors import NotFoundException
 from conans.model.ref import ConanFileReference, PackageReference, check_valid_ref
@@ -125,6 +126,7 @@ class ConanRemover(object):
 
         if not src and build_ids is None and package_ids is None:
             remover.remove(package_layout, output=self._user_io.out)
+            remove_recipe_bytecode(self._cache, package_layout.export())
 
     def remove(self, pattern, remote_name, src=None, build_ids=None, package_ids_filter=None,
                force=False, packages_query=None, outdated=False):
@@ -200,6 +200,10 @@ class ClientV2Router(ClientCommonRouter):
         """Get the url for getting a conaninfo.txt from a package"""
         return self.base_url + self._for_package_file(pref, CONANINFO, matrix_params=None)
 
+    def packages_info(self):
+        """Get the url for getting the conaninfo.txt of several packages in one request"""
+        return self.base_url + self.routes.packages_info
+
     def recipe_snapshot(self, ref):
         """get recipe manifest url"""
         return self.base_url + self._for_recipe_files(ref)
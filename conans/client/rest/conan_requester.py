@@ -2,13 +2,18 @@ import fnmatch
 import logging
 import os
 import platform
+import socket
+import threading
 import time
 import warnings
 
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
 from conans import __version__ as client_version
+from conans.client.tools.oss import cpu_count
 from conans.util.files import save
 from conans.util.tracer import log_client_rest_api_call
 
@@ -18,16 +23,98 @@ from conans.util.tracer import log_client_rest_api_call
 logging.captureWarnings(True)
 
 
+class _ConnectionStats(object):
+    """ Counts the requests and the connections (TCP connects) done, the difference are the
+    requests that reused an already established connection
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+
+    def connected(self):
+        with self._lock:
+            self.connections += 1
+
+    def requested(self):
+        with self._lock:
+            self.requests += 1
+            return {"connections": self.connections, "requests": self.requests}
+
+
+def _counting_pool_classes(stats):
+    def counting(connection_cls):
+        class _Connection(connection_cls):
+            def connect(self):
+                stats.connected()
+                return super(_Connection, self).connect()
+        return _Connection
+
+    class _HTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = counting(HTTPConnectionPool.ConnectionCls)
+
+    class _HTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = counting(HTTPSConnectionPool.ConnectionCls)
+
+    return {"http": _HTTPConnectionPool, "https": _HTTPSConnectionPool}
+
+
+class _ConanHTTPAdapter(HTTPAdapter):
+    """ HTTPAdapter that can set socket options (TCP keep-alive) to the pooled connections, and
+    counts the connections that are established
+    """
+    def __init__(self, socket_options=None, **kwargs):
+        # Before calling the base __init__, it creates the pool manager
+        self._socket_options = socket_options
+        self.stats = _ConnectionStats()
+        super(_ConanHTTPAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self._socket_options:
+            kwargs["socket_options"] = self._socket_options
+        super(_ConanHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(self.stats)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if self._socket_options:
+            proxy_kwargs["socket_options"] = self._socket_options
+        manager = super(_ConanHTTPAdapter, self).proxy_manager_for(proxy, **proxy_kwargs)
+        manager.pool_classes_by_scheme = _counting_pool_classes(self.stats)
+        return manager
+
+
+def _http_adapter(config):
+    # Parallel downloads and uploads use several connections to the same host at the same time,
+    # the pool has to be big enough to keep all of them alive
+    pool_maxsize = config.http_pool_maxsize
+    if pool_maxsize is None:
+        pool_maxsize = max(DEFAULT_POOLSIZE, config.parallel_download or 0, cpu_count())
+    max_host_connections = config.http_max_host_connections
+    if max_host_connections:
+        # A blocking pool never opens more than pool_maxsize connections
+        pool_maxsize = max_host_connections
+    socket_options = None
+    if config.http_keep_alive:
+        socket_options = HTTPConnection.default_socket_options + \
+            [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    return _ConanHTTPAdapter(max_retries=config.retry, pool_maxsize=pool_maxsize,
+                             pool_block=bool(max_host_connections),
+                             socket_options=socket_options)
+
+
 class ConanRequester(object):
 
     def __init__(self, config, http_requester=None):
+        self._adapter = None
         if http_requester:
             self._http_requester = http_requester
         else:
             self._http_requester = requests.Session()
-            adapter = HTTPAdapter(max_retries=config.retry)
-            self._http_requester.mount("http://", adapter)
-            self._http_requester.mount("https://", adapter)
+            self._adapter = _http_adapter(config)
+            self._http_requester.mount("http://", self._adapter)
+            self._http_requester.mount("https://", self._adapter)
+
+        self._keep_alive = config.http_keep_alive
 
         self._timeout_seconds = config.request_timeout
         self.proxies = config.proxies or {}
@@ -81,6 +168,8 @@ class ConanRequester(object):
             kwargs["timeout"] = self._timeout_seconds
         if not kwargs.get("headers"):
             kwargs["headers"] = {}
+        if not self._keep_alive:
+            kwargs["headers"]["Connection"] = "close"
 
         # Only set User-Agent if none was provided
         if not kwargs["headers"].get("User-Agent"):
@@ -115,7 +204,9 @@ class ConanRequester(object):
             all_kwargs = self._add_kwargs(url, kwargs)
             tmp = getattr(self._http_requester, method)(url, **all_kwargs)
             duration = time.time() - t1
-            log_client_rest_api_call(url, method.upper(), duration, all_kwargs.get("headers"))
+            stats = self._adapter.stats.requested() if self._adapter else None
+            log_client_rest_api_call(url, method.upper(), duration, all_kwargs.get("headers"),
+                                     stats)
             return tmp
         finally:
             if popped:
@@ -1,4 +1,4 @@
-from conans import CHECKSUM_DEPLOY, REVISIONS, ONLY_V2, OAUTH_TOKEN, MATRIX_PARAMS
+from conans import CHECKSUM_DEPLOY, REVISIONS, ONLY_V2, OAUTH_TOKEN, MATRIX_PARAMS, PACKAGES_INFO
 from conans.client.rest.rest_client_v1 import RestV1Methods
 from conans.client.rest.rest_client_v2 import RestV2Methods
 from conans.errors import OnlyV2Available, AuthenticationException
@@ -82,6 +82,12 @@ class RestApiClient(object):
     def get_package_info(self, pref, headers):
         return self._get_api().get_package_info(pref, headers=headers)
 
+    def get_packages_info(self, prefs):
+        # None if the remote cannot return them in a single request
+        if not self._capable(PACKAGES_INFO):
+            return None
+        return self._get_api().get_packages_info(prefs)
+
     def get_recipe(self, ref, dest_folder):
         return self._get_api().get_recipe(ref, dest_folder)
 
@@ -94,6 +100,9 @@ class RestApiClient(object):
     def get_package(self, pref, dest_folder):
         return self._get_api().get_package(pref, dest_folder)
 
+    def get_package_streamed(self, pref, dest_folder, extract_folder):
+        return self._get_api().get_package_streamed(pref, dest_folder, extract_folder)
+
     def get_package_snapshot(self, ref):
         return self._get_api().get_package_snapshot(ref)
 
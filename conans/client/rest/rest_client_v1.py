@@ -7,7 +7,7 @@ from six.moves.urllib.parse import parse_qs, urljoin, urlparse, urlsplit
 
 from conans.client.downloaders.download import run_downloader
 from conans.client.downloaders.file_downloader import FileDownloader
-from conans.client.remote_manager import check_compressed_files
+from conans.client.remote_manager import check_compressed_files, check_package_archive
 from conans.client.rest.client_routes import ClientV1Router
 from conans.client.rest.file_uploader import FileUploader
 from conans.client.rest.rest_client_common import RestCommonMethods, handle_return_deserializer
@@ -15,8 +15,7 @@ from conans.errors import ConanException, NotFoundException, NoRestV2Available,
     PackageNotFoundException
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
-from conans.paths import CONANINFO, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, \
-    PACKAGE_TGZ_NAME
+from conans.paths import CONANINFO, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME
 from conans.util.files import decode_text
 from conans.util.log import logger
 
@@ -226,11 +225,34 @@ class RestV1Methods(RestCommonMethods):
 
     def get_package(self, pref, dest_folder):
         urls = self._get_package_urls(pref)
-        check_compressed_files(PACKAGE_TGZ_NAME, urls)
+        check_package_archive(urls)
         md5s = self.get_package_snapshot(pref) if self._config.download_cache else None
         zipped_files = self._download_files_to_folder(urls, dest_folder, md5s)
         return zipped_files
 
+    def get_package_streamed(self, pref, dest_folder, extract_folder):
+        """ same as get_package(), but the package archive is extracted into extract_folder
+        while being downloaded, instead of being saved in dest_folder. The download cache needs
+        the files, so if it is enabled, this is just get_package()
+        :return: ({filename: path} of the other files, {archive name: checksums} of the
+                 streamed archive, empty if it was not streamed)
+        """
+        if self._config.download_cache:
+            return self.get_package(pref, dest_folder), {}
+        urls = self._get_package_urls(pref)
+        tgz_name = check_package_archive(urls)
+        tgz_url = urls.pop(tgz_name, None)
+        zipped_files = self._download_files_to_folder(urls, dest_folder, None)
+        if tgz_url is None:
+            return zipped_files, {}
+        if self._output and not self._output.is_terminal:
+            self._output.writeln("Downloading %s" % tgz_name)
+        auth, _ = self._file_server_capabilities(tgz_url)
+        downloader = FileDownloader(self.requester, self._output, self.verify_ssl, self._config)
+        checksums = downloader.download_extract(tgz_url, extract_folder, auth=auth,
+                                                description="Downloading %s" % tgz_name)
+        return zipped_files, {tgz_name: checksums}
+
     def _get_package_urls(self, pref):
         """Gets a dict of filename:contents from package"""
         url = self.router.package_download_urls(pref)
@@ -332,6 +354,9 @@ class RestV1Methods(RestCommonMethods):
     def get_latest_package_revision(self, pref, headers):
         raise NoRestV2Available("The remote doesn't support revisions")
 
+    def get_packages_info(self, prefs):
+        raise NoRestV2Available("The remote doesn't support revisions")
+
     def _post_json(self, url, payload):
         logger.debug("REST: post: %s" % url)
         response = self.requester.post(url,
@@ -4,7 +4,8 @@ import traceback
 
 from conans import DEFAULT_REVISION_V1
 from conans.client.downloaders.download import run_downloader
-from conans.client.remote_manager import check_compressed_files
+from conans.client.downloaders.file_downloader import FileDownloader
+from conans.client.remote_manager import check_compressed_files, check_package_archive
 from conans.client.rest.client_routes import ClientV2Router
 from conans.client.rest.file_uploader import FileUploader
 from conans.client.rest.rest_client_common import RestCommonMethods, get_exception_from_error
@@ -13,10 +14,12 @@ from conans.errors import ConanException, NotFoundException, PackageNotFoundExce
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference
-from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME
 from conans.util.files import decode_text
 from conans.util.log import logger
 
+_PACKAGES_INFO_BATCH = 100
+
 
 class RestV2Methods(RestCommonMethods):
 
@@ -81,6 +84,26 @@ class RestV2Methods(RestCommonMethods):
         content = self._get_remote_file_contents(url, use_cache=cache, headers=headers)
         return ConanInfo.loads(decode_text(content))
 
+    def get_packages_info(self, prefs):
+        """ the ConanInfo of several packages, resolving the latest package revision of the
+        prefs without PREV, with one request for every batch of _PACKAGES_INFO_BATCH packages
+        :return: {pref: (ConanInfo, pref with PREV) or None if the package doesn't exist}
+        """
+        ret = {}
+        url = self.router.packages_info()
+        for i in range(0, len(prefs), _PACKAGES_INFO_BATCH):
+            batch = prefs[i:i + _PACKAGES_INFO_BATCH]
+            data = self.get_json(url, data={"packages": [repr(pref) for pref in batch]})
+            packages = data["packages"]
+            for pref in batch:
+                package = packages.get(repr(pref))
+                if package is None:
+                    ret[pref] = None
+                    continue
+                info = ConanInfo.loads(package["conaninfo"])
+                ret[pref] = info, pref.copy_with_revs(pref.ref.revision, package["revision"])
+        return ret
+
     def get_recipe(self, ref, dest_folder):
         url = self.router.recipe_snapshot(ref)
         data = self._get_file_list_json(url)
@@ -119,7 +142,7 @@ class RestV2Methods(RestCommonMethods):
         url = self.router.package_snapshot(pref)
         data = self._get_file_list_json(url)
         files = data["files"]
-        check_compressed_files(PACKAGE_TGZ_NAME, files)
+        check_package_archive(files)
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.package_file(pref, fn) for fn in files}
         cache = (pref.revision != DEFAULT_REVISION_V1)
@@ -127,6 +150,32 @@ class RestV2Methods(RestCommonMethods):
         ret = {fn: os.path.join(dest_folder, fn) for fn in files}
         return ret
 
+    def get_package_streamed(self, pref, dest_folder, extract_folder):
+        """ same as get_package(), but the package archive is extracted into extract_folder
+        while being downloaded, instead of being saved in dest_folder. The download cache needs
+        the files, so if it is enabled, this is just get_package()
+        :return: ({filename: path} of the other files, {archive name: checksums} of the
+                 streamed archive, empty if it was not streamed)
+        """
+        url = self.router.package_snapshot(pref)
+        data = self._get_file_list_json(url)
+        files = data["files"]
+        tgz_name = check_package_archive(files)
+        urls = {fn: self.router.package_file(pref, fn) for fn in files}
+        cache = (pref.revision != DEFAULT_REVISION_V1)
+        if tgz_name is None or (cache and self._config.download_cache):
+            self._download_and_save_files(urls, dest_folder, files, use_cache=cache)
+            return {fn: os.path.join(dest_folder, fn) for fn in files}, {}
+
+        files.remove(tgz_name)
+        self._download_and_save_files(urls, dest_folder, files, use_cache=cache)
+        if self._output and not self._output.is_terminal:
+            self._output.writeln("Downloading %s" % tgz_name)
+        downloader = FileDownloader(self.requester, self._output, self.verify_ssl, self._config)
+        checksums = downloader.download_extract(urls[tgz_name], extract_folder, auth=self.auth,
+                                                description="Downloading %s" % tgz_name)
+        return {fn: os.path.join(dest_folder, fn) for fn in files}, {tgz_name: checksums}
+
     def get_recipe_path(self, ref, path):
         url = self.router.recipe_snapshot(ref)
         files = self._get_file_list_json(url)
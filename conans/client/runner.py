@@ -1,15 +1,21 @@
 import io
 import subprocess
 import sys
+import threading
 from subprocess import PIPE, Popen, STDOUT
 
 import six
 
+from conans.client.build_jobs import current_job, subprocess_wait
 from conans.client.tools import environment_append
 from conans.errors import ConanException
 from conans.util.files import decode_text
 from conans.util.runners import pyinstaller_bundle_env_cleaned
 
+# The concurrent build jobs write the output of their subprocesses while waiting for them,
+# without the lock of conans.client.build_jobs, so the writes are serialized here
+_output_lock = threading.Lock()
+
 
 class _UnbufferedWrite(object):
     def __init__(self, stream):
@@ -60,7 +66,7 @@ class ConanRunner(object):
             with environment_append({'CONAN_LOGIN_ENCRYPTION_KEY': None}):
                 # No output has to be redirected to logs or buffer or omitted
                 if (output is True and not self._output and not log_filepath and self._log_run_to_output
-                        and not subprocess):
+                        and not subprocess and not current_job()):
                     return self._simple_os_call(command, cwd)
                 elif log_filepath:
                     if stream_output:
@@ -78,8 +84,12 @@ class ConanRunner(object):
             # piping both stdout, stderr and then later only reading one will hang the process
             # if the other fills the pip. So piping stdout, and redirecting stderr to stdout,
             # so both are merged and use just a single get_stream_lines() call
-            capture_output = log_handler or not self._log_run_to_output or user_output \
-                             or (stream_output and isinstance(stream_output._stream, six.StringIO))
+            # Concurrent build jobs capture the output too, to prefix it with the job name
+            job = current_job()
+            capture_output = (log_handler or not self._log_run_to_output or user_output
+                              or (stream_output and
+                                  isinstance(stream_output._stream, six.StringIO))
+                              or job)
             if capture_output:
                 proc = Popen(command, shell=isinstance(command, six.string_types), stdout=PIPE,
                              stderr=STDOUT, cwd=cwd)
@@ -95,23 +105,26 @@ class ConanRunner(object):
                 if not line:
                     break
                 decoded_line = decode_text(line)
-                if stream_output and self._log_run_to_output:
-                    try:
-                        stream_output.write(decoded_line)
-                    except UnicodeEncodeError:  # be aggressive on text encoding
-                        decoded_line = decoded_line.encode("latin-1", "ignore").decode("latin-1",
-                                                                                       "ignore")
-                        stream_output.write(decoded_line)
-
-                if log_handler:
-                    # Write decoded in PY2 causes some ASCII encoding problems
-                    # tried to open the log_handler binary but same result.
-                    log_handler.write(line if six.PY2 else decoded_line)
-
-        if capture_output:
-            get_stream_lines(proc.stdout)
-
-        proc.communicate()
+                with _output_lock:
+                    if stream_output and self._log_run_to_output:
+                        output_line = "%s: %s" % (job, decoded_line) if job else decoded_line
+                        try:
+                            stream_output.write(output_line)
+                        except UnicodeEncodeError:  # be aggressive on text encoding
+                            output_line = output_line.encode("latin-1", "ignore").decode(
+                                "latin-1", "ignore")
+                            stream_output.write(output_line)
+
+                    if log_handler:
+                        # Write decoded in PY2 causes some ASCII encoding problems
+                        # tried to open the log_handler binary but same result.
+                        log_handler.write(line if six.PY2 else decoded_line)
+
+        with subprocess_wait():
+            if capture_output:
+                get_stream_lines(proc.stdout)
+
+            proc.communicate()
         ret = proc.returncode
         return ret
 
@@ -315,38 +315,139 @@ class CppInfo(_CppInfo):
             _check_components_requires_instersection(self.requires)
 
 
+class _MergedList(object):
+    """ The result of merging lists one after the other, equivalent to
+    ``[s for s in current if s not in new] + new`` for every new list (or to
+    ``[s for s in new if s not in current] + current`` if reversed). Merging them one by one is
+    quadratic, so the lists are stored and merged only once, when the values are needed
+
+    That merge is associative, so a _MergedList can be merged as a whole into another one, its
+    chunks are not added again, it becomes a single chunk merged with its values (it must not
+    change after that)
+    """
+    __slots__ = ("_chunks", "_reverse", "_values")
+
+    def __init__(self, values, reverse=False):
+        self._chunks = [values]
+        self._reverse = reverse
+        self._values = values
+
+    def merge(self, values):
+        self._chunks.append(values if isinstance(values, _MergedList) else list(values))
+        self._values = None
+
+    @staticmethod
+    def _merge_chunks(chunks):
+        # The values of the last chunks win, removing the previous appearances
+        seen = set()
+        result = []
+        for chunk in reversed(chunks):
+            result.append([s for s in chunk if s not in seen])
+            seen.update(chunk)
+        return [s for chunk in reversed(result) for s in chunk]
+
+    def _merge(self):
+        chunks = [c._values if isinstance(c, _MergedList) else c for c in self._chunks]
+        if self._reverse:
+            chunks.reverse()
+        try:
+            values = self._merge_chunks(chunks)
+        except TypeError:  # Not hashable values, merge them one by one
+            values = chunks[0]
+            for chunk in chunks[1:]:
+                values = [s for s in values if s not in chunk] + chunk
+        self._chunks = [values]
+        self._values = values
+
+    @property
+    def values(self):
+        if self._values is None:
+            # The merged lists in the chunks are merged first, without recursion, they can be
+            # nested as deep as the dependency graph
+            pending = [self]
+            while pending:
+                merged = pending[-1]
+                nested = [c for c in merged._chunks
+                          if isinstance(c, _MergedList) and c._values is None]
+                if nested:
+                    pending.extend(nested)
+                else:
+                    pending.pop()
+                    if merged._values is None:
+                        merged._merge()
+        return self._values
+
+
+def _merged_property(name, reverse=False):
+    def getter(self):
+        return self._merged[name].values
+
+    def setter(self, value):
+        self._merged[name] = _MergedList(value, reverse)
+    return property(getter, setter)
+
+
 class _BaseDepsCppInfo(_CppInfo):
+    system_libs = _merged_property("system_libs")
+    includedirs = _merged_property("includedirs")
+    srcdirs = _merged_property("srcdirs")
+    libdirs = _merged_property("libdirs")
+    bindirs = _merged_property("bindirs")
+    resdirs = _merged_property("resdirs")
+    builddirs = _merged_property("builddirs")
+    frameworkdirs = _merged_property("frameworkdirs")
+    libs = _merged_property("libs")
+    frameworks = _merged_property("frameworks")
+    build_modules = _merged_property("build_modules")
+    requires = _merged_property("requires")
+    # Note these are in reverse order
+    defines = _merged_property("defines", reverse=True)
+    cxxflags = _merged_property("cxxflags", reverse=True)
+    cflags = _merged_property("cflags", reverse=True)
+    sharedlinkflags = _merged_property("sharedlinkflags", reverse=True)
+    exelinkflags = _merged_property("exelinkflags", reverse=True)
+
     def __init__(self):
+        self._merged = {}  # {attribute: _MergedList}
         super(_BaseDepsCppInfo, self).__init__()
 
     def update(self, dep_cpp_info):
-        def merge_lists(seq1, seq2):
-            return [s for s in seq1 if s not in seq2] + seq2
-
-        self.system_libs = merge_lists(self.system_libs, dep_cpp_info.system_libs)
-        self.includedirs = merge_lists(self.includedirs, dep_cpp_info.include_paths)
-        self.srcdirs = merge_lists(self.srcdirs, dep_cpp_info.src_paths)
-        self.libdirs = merge_lists(self.libdirs, dep_cpp_info.lib_paths)
-        self.bindirs = merge_lists(self.bindirs, dep_cpp_info.bin_paths)
-        self.resdirs = merge_lists(self.resdirs, dep_cpp_info.res_paths)
-        self.builddirs = merge_lists(self.builddirs, dep_cpp_info.build_paths)
-        self.frameworkdirs = merge_lists(self.frameworkdirs, dep_cpp_info.framework_paths)
-        self.libs = merge_lists(self.libs, dep_cpp_info.libs)
-        self.frameworks = merge_lists(self.frameworks, dep_cpp_info.frameworks)
-        self.build_modules = merge_lists(self.build_modules, dep_cpp_info.build_modules_paths)
-        self.requires = merge_lists(self.requires, dep_cpp_info.requires)
+        def merge_lists(name, values):
+            self._merged[name].merge(values)
+
+        merge_lists("system_libs", dep_cpp_info.system_libs)
+        merge_lists("includedirs", dep_cpp_info.include_paths)
+        merge_lists("srcdirs", dep_cpp_info.src_paths)
+        merge_lists("libdirs", dep_cpp_info.lib_paths)
+        merge_lists("bindirs", dep_cpp_info.bin_paths)
+        merge_lists("resdirs", dep_cpp_info.res_paths)
+        merge_lists("builddirs", dep_cpp_info.build_paths)
+        merge_lists("frameworkdirs", dep_cpp_info.framework_paths)
+        merge_lists("libs", dep_cpp_info.libs)
+        merge_lists("frameworks", dep_cpp_info.frameworks)
+        merge_lists("build_modules", dep_cpp_info.build_modules_paths)
+        merge_lists("requires", dep_cpp_info.requires)
         self.rootpaths.append(dep_cpp_info.rootpath)
 
-        # Note these are in reverse order
-        self.defines = merge_lists(dep_cpp_info.defines, self.defines)
-        self.cxxflags = merge_lists(dep_cpp_info.cxxflags, self.cxxflags)
-        self.cflags = merge_lists(dep_cpp_info.cflags, self.cflags)
-        self.sharedlinkflags = merge_lists(dep_cpp_info.sharedlinkflags, self.sharedlinkflags)
-        self.exelinkflags = merge_lists(dep_cpp_info.exelinkflags, self.exelinkflags)
+        merge_lists("defines", dep_cpp_info.defines)
+        merge_lists("cxxflags", dep_cpp_info.cxxflags)
+        merge_lists("cflags", dep_cpp_info.cflags)
+        merge_lists("sharedlinkflags", dep_cpp_info.sharedlinkflags)
+        merge_lists("exelinkflags", dep_cpp_info.exelinkflags)
 
         if not self.sysroot:
             self.sysroot = dep_cpp_info.sysroot
 
+    def _update_merged(self, deps_cpp_info):
+        """ the same as updating with all the dependencies of the other one, one by one, reusing
+        its already merged lists
+        """
+        for name, merged in deps_cpp_info._merged.items():
+            self._merged[name].merge(merged)
+        self.rootpaths.extend(deps_cpp_info.rootpaths)
+        if not self.sysroot:
+            self.sysroot = deps_cpp_info.sysroot
+
     @property
     def build_modules_paths(self):
         return self.build_modules
@@ -592,3 +693,13 @@ class DepsCppInfo(_BaseDepsCppInfo):
         super(DepsCppInfo, self).update(cpp_info)
         for config, cpp_info in cpp_info.configs.items():
             self._configs.setdefault(config, _BaseDepsCppInfo()).update(cpp_info)
+
+    def update_deps_cpp_info(self, dep_cpp_info):
+        """ adds all the dependencies of another DepsCppInfo, in order. Its merged lists are
+        reused, so it must not be modified after this
+        """
+        assert isinstance(dep_cpp_info, DepsCppInfo)
+        self._dependencies.update(dep_cpp_info._dependencies)
+        self._update_merged(dep_cpp_info)
+        for config, cpp_info in dep_cpp_info.configs.items():
+            self._configs.setdefault(config, _BaseDepsCppInfo())._update_merged(cpp_info)
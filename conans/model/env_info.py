@@ -239,28 +239,53 @@ class DepsEnvInfo(EnvInfo):
     def __getitem__(self, item):
         return self._dependencies_[item]
 
+    @staticmethod
+    def _merge_lists(seq1, seq2):
+        try:
+            new_values = set(seq2)
+        except TypeError:  # Not hashable values
+            new_values = seq2
+        return [s for s in seq1 if s not in new_values] + seq2
+
     def update(self, dep_env_info, pkg_name):
         self._dependencies_[pkg_name] = dep_env_info
 
-        def merge_lists(seq1, seq2):
-            return [s for s in seq1 if s not in seq2] + seq2
-
         # With vars if its set the keep the set value
         for varname, value in dep_env_info.vars.items():
             if varname not in self.vars:
                 self.vars[varname] = value
             elif isinstance(self.vars[varname], list):
                 if isinstance(value, list):
-                    self.vars[varname] = merge_lists(self.vars[varname], value)
+                    self.vars[varname] = self._merge_lists(self.vars[varname], value)
                 else:
-                    self.vars[varname] = merge_lists(self.vars[varname], [value])
+                    self.vars[varname] = self._merge_lists(self.vars[varname], [value])
             else:
                 logger.warning("DISCARDED variable %s=%s from %s" % (varname, value, pkg_name))
 
     def update_deps_env_info(self, dep_env_info):
+        """ the same as updating with all its dependencies, one by one, but merging its already
+        merged values at once
+        """
         assert isinstance(dep_env_info, DepsEnvInfo)
-        for pkg_name, env_info in dep_env_info.dependencies:
-            self.update(env_info, pkg_name)
+        for varname, value in dep_env_info.vars.items():
+            if not isinstance(value, list) and isinstance(self.vars.get(varname), list):
+                # Its first value won in the other one, discarding the following lists, that
+                # here have to be merged
+                for pkg_name, env_info in dep_env_info.dependencies:
+                    self.update(env_info, pkg_name)
+                return
+
+        self._dependencies_.update(dep_env_info._dependencies_)
+        for varname, value in dep_env_info.vars.items():
+            if varname not in self.vars:
+                self.vars[varname] = list(value) if isinstance(value, list) else value
+            elif isinstance(self.vars[varname], list):
+                self.vars[varname] = self._merge_lists(self.vars[varname], value)
+            else:
+                for pkg_name, env_info in dep_env_info.dependencies:
+                    if varname in env_info.vars:
+                        logger.warning("DISCARDED variable %s=%s from %s"
+                                       % (varname, env_info.vars[varname], pkg_name))
 
     @staticmethod
     def loads(text):
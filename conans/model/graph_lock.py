@@ -280,6 +280,11 @@ class GraphLock(object):
 
     def __init__(self, deps_graph, revisions_enabled):
         self._nodes = {}  # {id: GraphLockNode}
+        # Indexes of the nodes, to find them by reference without scanning all of them
+        self._ids_by_repr = {}  # {repr(ref): set(id)}
+        self._ids_by_str = {}  # {str(ref): set(id)}
+        self._ids_by_name = {}  # {ref.name: OrderedDict(id: None)}, in insertion order
+        self._consumer_ids = set()  # nodes without ref, but with path (conanfile.txt)
         self._revisions_enabled = revisions_enabled
         self._relaxed = False  # If True, the lock can be expanded with new Nodes
 
@@ -325,7 +330,29 @@ class GraphLock(object):
                                       modified=modified)
 
             graph_node.graph_lock_node = lock_node
-            self._nodes[graph_node.id] = lock_node
+            self._add_node(graph_node.id, lock_node)
+
+    def _add_node(self, id_, lock_node):
+        self._nodes[id_] = lock_node
+        self._index_node(id_, lock_node)
+
+    def _index_node(self, id_, lock_node):
+        ref = lock_node.ref
+        if ref:
+            self._ids_by_repr.setdefault(repr(ref), set()).add(id_)
+            self._ids_by_str.setdefault(str(ref), set()).add(id_)
+            self._ids_by_name.setdefault(ref.name, OrderedDict())[id_] = None
+        elif lock_node.path:
+            self._consumer_ids.add(id_)
+
+    def _unindex_node(self, id_, lock_node):
+        ref = lock_node.ref
+        if ref:
+            self._ids_by_repr[repr(ref)].discard(id_)
+            self._ids_by_str[str(ref)].discard(id_)
+            self._ids_by_name[ref.name].pop(id_, None)
+        else:
+            self._consumer_ids.discard(id_)
 
     @property
     def nodes(self):
@@ -459,7 +486,7 @@ class GraphLock(object):
                                  % (revs_enabled, revisions_enabled))
         graph_lock = GraphLock(deps_graph=None, revisions_enabled=revisions_enabled)
         for id_, node in data["nodes"].items():
-            graph_lock._nodes[id_] = GraphLockNode.deserialize(node, revisions_enabled)
+            graph_lock._add_node(id_, GraphLockNode.deserialize(node, revisions_enabled))
 
         return graph_lock
 
@@ -582,8 +609,8 @@ class GraphLock(object):
             version_range = version[1:-1]
 
         if version_range:
-            for id_, node in self._nodes.items():
-                root_ref = node.ref
+            for id_ in self._ids_by_name.get(ref.name, ()):
+                root_ref = self._nodes[id_].ref
                 if (ref.name == root_ref.name and ref.user == root_ref.user and
                         ref.channel == root_ref.channel):
                     output = []
@@ -593,17 +620,17 @@ class GraphLock(object):
         else:
             search_ref = repr(ref)
             if ref.revision:  # Search by exact ref (with RREV)
-                node_id = self._find_first(lambda n: n.ref and repr(n.ref) == search_ref)
+                node_id = self._find_first(self._ids_by_repr.get(search_ref))
             else:  # search by ref without RREV
-                node_id = self._find_first(lambda n: n.ref and str(n.ref) == search_ref)
+                node_id = self._find_first(self._ids_by_str.get(search_ref))
             if node_id:
                 return node_id
 
-    def _find_first(self, predicate):
-        """ find the first node in the graph matching the predicate"""
-        for id_, node in sorted(self._nodes.items()):
-            if predicate(node):
-                return id_
+    @staticmethod
+    def _find_first(ids):
+        """ the first (lowest) node id, as the lookups by reference are resolved in that order
+        """
+        return min(ids) if ids else None
 
     def get_consumer(self, ref):
         """ given a REF of a conanfile.txt (None) or conanfile.py in user folder,
@@ -616,20 +643,19 @@ class GraphLock(object):
         # None reference
         if ref is None or ref.name is None:
             # Is a conanfile.txt consumer
-            node_id = self._find_first(lambda n: not n.ref and n.path)
+            node_id = self._find_first(self._consumer_ids)
             if node_id:
                 return node_id
         else:
             assert ref.revision is None
 
-            repr_ref = repr(ref)
-            str_ref = str(ref)
             node_id = (  # First search by exact ref with RREV
-                       self._find_first(lambda n: n.ref and repr(n.ref) == repr_ref) or
+                       self._find_first(self._ids_by_repr.get(repr(ref))) or
                        # If not mathing, search by exact ref without RREV
-                       self._find_first(lambda n: n.ref and str(n.ref) == str_ref) or
+                       self._find_first(self._ids_by_str.get(str(ref))) or
                        # Or it could be a local consumer (n.path defined), search only by name
-                       self._find_first(lambda n: n.ref and n.ref.name == ref.name and n.path))
+                       self._find_first([id_ for id_ in self._ids_by_name.get(ref.name, ())
+                                         if self._nodes[id_].path]))
             if node_id:
                 return node_id
 
@@ -669,9 +695,9 @@ class GraphLock(object):
         # removing the revision, but it still should match
         search_ref = repr(ref)
         if ref.revision:  # Match should be exact (with RREV)
-            node_id = self._find_first(lambda n: n.ref and repr(n.ref) == search_ref)
+            node_id = self._find_first(self._ids_by_repr.get(search_ref))
         else:
-            node_id = self._find_first(lambda n: n.ref and str(n.ref) == search_ref)
+            node_id = self._find_first(self._ids_by_str.get(search_ref))
         if node_id:
             return node_id
 
@@ -683,4 +709,8 @@ class GraphLock(object):
         match the existing RREV
         """
         lock_node = self._nodes[node_id]
-        lock_node.ref = ref
+        self._unindex_node(node_id, lock_node)
+        try:
+            lock_node.ref = ref
+        finally:
+            self._index_node(node_id, lock_node)
@@ -35,6 +35,8 @@ class PackageOptionValue(str):
     """ thin wrapper around a string value that allows to check for several false string
     and also promote other types to string for homegeneous comparison
     """
+    __slots__ = ()
+
     def __bool__(self):
         return self.lower() not in _falsey_options
 
@@ -56,10 +58,23 @@ class PackageOptionValues(object):
     These are non-validating, not constrained.
     Used for UserOptions, which is a dict{package_name: PackageOptionValues}
     """
+    __slots__ = ("_dict", "_modified", "_freeze", "_shared", "_sha")
+
     def __init__(self):
         self._dict = {}  # {option_name: PackageOptionValue}
-        self._modified = {}
+        self._modified = None  # {option_name: (value, down_ref)}, created when needed
         self._freeze = False
+        self._shared = False  # The _dict is shared with copies, copy it before modifying
+        # [sha] of the _dict, shared with the copies that share the _dict, so it is computed once
+        self._sha = None
+
+    def _unshare(self):
+        """ to be called before any modification of the _dict
+        """
+        if self._shared:
+            self._dict = self._dict.copy()
+            self._shared = False
+        self._sha = None
 
     def __bool__(self):
         return bool(self._dict)
@@ -78,10 +93,13 @@ class PackageOptionValues(object):
     def __delattr__(self, attr):
         if attr not in self._dict:
             return
+        self._unshare()
         del self._dict[attr]
 
     def clear(self):
-        self._dict.clear()
+        self._dict = {}
+        self._shared = False
+        self._sha = None
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -92,12 +110,18 @@ class PackageOptionValues(object):
     def __setattr__(self, attr, value):
         if attr[0] == "_":
             return super(PackageOptionValues, self).__setattr__(attr, value)
+        self._unshare()
         self._dict[attr] = PackageOptionValue(value)
 
     def copy(self):
+        """ The values are immutable, the copies share the dict until one of them modifies it
+        """
         result = PackageOptionValues()
-        for k, v in self._dict.items():
-            result._dict[k] = v
+        result._dict = self._dict
+        result._shared = self._shared = True
+        if self._sha is None:
+            self._sha = [None]
+        result._sha = self._sha
         return result
 
     @property
@@ -113,16 +137,21 @@ class PackageOptionValues(object):
     def add(self, option_text):
         assert isinstance(option_text, six.string_types)
         name, value = option_text.split("=")
+        self._unshare()
         self._dict[name.strip()] = PackageOptionValue(value.strip())
 
     def add_option(self, option_name, option_value):
+        self._unshare()
         self._dict[option_name] = PackageOptionValue(option_value)
 
     def update(self, other):
         assert isinstance(other, PackageOptionValues)
-        self._dict.update(other._dict)
+        if other._dict:
+            self._unshare()
+            self._dict.update(other._dict)
 
     def remove(self, option_name):
+        self._unshare()
         del self._dict[option_name]
 
     def freeze(self):
@@ -142,7 +171,7 @@ class PackageOptionValues(object):
                                      "but it was already defined as %s"
                                      % (down_ref, own_ref, name, value, self._dict.get(name)))
 
-            modified = self._modified.get(name)
+            modified = self._modified.get(name) if self._modified else None
             if modified is not None:
                 modified_value, modified_ref = modified
                 raise ConanException("%s tried to change %s option %s:%s to %s\n"
@@ -150,7 +179,10 @@ class PackageOptionValues(object):
                                      % (down_ref, own_ref, package_name, name, value,
                                         modified_value, modified_ref))
             else:
+                if self._modified is None:
+                    self._modified = {}
                 self._modified[name] = (value, down_ref)
+                self._unshare()
                 self._dict[name] = value
 
     def serialize(self):
@@ -158,6 +190,8 @@ class PackageOptionValues(object):
 
     @property
     def sha(self):
+        if self._sha is not None and self._sha[0] is not None:
+            return self._sha[0]
         result = []
         for name, value in self.items():
             # It is important to discard None values, so migrations in settings can be done
@@ -165,7 +199,12 @@ class PackageOptionValues(object):
             # that doesn't change the final sha
             if value:
                 result.append("%s=%s" % (name, value))
-        return sha1('\n'.join(result).encode())
+        sha = sha1('\n'.join(result).encode())
+        if self._sha is None:
+            self._sha = [sha]
+        else:
+            self._sha[0] = sha
+        return sha
 
 
 class OptionsValues(object):
@@ -173,6 +212,8 @@ class OptionsValues(object):
     Boost.static = False,
     Poco.optimized = True
     """
+    __slots__ = ("_package_values", "_reqs_options")
+
     def __init__(self, values=None):
         self._package_values = PackageOptionValues()
         self._reqs_options = {}  # {name("Boost": PackageOptionValues}
@@ -324,6 +365,8 @@ class OptionsValues(object):
 
 
 class PackageOption(object):
+    __slots__ = ("_name", "_value", "_possible_values")
+
     def __init__(self, possible_values, name):
         self._name = name
         self._value = None
@@ -333,7 +376,12 @@ class PackageOption(object):
             self._possible_values = sorted(str(v) for v in possible_values)
 
     def copy(self):
-        result = PackageOption(self._possible_values, self._name)
+        """ without the value, the possible values are shared, remove() doesn't modify them
+        """
+        result = PackageOption.__new__(PackageOption)
+        result._name = self._name
+        result._value = None
+        result._possible_values = self._possible_values
         return result
 
     def __bool__(self):
@@ -393,6 +441,8 @@ class PackageOption(object):
 
 
 class PackageOptions(object):
+    __slots__ = ("_data", "_modified", "_freeze")
+
     def __init__(self, definition):
         definition = definition or {}
         self._data = {str(k): PackageOption(v, str(k))
@@ -528,6 +578,8 @@ class Options(object):
     """ All options of a package, both its own options and the upstream ones.
     Owned by ConanFile.
     """
+    __slots__ = ("_package_options", "_deps_package_values")
+
     def __init__(self, options):
         assert isinstance(options, PackageOptions)
         self._package_options = options
@@ -4,6 +4,7 @@ class RestRoutes(object):
     common_authenticate = "users/authenticate"
     oauth_authenticate = "users/token"
     common_check_credentials = "users/check_credentials"
+    packages_info = "conans/packages/info"
 
     def __init__(self, matrix_params=False):
         if matrix_params:
@@ -32,9 +32,12 @@ class SettingsItem(object):
     - List ["None", "ANY"] to accept None or any value
     - A dict {subsetting: definition}, e.g. {version: [], runtime: []} for VS
     """
+    __slots__ = ("_name", "_value", "_shared", "_definition")
+
     def __init__(self, definition, name):
         self._name = name  # settings.compiler
         self._value = None  # gcc
+        self._shared = False  # The _definition is shared with copies, copy it before modifying
         if isinstance(definition, dict):
             self._definition = {}
             # recursive
@@ -51,16 +54,23 @@ class SettingsItem(object):
         return value in (self._value or "")
 
     def copy(self):
-        """ deepcopy, recursive
+        """ deepcopy, recursive. The definition is copied lazily, only when one of them needs
+        to modify it or to return a child that could be modified
         """
         result = SettingsItem({}, name=self._name)
         result._value = self._value
-        if self.is_final:
-            result._definition = self._definition[:]
-        else:
-            result._definition = {k: v.copy() for k, v in self._definition.items()}
+        result._definition = self._definition
+        result._shared = self._shared = True
         return result
 
+    def _unshare(self):
+        if self._shared:
+            if isinstance(self._definition, dict):
+                self._definition = {k: v.copy() for k, v in self._definition.items()}
+            elif isinstance(self._definition, list):
+                self._definition = self._definition[:]
+            self._shared = False
+
     def copy_values(self):
         if self._value is None and "None" not in self._definition:
             return None
@@ -114,6 +124,7 @@ class SettingsItem(object):
     def remove(self, values):
         if not isinstance(values, (list, tuple, set)):
             values = [values]
+        self._unshare()
         for v in values:
             v = str(v)
             if isinstance(self._definition, dict):
@@ -132,6 +143,7 @@ class SettingsItem(object):
             raise undefined_field(self._name, item, None, self._value)
         if self._value is None:
             raise undefined_value(self._name)
+        self._unshare()
         return self._definition[self._value]
 
     def __getattr__(self, item):
@@ -149,6 +161,7 @@ class SettingsItem(object):
 
     def __getitem__(self, value):
         value = str(value)
+        self._unshare()
         try:
             return self._definition[value]
         except Exception:
@@ -193,12 +206,15 @@ class SettingsItem(object):
 
 
 class Settings(object):
+    __slots__ = ("_name", "_parent_value", "_shared", "_data")
+
     def __init__(self, definition=None, name="settings", parent_value=None):
         if parent_value == "None" and definition:
             raise ConanException("settings.yml: None setting can't have subsettings")
         definition = definition or {}
         self._name = name  # settings, settings.compiler
         self._parent_value = parent_value  # gcc, x86
+        self._shared = False  # The _data is shared with copies, copy it before modifying
         self._data = {str(k): SettingsItem(v, "%s.%s" % (name, k))
                       for k, v in definition.items()}
 
@@ -214,13 +230,19 @@ class Settings(object):
         return default
 
     def copy(self):
-        """ deepcopy, recursive
+        """ deepcopy, recursive. The data is copied lazily, only when one of them needs to modify
+        it or to return a child that could be modified
         """
         result = Settings({}, name=self._name, parent_value=self._parent_value)
-        for k, v in self._data.items():
-            result._data[k] = v.copy()
+        result._data = self._data
+        result._shared = self._shared = True
         return result
 
+    def _unshare(self):
+        if self._shared:
+            self._data = {k: v.copy() for k, v in self._data.items()}
+            self._shared = False
+
     def copy_values(self):
         """ deepcopy, recursive
         """
@@ -233,11 +255,24 @@ class Settings(object):
 
     @staticmethod
     def loads(text):
+        return Settings.from_definition(Settings.loads_definition(text))
+
+    @staticmethod
+    def loads_definition(text):
+        """ parses the settings.yml contents into plain python containers
+        """
         try:
-            return Settings(yaml.safe_load(text) or {})
-        except (yaml.YAMLError, AttributeError) as ye:
+            return yaml.safe_load(text) or {}
+        except yaml.YAMLError as ye:
             raise ConanException("Invalid settings.yml format: {}".format(ye))
 
+    @staticmethod
+    def from_definition(definition):
+        try:
+            return Settings(definition)
+        except AttributeError as e:
+            raise ConanException("Invalid settings.yml format: {}".format(e))
+
     def validate(self):
         for field in self.fields:
             child = self._data[field]
@@ -250,12 +285,14 @@ class Settings(object):
     def remove(self, item):
         if not isinstance(item, (list, tuple, set)):
             item = [item]
+        self._unshare()
         for it in item:
             it = str(it)
             self._data.pop(it, None)
 
     def clear(self):
         self._data = {}
+        self._shared = False
 
     def _check_field(self, field):
         if field not in self._data:
@@ -264,11 +301,13 @@ class Settings(object):
     def __getattr__(self, field):
         assert field[0] != "_", "ERROR %s" % field
         self._check_field(field)
+        self._unshare()
         return self._data[field]
 
     def __delattr__(self, field):
         assert field[0] != "_", "ERROR %s" % field
         self._check_field(field)
+        self._unshare()
         del self._data[field]
 
     def __setattr__(self, field, value):
@@ -276,6 +315,7 @@ class Settings(object):
             return super(Settings, self).__setattr__(field, value)
 
         self._check_field(field)
+        self._unshare()
         self._data[field].value = value
 
     @property
@@ -324,6 +364,7 @@ class Settings(object):
         else:
             constraint_def = {str(k): v for k, v in constraint_def.items()}
 
+        self._unshare()
         fields_to_remove = []
         for field, config_item in self._data.items():
             if field not in constraint_def:
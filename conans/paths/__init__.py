@@ -42,6 +42,14 @@ SYSTEM_REQS = "system_reqs.txt"
 ARTIFACTS_PROPERTIES_FILE = "artifacts.properties"
 ARTIFACTS_PROPERTIES_PUT_PREFIX = "artifact_property_"
 PACKAGE_TGZ_NAME = "conan_package.tgz"
+PACKAGE_TXZ_NAME = "conan_package.txz"
+PACKAGE_TZST_NAME = "conan_package.tzst"
+PACKAGE_TAR_NAME = "conan_package.tar"
+# The package archive name for every compression format
+PACKAGE_ARCHIVE_NAMES = {"gzip": PACKAGE_TGZ_NAME,
+                         "xz": PACKAGE_TXZ_NAME,
+                         "zstd": PACKAGE_TZST_NAME,
+                         "none": PACKAGE_TAR_NAME}
 EXPORT_TGZ_NAME = "conan_export.tgz"
 EXPORT_SOURCES_TGZ_NAME = "conan_sources.tgz"
 RUN_LOG_NAME = "conan_run.log"
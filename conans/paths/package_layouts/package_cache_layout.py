@@ -19,7 +19,8 @@ from conans.paths import CONANFILE, SYSTEM_REQS, EXPORT_FOLDER, EXPORT_SRC_FOLDE
     BUILD_FOLDER, PACKAGES_FOLDER, SYSTEM_REQS_FOLDER, PACKAGE_METADATA, SCM_SRC_FOLDER, rm_conandir
 from conans.util.env_reader import get_env
 from conans.util.files import load, save, rmdir, set_dirty, clean_dirty, is_dirty
-from conans.util.locks import Lock, NoLock, ReadLock, SimpleLock, WriteLock
+from conans.util.locks import FcntlLock, FcntlReadLock, FcntlWriteLock, Lock, NoLock, ReadLock, \
+    SimpleLock, WriteLock
 from conans.util.log import logger
 
 
@@ -39,17 +40,26 @@ def short_path(func):
 class PackageCacheLayout(object):
     """ This is the package layout for Conan cache """
 
-    def __init__(self, base_folder, ref, short_paths, no_lock):
+    def __init__(self, base_folder, ref, short_paths, no_lock, index=None, access_folder=None,
+                 fcntl_locks=False):
         assert isinstance(ref, ConanFileReference)
         self._ref = ref
         self._base_folder = os.path.normpath(base_folder)
         self._short_paths = short_paths
         self._no_lock = no_lock
+        self._index = index  # CacheIndex to keep updated, if enabled
+        # Folder of the files whose modification time is the last access to the packages
+        self._access_folder = access_folder
+        self._fcntl_locks = fcntl_locks  # flock() based locks instead of the .count files
 
     @property
     def ref(self):
         return self._ref
 
+    @property
+    def index(self):
+        return self._index
+
     def base_folder(self):
         """ Returns the base folder for this package reference """
         return self._base_folder
@@ -150,6 +160,14 @@ class PackageCacheLayout(object):
                                  "Close any app using it, and retry" % (pkg_folder, str(e)))
         if is_dirty(pkg_folder):
             clean_dirty(pkg_folder)
+        PackageCacheLayout.writes += 1
+        if self._index is not None:
+            self._index.remove_package(pref)
+        if self._access_folder is not None:
+            try:
+                os.remove(self._access_file(pref))
+            except OSError:
+                pass
         # FIXME: This fails at the moment, but should be fixed
         # with self.update_metadata() as metadata:
         #    metadata.clear_package(pref.id)
@@ -236,6 +254,35 @@ class PackageCacheLayout(object):
             packages = []
         return packages
 
+    # Access times
+    def _access_file(self, pref):
+        return os.path.join(self._access_folder, pref.id)
+
+    def record_access(self, pref):
+        """ Sets now as the last access time of the package
+        """
+        if self._access_folder is None:
+            return
+        access_file = self._access_file(pref)
+        try:
+            os.utime(access_file, None)
+        except OSError:  # First access, create it
+            save(access_file, "")
+
+    def last_access(self, pref):
+        """ Last access time of the package, defaults to the time it was modified (built or
+        downloaded) if it was not used after that. None if it doesn't exist
+        """
+        if self._access_folder is not None:
+            try:
+                return os.path.getmtime(self._access_file(pref))
+            except OSError:
+                pass
+        try:
+            return os.path.getmtime(self.package(pref))
+        except OSError:
+            return None
+
     # Metadata
     def load_metadata(self):
         try:
@@ -245,6 +292,9 @@ class PackageCacheLayout(object):
         return PackageMetadata.loads(text)
 
     _metadata_locks = {}  # Needs to be shared among all instances
+    # Incremented every time this process writes a metadata or removes a package, so the memos of
+    # the contents of the cache know when they are outdated
+    writes = 0
 
     @contextmanager
     def update_metadata(self):
@@ -261,6 +311,9 @@ class PackageCacheLayout(object):
                     metadata = PackageMetadata()
                 yield metadata
                 save(metadata_path, metadata.dumps())
+                PackageCacheLayout.writes += 1
+                if self._index is not None:
+                    self._index.update_ref(self, metadata)
             finally:
                 thread_lock.release()
 
@@ -268,27 +321,37 @@ class PackageCacheLayout(object):
     def conanfile_read_lock(self, output):
         if self._no_lock:
             return NoLock()
+        if self._fcntl_locks:
+            return FcntlReadLock(self._base_folder, self._ref, output)
         return ReadLock(self._base_folder, self._ref, output)
 
-    def conanfile_write_lock(self, output):
+    def conanfile_write_lock(self, output, blocking=True):
         if self._no_lock:
             return NoLock()
-        return WriteLock(self._base_folder, self._ref, output)
+        if self._fcntl_locks:
+            return FcntlWriteLock(self._base_folder, self._ref, output, blocking=blocking)
+        return WriteLock(self._base_folder, self._ref, output, blocking=blocking)
 
     def conanfile_lock_files(self, output):
         if self._no_lock:
             return ()
+        if self._fcntl_locks:
+            return ()  # Never removed while in use, other processes might be waiting for them
         return WriteLock(self._base_folder, self._ref, output).files
 
-    def package_lock(self, pref):
+    def package_lock(self, pref, blocking=True):
         if self._no_lock:
             return NoLock()
-        return SimpleLock(os.path.join(self._base_folder, "locks", pref.id))
+        if self._fcntl_locks:
+            return FcntlLock(os.path.join(self._base_folder, "locks", pref.id), pref, output=None,
+                             blocking=blocking)
+        return SimpleLock(os.path.join(self._base_folder, "locks", pref.id), blocking=blocking)
 
     def remove_package_locks(self):
         conan_folder = self._base_folder
         Lock.clean(conan_folder)
-        rmdir(os.path.join(conan_folder, "locks"))
+        if not self._fcntl_locks:  # The flock() files are only removed by 'conan remove --locks'
+            rmdir(os.path.join(conan_folder, "locks"))
 
     # Raw access to file
     def get_path(self, path, package_id=None):
@@ -94,13 +94,19 @@ def _evaluate(prop_name, prop_value, conan_vars_info):
 
 def search_recipes(cache, pattern=None, ignorecase=True):
     # Conan references in main storage
+    refs = None
     if pattern:
         if isinstance(pattern, ConanFileReference):
             pattern = repr(pattern)
+        name = pattern.split("/")[0]
+        if cache.index is not None and not any(c in name for c in "*?["):
+            # Only the refs with that name can match, like the version ranges "name/*@user/channel"
+            refs = cache.index.refs(name)
         pattern = translate(pattern)
         pattern = re.compile(pattern, re.IGNORECASE) if ignorecase else re.compile(pattern)
 
-    refs = cache.all_refs()
+    if refs is None:
+        refs = cache.all_refs()
     refs.extend(cache.editable_packages.edited_refs.keys())
     if pattern:
         refs = [r for r in refs if _partial_match(pattern, repr(r))]
@@ -135,7 +141,10 @@ def search_packages(package_layout, query):
             package_layout.ref.revision and
             package_layout.recipe_revision() != package_layout.ref.revision):
         raise RecipeNotFoundException(package_layout.ref, print_rev=True)
-    infos = _get_local_infos_min(package_layout)
+    if package_layout.index is not None:
+        infos = package_layout.index.packages_infos(package_layout.ref)
+    else:
+        infos = _get_local_infos_min(package_layout)
     return filter_packages(query, infos)
 
 
@@ -3,6 +3,10 @@ def get_mime_type(filepath):
         mimetype = "x-gzip"
     elif filepath.endswith(".txz"):
         mimetype = "x-xz"
+    elif filepath.endswith(".tzst"):
+        mimetype = "x-zstd"
+    elif filepath.endswith(".tar"):
+        mimetype = "x-tar"
     else:
         mimetype = "auto"
 
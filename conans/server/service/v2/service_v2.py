@@ -4,9 +4,10 @@ from bottle import FileUpload, static_file
 
 from conans.errors import RecipeNotFoundException, PackageNotFoundException, NotFoundException
 from conans.server.service.common.common import CommonService
+from conans.paths import CONANINFO
 from conans.server.service.mime import get_mime_type
 from conans.server.store.server_store import ServerStore
-from conans.util.files import mkdir
+from conans.util.files import load, mkdir
 
 
 class ConanServiceV2(CommonService):
@@ -89,6 +90,30 @@ class ConanServiceV2(CommonService):
         return static_file(os.path.basename(path), root=os.path.dirname(path),
                            mimetype=get_mime_type(path))
 
+    def get_packages_info(self, prefs, auth_user):
+        """ the package revision (the latest one if not specified) and the conaninfo.txt
+        contents of each package, None for the packages that don't exist
+        """
+        ret = {}
+        for pref in prefs:
+            self._authorizer.check_read_conan(auth_user, pref.ref)
+            if pref.revision is None:
+                latest = self._server_store.get_last_package_revision(pref)
+                if not latest:
+                    ret[pref] = None
+                    continue
+                revision, time = latest
+            else:
+                revision, time = pref.revision, None
+            path = self._server_store.get_package_file_path(pref.copy_with_revs(pref.ref.revision,
+                                                                                revision),
+                                                            CONANINFO)
+            if not os.path.isfile(path):
+                ret[pref] = None
+                continue
+            ret[pref] = {"revision": revision, "time": time, "conaninfo": load(path)}
+        return ret
+
     def upload_package_file(self, body, headers, pref, filename, auth_user):
         self._authorizer.check_write_conan(auth_user, pref.ref)
         # FIXME: Check that reference contains revisions (MANDATORY TO UPLOAD)
@@ -99,6 +124,7 @@ class ConanServiceV2(CommonService):
             raise RecipeNotFoundException(pref.ref)
         path = self._server_store.get_package_file_path(pref, filename)
         self._upload_to_path(body, headers, path)
+        self._server_store.replace_package_archive(pref, filename)
 
         # If the upload was ok, update the pointer to the latest
         self._server_store.update_last_package_revision(pref)
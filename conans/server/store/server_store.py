@@ -4,7 +4,7 @@ from os.path import join, normpath, relpath
 from conans import DEFAULT_REVISION_V1
 from conans.errors import ConanException, PackageNotFoundException, RecipeNotFoundException
 from conans.model.ref import ConanFileReference, PackageReference
-from conans.paths import EXPORT_FOLDER, PACKAGES_FOLDER
+from conans.paths import EXPORT_FOLDER, PACKAGES_FOLDER, PACKAGE_ARCHIVE_NAMES
 from conans.server.revision_list import RevisionList
 
 REVISIONS_FILE = "revisions.txt"
@@ -162,6 +162,17 @@ class ServerStore(object):
             path = join(subpath, filepath)
             self._storage_adapter.delete_file(path)
 
+    def replace_package_archive(self, pref, filename):
+        """ A package has only one archive, uploading it with one compression format replaces the
+        archives of the other formats
+        """
+        if filename not in PACKAGE_ARCHIVE_NAMES.values():
+            return
+        subpath = self.package(pref)
+        others = [f for f in PACKAGE_ARCHIVE_NAMES.values()
+                  if f != filename and self._storage_adapter.path_exists(join(subpath, f))]
+        self.remove_package_files(pref, others)
+
     # ONLY APIv1 URLS
     # ############ DOWNLOAD URLS
     def get_download_conanfile_urls(self, ref, files_subset=None, user=None):
@@ -192,6 +203,8 @@ class ServerStore(object):
         assert isinstance(pref, PackageReference)
         assert isinstance(filesizes, dict)
 
+        for filename in filesizes:
+            self.replace_package_archive(pref, filename)
         return self._get_upload_urls(self.package(pref), filesizes, user)
 
     def _get_download_urls(self, relative_path, files_subset=None, user=None):
@@ -6,12 +6,13 @@ from collections import Counter
 from threading import Thread
 
 from bottle import static_file, request
+from mock import patch
 
 from conans.client.downloaders.cached_file_downloader import CachedFileDownloader
 from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import TestClient, StoppableThreadBottle
 from conans.util.env_reader import get_env
-from conans.util.files import load, save
+from conans.util.files import load, md5, save
 
 
 class DownloadCacheTest(unittest.TestCase):
@@ -221,6 +222,7 @@ class CachedDownloaderUnitTest(unittest.TestCase):
                 else:
                     return url
 
+        self.cache_folder = cache_folder
         self.file_downloader = FakeFileDownloader()
         self.cached_downloader = CachedFileDownloader(cache_folder, self.file_downloader)
 
@@ -284,3 +286,49 @@ class CachedDownloaderUnitTest(unittest.TestCase):
         self.cached_downloader.download("testurl", file_path)
         self.assertEqual(self.file_downloader.calls["testurl"], 1)
         self.assertEqual("testurl", load(file_path))
+
+    def test_hardlinks(self):
+        folder = temp_folder()
+        file_path = os.path.join(folder, "myfile.txt")
+        user_downloader = CachedFileDownloader(self.cache_folder, self.file_downloader,
+                                               user_download=True)
+        user_file_path = os.path.join(folder, "userfile.txt")
+        checksum = md5("testurl")
+        with patch("conans.client.downloaders.cached_file_downloader._reflink",
+                   side_effect=OSError("Not supported")):
+            self.cached_downloader.download("testurl", file_path)
+            self.cached_downloader.download("testurl", file_path)
+            user_downloader.download("testurl", user_file_path, md5=checksum)
+            user_downloader.download("testurl", user_file_path, md5=checksum)
+        self.assertEqual("testurl", load(file_path))
+        cached_path = os.path.join(self.cache_folder,
+                                   self.cached_downloader._get_hash("testurl"))
+        self.assertEqual(os.stat(cached_path).st_ino, os.stat(file_path).st_ino)
+        # The users might modify the files of tools.download(), always copied
+        self.assertEqual("testurl", load(user_file_path))
+        user_cached_path = os.path.join(self.cache_folder,
+                                        user_downloader._get_hash("testurl", checksum))
+        self.assertNotEqual(os.stat(user_cached_path).st_ino, os.stat(user_file_path).st_ino)
+
+    def test_evict(self):
+        folder = temp_folder()
+        for i in range(4):
+            self.cached_downloader.download("testurl%s" % i, os.path.join(folder, "file%s" % i))
+            # The first ones are the least recently used
+            lock_file = os.path.join(self.cache_folder, "locks",
+                                     self.cached_downloader._get_hash("testurl%s" % i))
+            access = time.time() - (4 - i) * 24 * 3600
+            os.utime(lock_file, (access, access))
+
+        removed, _, size = self.cached_downloader.evict(max_age=2.5 * 24 * 3600)
+        self.assertEqual((2, len("testurl2") + len("testurl3")), (removed, size))
+        self.cached_downloader.download("testurl2")
+        removed, _, size = self.cached_downloader.evict(max_size=len("testurl2"))
+        self.assertEqual((1, len("testurl2")), (removed, size))
+        # The most recently used is kept, the others have to be downloaded again
+        for i in range(4):
+            self.cached_downloader.download("testurl%s" % i)
+        self.assertEqual([2, 2, 1, 2], [self.file_downloader.calls["testurl%s" % i]
+                                        for i in range(4)])
+        # Files still being used by the packages (hardlinks) are not really freed
+        self.assertEqual("testurl0", load(os.path.join(folder, "file0")))
@@ -0,0 +1,261 @@
+import os
+import shutil
+import textwrap
+import unittest
+
+from conans.client.cache.index import CACHE_INDEX
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.tools import GenConanfile, TestClient
+from conans.util.files import load, save
+
+
+class CacheDedupTest(unittest.TestCase):
+    conanfile = textwrap.dedent("""
+        import os
+        from conans import ConanFile, tools
+        class Pkg(ConanFile):
+            options = {"shared": [True, False]}
+            default_options = {"shared": False}
+            def package(self):
+                tools.save(os.path.join(self.package_folder, "include/header.h"), "my header")
+                tools.save(os.path.join(self.package_folder, "lib/mylib.lib"),
+                           "mylib shared=%s" % self.options.shared)
+        """)
+
+    def _package_file(self, client, shared, path):
+        ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        layout = client.cache.package_layout(ref)
+        for package_id in layout.package_ids():
+            package_folder = layout.package(PackageReference(ref, package_id))
+            if "shared=%s" % shared in load(os.path.join(package_folder, "conaninfo.txt")):
+                return os.path.join(package_folder, path)
+
+    def _same_file(self, client, path):
+        return os.path.samefile(self._package_file(client, True, path),
+                                self._package_file(client, False, path))
+
+    def test_dedup(self):
+        client = TestClient()
+        client.save({"conanfile.py": self.conanfile})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("create . pkg/0.1@user/testing -o pkg:shared=True")
+        self.assertFalse(self._same_file(client, "include/header.h"))
+
+        client.run("cache dedup")
+        self.assertIn("Deduplicated 1 files, 9B saved", client.out)
+        self.assertIn("Removed 0 unused blobs", client.out)
+        self.assertTrue(self._same_file(client, "include/header.h"))
+        self.assertFalse(self._same_file(client, "lib/mylib.lib"))
+        self.assertEqual("my header", load(self._package_file(client, True, "include/header.h")))
+        self.assertEqual("mylib shared=True",
+                         load(self._package_file(client, True, "lib/mylib.lib")))
+
+        # Running it again does nothing
+        client.run("cache dedup")
+        self.assertIn("Deduplicated 0 files, 0B saved", client.out)
+
+        # The blobs of removed packages are cleaned
+        client.run("remove * -f")
+        client.run("cache dedup")
+        self.assertIn("Removed 5 unused blobs", client.out)
+        self.assertEqual([], os.listdir(client.cache.blob_store.folder))
+
+    def test_dedup_on_install(self):
+        client = TestClient()
+        client.run("config set storage.dedup=True")
+        client.save({"conanfile.py": self.conanfile})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("create . pkg/0.1@user/testing -o pkg:shared=True")
+        self.assertTrue(self._same_file(client, "include/header.h"))
+        self.assertFalse(self._same_file(client, "lib/mylib.lib"))
+
+        client.run("cache dedup")
+        self.assertIn("Deduplicated 0 files, 0B saved", client.out)
+
+    def test_dedup_manifest_mismatch(self):
+        client = TestClient()
+        client.save({"conanfile.py": self.conanfile})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("create . pkg/0.1@user/testing -o pkg:shared=True")
+        # A modified file is not replaced by the contents of its manifest md5
+        save(self._package_file(client, False, "include/header.h"), "modified")
+        client.run("cache dedup")
+        self.assertIn("Deduplicated 0 files", client.out)
+        self.assertEqual("modified", load(self._package_file(client, False, "include/header.h")))
+        self.assertEqual("my header", load(self._package_file(client, True, "include/header.h")))
+
+
+class CacheIndexTest(unittest.TestCase):
+    conanfile = textwrap.dedent("""
+        from conans import ConanFile
+        class Pkg(ConanFile):
+            options = {"shared": [True, False]}
+            default_options = {"shared": False}
+        """)
+
+    def _search(self, client, args=""):
+        client.run("search %s --raw" % args)
+        return sorted(line for line in str(client.out).splitlines() if line.strip())
+
+    def test_index(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": self.conanfile})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("config set general.cache_index=True")
+        index_path = os.path.join(client.cache.store, CACHE_INDEX)
+        # The existing cache is indexed the first time
+        self.assertEqual(["pkg/0.1@user/testing"], self._search(client))
+        self.assertTrue(os.path.exists(index_path))
+
+        client.run("create . pkg/0.1@user/testing -o pkg:shared=True")
+        client.run("create . pkg/0.2@user/testing")
+        client.run("create . other/0.1@")
+        self.assertEqual(["other/0.1", "pkg/0.1@user/testing", "pkg/0.2@user/testing"],
+                         self._search(client))
+        client.run("search pkg/0.1@user/testing -q shared=True")
+        self.assertIn("shared: True", client.out)
+        self.assertNotIn("shared: False", client.out)
+        client.run("search pkg/0.1@user/testing")
+        self.assertIn("shared: True", client.out)
+        self.assertIn("shared: False", client.out)
+
+        consumer = GenConanfile().with_require("pkg/[>0.0]@user/testing")
+        client.save({"conanfile.py": consumer}, clean_first=True)
+        client.run("install .")
+        self.assertIn("pkg/0.2@user/testing from local cache", client.out)
+
+        # Removals
+        client.run("upload pkg/0.2@user/testing --all -r default")
+        client.run("remove pkg/0.2@user/testing -f")
+        self.assertEqual(["other/0.1", "pkg/0.1@user/testing"], self._search(client))
+        client.run("install .")
+        self.assertIn("pkg/0.1@user/testing from local cache", client.out)
+        client.run("remove pkg/0.1@user/testing -q shared=True -f")
+        client.run("search pkg/0.1@user/testing")
+        self.assertNotIn("shared: True", client.out)
+        self.assertIn("shared: False", client.out)
+
+        # Downloads
+        client.run("download pkg/0.2@user/testing -r default")
+        client.run("search pkg/0.2@user/testing")
+        self.assertIn("shared: False", client.out)
+
+        # The folders modified without Conan need a rebuild of the index
+        ref = ConanFileReference.loads("pkg/0.2@user/testing")
+        shutil.rmtree(client.cache.package_layout(ref).packages())
+        client.run("search pkg/0.2@user/testing")
+        self.assertIn("shared: False", client.out)
+        client.run("cache rebuild-index")
+        self.assertIn("Indexed 3 recipes and 2 packages", client.out)
+        client.run("search pkg/0.2@user/testing")
+        self.assertIn("There are no packages for reference", client.out)
+
+        # Disabling it removes the index
+        client.run("config set general.cache_index=False")
+        self.assertEqual(["other/0.1", "pkg/0.1@user/testing", "pkg/0.2@user/testing"],
+                         self._search(client))
+        self.assertFalse(os.path.exists(index_path))
+        client.run("cache rebuild-index", assert_error=True)
+        self.assertIn("The cache index is not enabled", client.out)
+
+
+class CacheCleanTest(unittest.TestCase):
+    conanfile = textwrap.dedent("""
+        import os
+        from conans import ConanFile, tools
+        class Pkg(ConanFile):
+            options = {"shared": [True, False]}
+            default_options = {"shared": False}
+            def source(self):
+                tools.save("source.cpp", "x" * 1000)
+            def package(self):
+                tools.save(os.path.join(self.package_folder, "lib/mylib.lib"), "x" * 10000)
+        """)
+    ref = ConanFileReference.loads("pkg/0.1@user/testing")
+
+    def _pref(self, client, shared):
+        layout = client.cache.package_layout(self.ref)
+        for package_id in layout.package_ids():
+            pref = PackageReference(self.ref, package_id)
+            if "shared=%s" % shared in load(os.path.join(layout.package(pref), "conaninfo.txt")):
+                return pref
+
+    def _age(self, client, days):
+        """ makes all the folders and access times of the cache older """
+        for folder in (client.cache.store, os.path.join(client.cache_folder, "access_times")):
+            for root, dirs, files in os.walk(folder):
+                for f in dirs + files:
+                    path = os.path.join(root, f)
+                    access = os.path.getmtime(path) - days * 24 * 3600
+                    os.utime(path, (access, access))
+
+    def test_clean(self):
+        client = TestClient()
+        client.save({"conanfile.py": self.conanfile})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("create . pkg/0.1@user/testing -o pkg:shared=True")
+        self._age(client, 10)
+        client.run("install pkg/0.1@user/testing -o pkg:shared=True")
+        layout = client.cache.package_layout(self.ref)
+
+        client.run("cache clean --max-age=20d")
+        self.assertIn("Removed 0 packages, 0 build folders and 0 source folders", client.out)
+        # The package just installed is kept
+        client.run("cache clean --max-age=5d")
+        self.assertIn("Removed 1 packages, 2 build folders and 1 source folders", client.out)
+        self.assertIsNone(self._pref(client, False))
+        self.assertTrue(os.path.exists(layout.package(self._pref(client, True))))
+        self.assertFalse(os.path.exists(layout.source()))
+        self.assertEqual(layout.conan_builds(), [])
+        client.run("search pkg/0.1@user/testing")
+        self.assertNotIn("shared: False", client.out)
+        self.assertIn("shared: True", client.out)
+
+        # The least recently used first
+        client.run("create . pkg/0.1@user/testing")
+        self._age(client, 1)
+        client.run("install pkg/0.1@user/testing -o pkg:shared=True")
+        client.run("cache clean --max-size=15KB")
+        self.assertIn("Removed 1 packages, 1 build folders and 1 source folders", client.out)
+        self.assertIsNone(self._pref(client, False))
+        self.assertIsNotNone(self._pref(client, True))
+
+        # The folders being used by other processes are not removed
+        client.run("create . pkg/0.1@user/testing")
+        with layout.conanfile_read_lock(client.out):
+            client.run("cache clean --max-size=0")
+        self.assertIn("Removed 2 packages, 0 build folders and 0 source folders", client.out)
+        self.assertIn("The build folder is being used by other process, skipping it", client.out)
+        self.assertIn("The source folder is being used by other process, skipping it",
+                      client.out)
+        client.run("cache clean --max-size=0")
+        self.assertIn("Removed 0 packages, 1 build folders and 1 source folders", client.out)
+        self.assertIn("Cache size: ", client.out)
+
+        client.run("cache clean", assert_error=True)
+        self.assertIn("Define the maximum size (--max-size) and/or the maximum age", client.out)
+        client.run("cache clean --max-size=10XB", assert_error=True)
+        self.assertIn("Incorrect size definition: 10XB", client.out)
+
+    def test_clean_download_cache(self):
+        client = TestClient(default_server_user=True)
+        download_cache = os.path.join(client.cache_folder, "download_cache")
+        client.run('config set storage.download_cache="%s"' % download_cache)
+        client.save({"conanfile.py": self.conanfile})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        client.run("remove * -f")
+        client.run("install pkg/0.1@user/testing")
+        cached = [f for f in os.listdir(download_cache) if f != "locks"]
+        self.assertNotEqual(cached, [])
+
+        client.run("config set storage.download_cache_max_age=10d")
+        client.run("cache clean")
+        self.assertIn("Removed 0 files of the download cache", client.out)
+        client.run("config set storage.download_cache_max_size=0")
+        client.run("cache clean")
+        self.assertIn("Removed %s files of the download cache" % len(cached), client.out)
+        self.assertEqual(os.listdir(download_cache), ["locks"])
+        # The installed package didn't lose its files (hardlinks)
+        client.run("install pkg/0.1@user/testing")
+        self.assertIn("pkg/0.1@user/testing: Already installed!", client.out)
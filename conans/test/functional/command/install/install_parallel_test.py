@@ -1,6 +1,13 @@
+import textwrap
+import threading
 import unittest
 
-from conans.test.utils.tools import GenConanfile, TestClient
+from mock import patch
+
+from conans.client.installer import BinaryInstaller, _PackageBuilder
+from conans.client.tools import environment_append
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.tools import GenConanfile, TestClient, NO_SETTINGS_PACKAGE_ID
 
 
 class InstallParallelTest(unittest.TestCase):
@@ -28,3 +35,118 @@ class InstallParallelTest(unittest.TestCase):
         self.assertIn("Downloading binary packages in %s parallel threads" % threads, client.out)
         for i in range(counter):
             self.assertIn("pkg%s/0.1@user/testing: Package installed" % i, client.out)
+
+    def test_pipelined_download_build(self):
+        self._pipelined_download_build()
+
+    def test_parallel_builds_downloads(self):
+        # The scheduler waits for the background downloads and the jobs at the same time
+        self._pipelined_download_build(parallel_builds=2)
+
+    def _pipelined_download_build(self, parallel_builds=None):
+        # Builds of packages not depending on the downloaded ones do not wait for the downloads
+        client = TestClient(default_server_user=True)
+        client.run("config set general.parallel_download=2")
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("create . pkga/0.1@user/testing")
+        client.run("create . pkgb/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        client.run("remove * -f")
+        client.run("export . pkgc/0.1@user/testing")
+        client.save({"conanfile.py": GenConanfile().with_require("pkgb/0.1@user/testing")})
+        client.run("export . pkgd/0.1@user/testing")
+
+        client.save({"conanfile.txt": "[requires]\npkga/0.1@user/testing\npkgc/0.1@user/testing\n"
+                                      "pkgd/0.1@user/testing"}, clean_first=True)
+        # The download of pkga is slow on purpose, it only finishes once pkgc starts building
+        events = []
+        pkgc_built = threading.Event()
+        download_pkg = BinaryInstaller._download_pkg
+        build_package = _PackageBuilder.build_package
+
+        def _download_pkg(installer, layout, node):
+            if node.ref.name == "pkga":
+                pkgc_built.wait(10)
+            download_pkg(installer, layout, node)
+            events.append("downloaded %s" % node.ref.name)
+
+        def _build_package(builder, node, *args, **kwargs):
+            events.append("building %s" % node.ref.name)
+            pkgc_built.set()
+            return build_package(builder, node, *args, **kwargs)
+
+        with patch.object(BinaryInstaller, "_download_pkg", _download_pkg):
+            with patch.object(_PackageBuilder, "build_package", _build_package):
+                client.run("install . --build=missing%s"
+                           % (" --parallel-builds=%s" % parallel_builds if parallel_builds else ""))
+        self.assertIn("Downloading binary packages in 2 parallel threads", client.out)
+        self.assertLess(events.index("building pkgc"), events.index("downloaded pkga"))
+        for pkg in ("pkga", "pkgb"):
+            self.assertIn("%s/0.1@user/testing: Package installed" % pkg, client.out)
+        self.assertIn("pkgc/0.1@user/testing: Package '%s' built" % NO_SETTINGS_PACKAGE_ID,
+                      client.out)
+        self.assertIn("pkgd/0.1@user/testing: Created package revision", client.out)
+
+    def test_parallel_builds(self):
+        client = TestClient()
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile, tools
+
+            class Pkg(ConanFile):
+                def build(self):
+                    self.output.info("CPUS %s" % tools.cpu_count())
+                    self.run('echo "Building %s in $(pwd)"' % self.name)
+            """)
+        client.save({"conanfile.py": conanfile})
+        for i in range(3):
+            client.run("export . pkg%s/0.1@user/testing" % i)
+        client.save({"conanfile.txt": "[requires]\npkg0/0.1@user/testing\npkg1/0.1@user/testing\n"
+                                      "pkg2/0.1@user/testing"}, clean_first=True)
+        with environment_append({"CONAN_CPU_COUNT": "4"}):
+            client.run("install . --build=missing --parallel-builds=2")
+        self.assertIn("Building binary packages in 2 parallel jobs", client.out)
+        for i in range(3):
+            build_folder = client.cache.package_layout(
+                ConanFileReference.loads("pkg%s/0.1@user/testing" % i)).build(
+                PackageReference.loads("pkg%s/0.1@user/testing:%s" % (i, NO_SETTINGS_PACKAGE_ID)))
+            self.assertIn("pkg%s/0.1@user/testing: CPUS 2" % i, client.out)
+            self.assertIn("pkg%s/0.1@user/testing: Building pkg%s in %s" % (i, i, build_folder),
+                          client.out)
+
+    def test_parallel_builds_output(self):
+        # The output lines of the concurrent subprocesses are not mixed
+        client = TestClient()
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                def build(self):
+                    self.run('for i in $(seq 200); do echo "line $i of %s"; done' % self.name)
+            """)
+        client.save({"conanfile.py": conanfile})
+        for i in range(3):
+            client.run("export . pkg%s/0.1@user/testing" % i)
+        client.save({"conanfile.txt": "[requires]\npkg0/0.1@user/testing\npkg1/0.1@user/testing\n"
+                                      "pkg2/0.1@user/testing"}, clean_first=True)
+        client.run("install . --build=missing --parallel-builds=3")
+        lines = str(client.out).splitlines()
+        for i in range(3):
+            for line in range(1, 201):
+                self.assertIn("pkg%s/0.1@user/testing: line %s of pkg%s" % (i, line, i), lines)
+
+    def test_parallel_builds_conf_error(self):
+        client = TestClient()
+        client.run("config set general.parallel_builds=2")
+        client.save({"conanfile.py": GenConanfile().with_name("pkg").with_version("0.1")})
+        client.run("create . user/testing")
+        self.assertIn("Building binary packages in 2 parallel jobs", client.out)
+        client.save({"conanfile.py": textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                def build(self):
+                    raise Exception("Failed building")
+            """)})
+        client.run("create . broken/0.1@user/testing", assert_error=True)
+        self.assertIn("broken/0.1@user/testing: Error in build() method", client.out)
+        self.assertIn("Failed building", client.out)
@@ -0,0 +1,51 @@
+import os
+import textwrap
+import unittest
+
+from parameterized import parameterized
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_TGZ_NAME
+from conans.test.utils.tools import TestClient, NO_SETTINGS_PACKAGE_ID
+from conans.util.files import load
+
+
+class InstallStreamPackageTest(unittest.TestCase):
+
+    @parameterized.expand([(True, ), (False, )])
+    def test_stream_package_download(self, revisions_enabled):
+        client = TestClient(default_server_user=True)
+        client.run("config set general.revisions_enabled=%s" % revisions_enabled)
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                exports_sources = "*.h"
+                def package(self):
+                    self.copy("*.h", dst="include")
+            """)
+        client.save({"conanfile.py": conanfile,
+                     "header.h": "//myheader"})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        client.run("remove * -f")
+
+        ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        pref = PackageReference(ref, NO_SETTINGS_PACKAGE_ID)
+        client.run("install pkg/0.1@user/testing")
+        layout = client.cache.package_layout(ref)
+        expected_checksums = layout.load_metadata().packages[pref.id].checksums
+        self.assertIn(PACKAGE_TGZ_NAME, expected_checksums)
+        client.run("remove * -f")
+
+        client.run("config set general.stream_package_download=True")
+        client.run("install pkg/0.1@user/testing")
+        self.assertIn("pkg/0.1@user/testing: Package installed %s" % pref.id, client.out)
+        self.assertNotIn("Decompressing %s" % PACKAGE_TGZ_NAME, client.out)
+        layout = client.cache.package_layout(ref)
+        header = os.path.join(layout.package(pref), "include", "header.h")
+        self.assertEqual("//myheader", load(header))
+        download_folder = layout.download_package(pref)
+        self.assertFalse(os.path.exists(os.path.join(download_folder, PACKAGE_TGZ_NAME)))
+        checksums = layout.load_metadata().packages[pref.id].checksums
+        self.assertEqual(expected_checksums, checksums)
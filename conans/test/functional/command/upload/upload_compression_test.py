@@ -2,11 +2,15 @@ import os
 import unittest
 
 import pytest
+from parameterized import parameterized
 
 from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_ARCHIVE_NAMES, PACKAGE_TGZ_NAME
 from conans.test.assets.cpp_test_files import cpp_hello_conan_files
+from conans.test.assets.genconanfile import GenConanfile
 from conans.test.utils.test_files import uncompress_packaged_files
-from conans.test.utils.tools import TestClient, TestServer
+from conans.test.utils.tools import TestClient, TestServer, NO_SETTINGS_PACKAGE_ID
+from conans.util.files import zstandard
 
 @pytest.mark.tool_compiler  # Needed only because it assume that a settings.compiler is detected
 class UploadCompressionTest(unittest.TestCase):
@@ -108,3 +112,51 @@ class UploadCompressionTest(unittest.TestCase):
     def _assert_library_files(self, path):
         libraries = os.listdir(os.path.join(path, "lib"))
         self.assertEqual(len(libraries), 1)
+
+
+class UploadCompressionFormatTest(unittest.TestCase):
+
+    @parameterized.expand([("xz", False), ("zstd", False), ("none", False), ("xz", True),
+                           ("zstd", True)])
+    def test_compression_format(self, compression, stream):
+        if compression == "zstd" and zstandard is None:
+            raise unittest.SkipTest("zstandard not installed")
+        client = TestClient(default_server_user=True)
+        server = client.servers["default"]
+        client.save({"conanfile.py": GenConanfile().with_package_file("include/header.h",
+                                                                      "my header")})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        self.assertIn("Compressing package", client.out)
+
+        client.run("config set general.compression_format=%s" % compression)
+        client.run("upload * --all --confirm --force")
+        self.assertIn("Compressing package", client.out)
+
+        pref = PackageReference(ConanFileReference.loads("pkg/0.1@user/testing"),
+                                NO_SETTINGS_PACKAGE_ID)
+        store = server.server_store
+        rev = store.get_last_revision(pref.ref).revision
+        prev = store.get_last_package_revision(pref.copy_with_revs(rev, None)).revision
+        package_folder = store.package(pref.copy_with_revs(rev, prev))
+        # The previous gzip archive has been replaced in the server
+        self.assertTrue(os.path.exists(os.path.join(package_folder,
+                                                    PACKAGE_ARCHIVE_NAMES[compression])))
+        self.assertFalse(os.path.exists(os.path.join(package_folder, PACKAGE_TGZ_NAME)))
+
+        # The client does not need any configuration to install it
+        client2 = TestClient(servers=client.servers)
+        client2.run("config set general.stream_package_download=%s" % stream)
+        client2.run("install pkg/0.1@user/testing")
+        package_folder = client2.cache.package_layout(pref.ref).package(pref)
+        self.assertEqual("my header", client2.load(os.path.join(package_folder, "include",
+                                                                "header.h")))
+
+    def test_invalid_compression_format(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("config set general.compression_format=rar")
+        client.run("upload * --all --confirm", assert_error=True)
+        self.assertIn("Invalid 'compression_format' value 'rar', possible values: "
+                      "gzip, none, xz, zstd", client.out)
@@ -94,7 +94,12 @@ class HelloConan(ConanFile):
         self.assertIn('"Authorization": "**********"', traces)
         self.assertIn('"X-Client-Anonymous-Id": "**********"', traces)
         actions = traces.splitlines()
-        without_rest_api = [it for it in actions if "REST_API_CALL" not in it]
+        package_ids = [json.loads(it) for it in actions if "PACKAGE_IDS_COMPUTED" in it]
+        self.assertEqual(len(package_ids), 1)
+        self.assertEqual(package_ids[0]["computed"], 2)  # The virtual consumer and Hello0
+        self.assertIn("Hello0/0.1@lasote/stable", [r for r, _ in package_ids[0]["slowest"]])
+        without_rest_api = [it for it in actions if "REST_API_CALL" not in it
+                            and "PACKAGE_IDS_COMPUTED" not in it]
         self.assertTrue(len(without_rest_api) == 11)
         for trace in actions:
             doc = json.loads(trace)
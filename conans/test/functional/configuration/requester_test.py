@@ -1,10 +1,13 @@
 # coding=utf-8
 
+import json
 import os
+import threading
 import unittest
 
 import six
 from mock import Mock, MagicMock
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
 
 from conans import __version__
 from conans.client.cache.cache import ClientCache
@@ -99,3 +102,58 @@ class ConanRequesterHeadersTests(unittest.TestCase):
         requester.get(url="aaa", headers={"User-Agent": "MyUserAgent"})
         headers = mock_http_requester.get.call_args[1]["headers"]
         self.assertEqual("MyUserAgent", headers["User-Agent"])
+
+
+class ConanRequesterConnectionPoolTests(unittest.TestCase):
+
+    def _requester(self, conf=None):
+        cache = ClientCache(temp_folder(), TestBufferConanOutput())
+        for key, value in (conf or {}).items():
+            cache.config.set_item(key, value)
+        return ConanRequester(cache.config)
+
+    def test_pool_size(self):
+        requester = self._requester({"general.parallel_download": "32"})
+        self.assertEqual(32, requester._adapter._pool_maxsize)
+        self.assertFalse(requester._adapter._pool_block)
+
+        requester = self._requester({"general.http_pool_maxsize": "20"})
+        self.assertEqual(20, requester._adapter._pool_maxsize)
+
+        requester = self._requester({"general.http_max_host_connections": "4"})
+        self.assertEqual(4, requester._adapter._pool_maxsize)
+        self.assertTrue(requester._adapter._pool_block)
+
+    def test_connection_reuse_trace(self):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"OK")
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        url = "http://127.0.0.1:%s/" % server.server_address[1]
+        trace_file = os.path.join(temp_folder(), "trace.log")
+        try:
+            for keep_alive, connections, reused in (("True", 1, 2), ("False", 3, 0)):
+                requester = self._requester({"general.http_keep_alive": keep_alive})
+                with environment_append({"CONAN_TRACE_FILE": trace_file}):
+                    for _ in range(3):
+                        self.assertEqual(b"OK", requester.get(url).content)
+                with open(trace_file) as f:
+                    action = json.loads(f.read().splitlines()[-1])
+                self.assertEqual(3, action["requests"])
+                self.assertEqual(connections, action["connections"])
+                self.assertEqual(reused, action["reused_connections"])
+        finally:
+            server.shutdown()
+            server.server_close()
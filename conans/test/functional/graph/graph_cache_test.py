@@ -0,0 +1,144 @@
+import os
+import time
+import unittest
+
+from mock import patch
+
+from conans.client.graph.graph_cache import GRAPH_CACHE_FOLDER
+from conans.client.tools import environment_append
+from conans.test.utils.tools import GenConanfile, TestClient
+
+
+class GraphCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient()
+        self.client.run("config set general.graph_cache=True")
+        self.client.save({"conanfile.py": GenConanfile()})
+        self.client.run("create . liba/1.0@")
+        self.client.save({"conanfile.py": GenConanfile().with_require("liba/[>=1.0]")})
+        self.client.run("create . libb/1.0@")
+        self.client.save({"conanfile.py": GenConanfile().with_require("libb/1.0")
+                                                        .with_require("liba/[<2.0]")},
+                         clean_first=True)
+
+    def _install(self, args=""):
+        self.client.run("install . %s" % args)
+        return "Using the cached dependency graph" in self.client.out
+
+    def test_reuse(self):
+        self.assertFalse(self._install())
+        conanbuildinfo = self.client.load("conanbuildinfo.txt")
+        self.assertTrue(self._install())
+        self.assertIn("liba/1.0:5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9 - Cache", self.client.out)
+        self.assertIn("libb/1.0:8ecbf93ba63522ffb32573610c80ab4dcb399b52 - Cache", self.client.out)
+        self.assertEqual(conanbuildinfo, self.client.load("conanbuildinfo.txt"))
+
+        # Different inputs
+        self.assertFalse(self._install("-s build_type=Debug --build=missing"))
+        self.assertTrue(self._install("-s build_type=Debug --build=missing"))
+        self.assertTrue(self._install())
+        with environment_append({"CONAN_GRAPH_CACHE": "0"}):
+            self.assertFalse(self._install())
+
+    def test_cache_changes(self):
+        self.assertFalse(self._install())
+        self.assertTrue(self._install())
+        # A new version in range
+        self.client.save({"liba/conanfile.py": GenConanfile()})
+        self.client.run("create liba liba/1.1@")
+        self.assertFalse(self._install())
+        self.assertIn("liba/1.1:5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9 - Cache", self.client.out)
+        # Removing it invalidates the stored graph too
+        self.client.run("remove liba/1.1 -f")
+        self.assertFalse(self._install())
+        self.assertIn("liba/1.0:5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9 - Cache", self.client.out)
+        self.assertTrue(self._install())
+        # A new recipe revision
+        self.client.save({"liba/conanfile.py": GenConanfile().with_package_info(
+            cpp_info={"libs": ["liba"]}, env_info={})})
+        self.client.run("create liba liba/1.0@")
+        self.assertFalse(self._install())
+        self.assertIn("liba", self.client.load("conanbuildinfo.txt").split("[libs]")[1])
+        self.assertTrue(self._install())
+        # A removed binary
+        self.client.run("remove libb/1.0 -p -f")
+        self.client.run("install .", assert_error=True)
+        self.assertNotIn("Using the cached dependency graph", self.client.out)
+        self.assertIn("Missing prebuilt package for 'libb/1.0'", self.client.out)
+
+    def test_consumer_files(self):
+        self.assertFalse(self._install())
+        self.assertTrue(self._install())
+        self.client.save({"conandata.yml": "sources: {}"})
+        self.assertFalse(self._install())
+        self.assertTrue(self._install())
+        # The python files next to the conanfile, that it can import
+        self.client.save({"helper.py": "VERSION = '1.0'"})
+        self.assertFalse(self._install())
+        self.assertTrue(self._install())
+        self.client.save({"helper.py": "VERSION = '2.0'"})
+        self.assertFalse(self._install())
+        self.client.save({"other/helper.py": "VERSION = '2.0'"})
+        self.assertTrue(self._install())
+
+    def test_config_changes(self):
+        self.assertFalse(self._install())
+        self.assertTrue(self._install())
+        # The environment, only the CONAN_* variables and the ones in the profiles [env]
+        with environment_append({"MY_VAR": "1"}):
+            self.assertTrue(self._install())
+        with environment_append({"CONAN_MY_VAR": "1"}):
+            self.assertFalse(self._install())
+            self.assertTrue(self._install())
+        self.client.save({"myprofile": "include(default)\n[env]\nMY_VAR=[value]"})
+        self.assertFalse(self._install("-pr=myprofile"))
+        self.assertTrue(self._install("-pr=myprofile"))
+        with environment_append({"MY_VAR": "1"}):
+            self.assertFalse(self._install("-pr=myprofile"))
+            self.assertTrue(self._install("-pr=myprofile"))
+        # The conan.conf
+        self.client.run("config set general.default_package_id_mode=full_package_mode")
+        self.assertFalse(self._install("--build=missing"))
+        self.assertIn("libb/1.0:a1c1752e4864e80d41bec291ccca87120a3736f5 - Build", self.client.out)
+        self.assertFalse(self._install("--build=missing"))
+        self.assertTrue(self._install("--build=missing"))
+        self.client.run("config rm general.default_package_id_mode")
+        # The settings.yml
+        self.client.save({"settings.yml": self.client.load(self.client.cache.settings_path)
+                                          + "\nmy_setting: [1, 2]\n"},
+                         path=self.client.cache_folder)
+        self.assertFalse(self._install())
+        self.assertTrue(self._install())
+        # The hooks
+        self.client.save({"hooks/my_hook.py": "def pre_export(output, **kwargs):\n"
+                                              "    pass\n"},
+                         path=self.client.cache_folder)
+        self.client.run("config set hooks.my_hook")
+        self.assertFalse(self._install())
+        self.assertTrue(self._install())
+        self.client.save({"hooks/my_hook.py": "def pre_export(output, **kwargs):\n"
+                                              "    output.info('changed')\n"},
+                         path=self.client.cache_folder)
+        self.assertFalse(self._install())
+        self.assertTrue(self._install())
+
+    def test_eviction(self):
+        folder = os.path.join(self.client.cache_folder, GRAPH_CACHE_FOLDER)
+        with patch("conans.client.graph.graph_cache.GRAPH_CACHE_MAX_ENTRIES", 2):
+            self.assertFalse(self._install())
+            self.assertFalse(self._install("-s build_type=Debug --build=missing"))
+            self.assertTrue(self._install())  # The most recently used now
+            self.assertFalse(self._install("-s build_type=RelWithDebInfo --build=missing"))
+            self.assertEqual(2, len(os.listdir(folder)))
+            self.assertTrue(self._install())
+            self.assertFalse(self._install("-s build_type=Debug"))
+
+        # "conan cache clean" removes the ones not used for that time
+        old = time.time() - 10 * 24 * 3600
+        for name in os.listdir(folder):
+            os.utime(os.path.join(folder, name), (old, old))
+        self.assertTrue(self._install())
+        self.client.run("cache clean --max-age=5d")
+        self.assertIn("Removed 1 stored dependency graphs", self.client.out)
+        self.assertTrue(self._install())
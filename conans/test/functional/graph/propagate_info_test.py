@@ -0,0 +1,104 @@
+import textwrap
+import unittest
+
+from conans.test.utils.tools import TestClient
+
+
+class PropagateInfoTest(unittest.TestCase):
+    """ The information of the dependencies (deps_cpp_info, deps_env_info, deps_user_info and
+        user_info_build) is merged reusing the already merged one of the direct dependencies,
+        the result, order included, has to be the same as adding the whole closure one by one:
+
+            app -(private)-> libb -> liba
+            app -> libc -(private)-> libb
+            app -(build_requires)-> tool -> libc
+            app -(build_requires, host)-> gtest -> libb
+    """
+
+    lib = textwrap.dedent("""
+        from conans import ConanFile
+
+        class Pkg(ConanFile):
+            settings = "os"
+            {requires}
+
+            def package_info(self):
+                self.cpp_info.libs = [self.name]
+                self.cpp_info.defines = ["{{}}_{{}}".format(self.name, self.settings.os)]
+                self.cpp_info.cxxflags = ["-f" + self.name]
+                self.env_info.PATH.append(self.name)
+                self.env_info.MYVAR = self.name
+                self.user_info.DATA = "{{}}-{{}}".format(self.name, self.settings.os)
+        """)
+
+    app = textwrap.dedent("""
+        from conans import ConanFile
+
+        class App(ConanFile):
+            settings = "os"
+            requires = ("libb/1.0", "private"), "libc/1.0"
+
+            def build_requirements(self):
+                self.build_requires("tool/1.0")
+                self.build_requires("gtest/1.0", force_host_context=True)
+
+            def build(self):
+                _info = self.output.info
+                _info("deps: {}".format(list(self.deps_cpp_info.deps)))
+                _info("libs: {}".format(self.deps_cpp_info.libs))
+                _info("defines: {}".format(self.deps_cpp_info.defines))
+                _info("cxxflags: {}".format(self.deps_cpp_info.cxxflags))
+                _info("env deps: {}".format(list(self.deps_env_info.deps)))
+                _info("env vars: {}".format(sorted(self.deps_env_info.vars.items())))
+                _info("user info: {}".format([(k, v.DATA)
+                                              for k, v in self.deps_user_info.items()]))
+                if self._conan_using_build_profile:
+                    _info("user info build: {}".format([(k, v.DATA)
+                                                        for k, v in self.user_info_build.items()]))
+        """)
+
+    @classmethod
+    def setUpClass(cls):
+        super(PropagateInfoTest, cls).setUpClass()
+        cls.t = TestClient()
+        cls.t.save({"app.py": cls.app,
+                    "host": "[settings]\nos=Windows",
+                    "build": "[settings]\nos=Linux"})
+        for name, requires in (("liba", ""),
+                               ("libb", 'requires = "liba/1.0"'),
+                               ("libc", 'requires = ("libb/1.0", "private"), "liba/1.0"'),
+                               ("tool", 'requires = "libc/1.0"'),
+                               ("gtest", 'requires = "libb/1.0"')):
+            cls.t.save({"{}.py".format(name): cls.lib.format(requires=requires)})
+            cls.t.run("create {0}.py {0}/1.0@ --profile=host".format(name))
+            cls.t.run("create {0}.py {0}/1.0@ --profile=build".format(name))
+
+    def test_propagate_info(self):
+        self.t.run("create app.py app/1.0@ --profile=host")
+        self.assertIn("app/1.0: deps: ['tool', 'gtest', 'libb', 'libc', 'liba']", self.t.out)
+        self.assertIn("app/1.0: libs: ['tool', 'gtest', 'libb', 'libc', 'liba']", self.t.out)
+        self.assertIn("app/1.0: defines: ['liba_Windows', 'libc_Windows', 'libb_Windows', "
+                      "'gtest_Windows', 'tool_Windows']", self.t.out)
+        self.assertIn("app/1.0: cxxflags: ['-fliba', '-flibc', '-flibb', '-fgtest', '-ftool']",
+                      self.t.out)
+        self.assertIn("app/1.0: env deps: ['tool', 'gtest', 'libb', 'libc', 'liba']", self.t.out)
+        self.assertIn("app/1.0: env vars: [('MYVAR', 'tool'), "
+                      "('PATH', ['tool', 'gtest', 'libb', 'libc', 'liba'])]", self.t.out)
+        self.assertIn("app/1.0: user info: [('tool', 'tool-Windows'), ('gtest', 'gtest-Windows'), "
+                      "('libb', 'libb-Windows'), ('libc', 'libc-Windows'), "
+                      "('liba', 'liba-Windows')]", self.t.out)
+
+    def test_propagate_info_build_profile(self):
+        self.t.run("create app.py app/1.0@ --profile:host=host --profile:build=build")
+        self.assertIn("app/1.0: deps: ['gtest', 'libc', 'libb', 'liba']", self.t.out)
+        self.assertIn("app/1.0: libs: ['gtest', 'libc', 'libb', 'liba']", self.t.out)
+        self.assertIn("app/1.0: defines: ['liba_Windows', 'libb_Windows', 'libc_Windows', "
+                      "'gtest_Windows']", self.t.out)
+        self.assertIn("app/1.0: cxxflags: ['-fliba', '-flibb', '-flibc', '-fgtest']", self.t.out)
+        self.assertIn("app/1.0: env deps: ['tool', 'libc', 'liba']", self.t.out)
+        self.assertIn("app/1.0: env vars: [('DYLD_LIBRARY_PATH', []), ('LD_LIBRARY_PATH', []), "
+                      "('MYVAR', 'tool'), ('PATH', ['tool', 'libc', 'liba'])]", self.t.out)
+        self.assertIn("app/1.0: user info: [('gtest', 'gtest-Windows'), ('libc', 'libc-Windows'), "
+                      "('libb', 'libb-Windows'), ('liba', 'liba-Windows')]", self.t.out)
+        self.assertIn("app/1.0: user info build: [('tool', 'tool-Linux'), ('libc', 'libc-Linux'), "
+                      "('liba', 'liba-Linux')]", self.t.out)
@@ -1,10 +1,17 @@
+import json
+import os
 import unittest
 
+from mock import patch
+
 from conans.client.recorder.action_recorder import ActionRecorder
+from conans.client.tools import environment_append
 from conans.errors import ConanException, NotFoundException
 from conans.model.ref import ConanFileReference
+from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import TestClient, TestServer
 from conans.client.cache.remote_registry import Remotes
+from conans.util.files import load
 
 myconan1 = """
 from conans import ConanFile
@@ -64,3 +71,33 @@ class DownloadTest(unittest.TestCase):
             self.assertFalse(True)  # Shouldn't capture here
         except ConanException:
             pass
+
+    @patch("conans.client.downloaders.file_downloader._MIN_SEGMENT_SIZE", 1024)
+    def test_download_segments(self):
+        client = TestClient(default_server_user=True)
+        conanfile = """from conans import ConanFile
+import os
+class Pkg(ConanFile):
+    def package(self):
+        with open(os.path.join(self.package_folder, "data.bin"), "wb") as f:
+            f.write(os.urandom(10000))
+"""
+        client.save({"conanfile.py": conanfile})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        packages_folder = client.cache.package_layout(
+            ConanFileReference.loads("pkg/0.1@user/testing")).packages()
+        package_id = os.listdir(packages_folder)[0]
+        data = load(os.path.join(packages_folder, package_id, "data.bin"), binary=True)
+        client.run("remove * -f")
+
+        client.run("config set general.download_segments=4")
+        trace_file = os.path.join(temp_folder(), "trace.log")
+        with environment_append({"CONAN_TRACE_FILE": trace_file}):
+            client.run("install pkg/0.1@user/testing")
+        self.assertEqual(data, load(os.path.join(packages_folder, package_id, "data.bin"),
+                                    binary=True))
+        actions = [json.loads(line) for line in load(trace_file).splitlines()]
+        ranges = [action["headers"]["range"] for action in actions
+                  if action["_action"] == "REST_API_CALL" and "range" in action["headers"]]
+        self.assertEqual(3, len(ranges))
@@ -0,0 +1,83 @@
+import json
+import os
+import unittest
+
+from mock import patch
+
+from conans import REVISIONS
+from conans.client.remote_manager import RemoteManager
+from conans.client.tools import environment_append
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import GenConanfile, TestClient, TestServer
+from conans.util.files import load
+
+
+class PackagesInfoBatchTest(unittest.TestCase):
+
+    def _client(self, server_capabilities=None):
+        server = TestServer(server_capabilities=server_capabilities)
+        client = TestClient(servers={"default": server}, users={"default": [("lasote", "mypass")]},
+                            revisions_enabled=True)
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("create . liba/1.0@lasote/testing")
+        client.run("create . libb/1.0@lasote/testing")
+        client.save({"conanfile.py": GenConanfile().with_require("liba/1.0@lasote/testing")
+                                                   .with_require("libb/1.0@lasote/testing")})
+        client.run("create . libc/1.0@lasote/testing")
+        client.run("upload * --all --confirm")
+        client.run("remove * -f")
+        return client
+
+    def _install_calls(self, server_capabilities=None, parallel_lookups=None):
+        client = self._client(server_capabilities)
+        if parallel_lookups:
+            client.run("config set general.parallel_lookups=%s" % parallel_lookups)
+
+        trace_file = os.path.join(temp_folder(), "trace.log")
+        with environment_append({"CONAN_TRACE_FILE": trace_file}):
+            client.run("install libc/1.0@lasote/testing")
+        for name in ("liba", "libb", "libc"):
+            self.assertIn("%s/1.0@lasote/testing:" % name, client.out)
+        self.assertEqual(3, str(client.out).count("Downloaded package revision"))
+
+        actions = [json.loads(line) for line in load(trace_file).splitlines()]
+        return [(action["method"], action["url"]) for action in actions
+                if action["_action"] == "REST_API_CALL"]
+
+    def test_batch(self):
+        calls = self._install_calls()
+        # liba and libb are in the same level of the graph, a single request for both
+        batch_calls = [url for method, url in calls if url.endswith("/conans/packages/info")]
+        self.assertEqual(2, len(batch_calls))
+        self.assertFalse([url for _, url in calls if "/packages/" in url and
+                          url.endswith("/latest")])
+
+    def test_fallback(self):
+        for parallel_lookups in (None, 4):
+            calls = self._install_calls(server_capabilities=[REVISIONS],
+                                        parallel_lookups=parallel_lookups)
+            self.assertFalse([url for _, url in calls if url.endswith("/conans/packages/info")])
+            latest_calls = [url for _, url in calls
+                            if "/packages/" in url and url.endswith("/latest")]
+            self.assertEqual(3, len(latest_calls))
+
+    def test_forced_builds_not_looked_up(self):
+        client = self._client()
+        get_packages_info = RemoteManager.get_packages_info
+        batches = []
+
+        def _get_packages_info(remote_manager, prefs, *args, **kwargs):
+            batches.append(sorted(pref.ref.name for pref in prefs))
+            return get_packages_info(remote_manager, prefs, *args, **kwargs)
+
+        with patch.object(RemoteManager, "get_packages_info", _get_packages_info):
+            client.run("install libc/1.0@lasote/testing --build=liba")
+        self.assertIn("liba/1.0@lasote/testing: Forced build from source", client.out)
+        self.assertEqual([["libb"], ["libc"]], batches)
+
+    def test_batch_error(self):
+        # A failed batch is not fatal, the packages are looked up one by one
+        client = self._client()
+        with patch.object(RemoteManager, "get_packages_info", side_effect=Exception("Boom")):
+            client.run("install libc/1.0@lasote/testing")
+        self.assertEqual(3, str(client.out).count("Downloaded package revision"))
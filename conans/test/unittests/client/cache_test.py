@@ -3,9 +3,10 @@
 import os
 import unittest
 
+from mock import patch
 from six import StringIO
 
-from conans.client.cache.cache import ClientCache
+from conans.client.cache.cache import CONAN_SETTINGS_CACHE, ClientCache
 from conans.client.output import ConanOutput
 from conans.client.tools import environment_append
 from conans.model.package_metadata import PackageMetadata
@@ -15,6 +16,31 @@ from conans.util.files import mkdir
 from conans.util.files import save
 
 
+class SettingsCacheTest(unittest.TestCase):
+
+    def test_settings_cache(self):
+        cache = ClientCache(temp_folder(), ConanOutput(StringIO()))
+        save(cache.settings_path, "os: [Windows, Linux]")
+        settings = cache.settings
+        settings.os = "Linux"
+        settings.remove("os")
+        self.assertEqual(cache.settings.fields, ["os"])
+        self.assertIsNone(cache.settings.os.value)
+        self.assertTrue(os.path.exists(os.path.join(cache.cache_folder, CONAN_SETTINGS_CACHE)))
+
+        # Another cache reads the stored one, without parsing the yml again
+        cache = ClientCache(cache.cache_folder, ConanOutput(StringIO()))
+        with patch.dict("conans.client.cache.cache._parsed_settings", clear=True):
+            with patch("conans.model.settings.yaml.safe_load") as safe_load:
+                self.assertEqual(cache.settings.os.values_range, ["Linux", "Windows"])
+                self.assertFalse(safe_load.called)
+
+        save(cache.settings_path, "os: [Windows, Macos]")
+        self.assertEqual(cache.settings.os.values_range, ["Macos", "Windows"])
+        with patch.dict("conans.client.cache.cache._parsed_settings", clear=True):
+            self.assertEqual(cache.settings.os.values_range, ["Macos", "Windows"])
+
+
 class CacheTest(unittest.TestCase):
 
     def setUp(self):
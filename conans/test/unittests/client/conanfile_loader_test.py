@@ -5,13 +5,13 @@ import unittest
 from collections import OrderedDict
 
 import six
-from mock import Mock
+from mock import Mock, patch
 from mock.mock import call
 from parameterized import parameterized
 
 from conans.client.graph.python_requires import ConanPythonRequire
 from conans.client.loader import ConanFileLoader, ConanFileTextLoader,\
-    _parse_conanfile
+    _parse_conanfile, recipe_bytecode_path, remove_recipe_bytecode, _compiled_conanfiles
 from conans.client.tools.files import chdir
 from conans.errors import ConanException
 from conans.model.options import OptionsValues
@@ -353,3 +353,73 @@ def append(data):
             self.assertIs(loaded1.myconanlogger.value, loaded2.myconanlogger.value)
         finally:
             sys.path.remove(temp)
+
+    @unittest.skipIf(six.PY2, "The bytecode files are only stored in Python 3")
+    def test_bytecode(self):
+        tmp = temp_folder()
+        conanfile_path = os.path.join(tmp, "conanfile.py")
+        bytecode_path = os.path.join(tmp, "bytecode", "conanfile.bytecode")
+        save(conanfile_path, "value = 42")
+        loaded, _ = _parse_conanfile(conanfile_path, bytecode_path)
+        self.assertEqual(loaded.value, 42)
+        self.assertEqual(loaded.__file__, conanfile_path)
+        self.assertTrue(os.path.exists(bytecode_path))
+
+        # Another process reuses the stored code, not compiled again
+        with patch.dict("conans.client.loader._compiled_conanfiles", clear=True):
+            with patch("conans.client.loader.compile", create=True) as compile_mock:
+                loaded, _ = _parse_conanfile(conanfile_path, bytecode_path)
+                self.assertFalse(compile_mock.called)
+        self.assertEqual(loaded.value, 42)
+
+        # Different source, recompiled
+        save(conanfile_path, "value = 23")
+        loaded, _ = _parse_conanfile(conanfile_path, bytecode_path)
+        self.assertEqual(loaded.value, 23)
+        with patch.dict("conans.client.loader._compiled_conanfiles", clear=True):
+            loaded, _ = _parse_conanfile(conanfile_path, bytecode_path)
+        self.assertEqual(loaded.value, 23)
+
+        # A corrupted file is ignored
+        save(bytecode_path, "corrupted")
+        with patch.dict("conans.client.loader._compiled_conanfiles", clear=True):
+            loaded, _ = _parse_conanfile(conanfile_path, bytecode_path)
+        self.assertEqual(loaded.value, 23)
+
+    def test_compiled_memo_bounded(self):
+        tmp = temp_folder()
+        with patch.dict("conans.client.loader._compiled_conanfiles", clear=True):
+            with patch("conans.client.loader._COMPILED_CONANFILES_MAX", 2):
+                for i in range(3):
+                    save(os.path.join(tmp, "conanfile%s.py" % i), "value = %s" % i)
+                    _parse_conanfile(os.path.join(tmp, "conanfile%s.py" % i))
+                _parse_conanfile(os.path.join(tmp, "conanfile1.py"))  # The most recent now
+                save(os.path.join(tmp, "conanfile3.py"), "value = 3")
+                _parse_conanfile(os.path.join(tmp, "conanfile3.py"))
+                self.assertEqual([os.path.join(tmp, "conanfile1.py"),
+                                  os.path.join(tmp, "conanfile3.py")],
+                                 [path for path, _ in _compiled_conanfiles])
+
+    @unittest.skipIf(six.PY2, "The bytecode files are only stored in Python 3")
+    def test_recipe_bytecode_path(self):
+        cache_folder = temp_folder()
+        cache = Mock(cache_folder=cache_folder, store=os.path.join(cache_folder, "data"))
+        export_path = os.path.join(cache.store, "pkg", "1.0", "_", "_", "export", "conanfile.py")
+        bytecode_path = recipe_bytecode_path(cache, export_path)
+        self.assertEqual(os.path.dirname(bytecode_path),
+                         os.path.join(cache_folder, "recipe_bytecode"))
+        self.assertNotEqual(bytecode_path, recipe_bytecode_path(
+            cache, export_path.replace("pkg", "other")))
+        self.assertIn(sys.implementation.cache_tag, os.path.basename(bytecode_path))
+        # Not for the recipes in user space
+        self.assertIsNone(recipe_bytecode_path(cache, os.path.join(temp_folder(), "export",
+                                                                   "conanfile.py")))
+        self.assertIsNone(recipe_bytecode_path(None, export_path))
+        # Removed with the recipe, for all the Python versions
+        save(bytecode_path, "")
+        save(bytecode_path.replace(sys.implementation.cache_tag, "other-38"), "")
+        other_path = recipe_bytecode_path(cache, export_path.replace("pkg", "other"))
+        save(other_path, "")
+        remove_recipe_bytecode(cache, os.path.dirname(export_path))
+        self.assertEqual([os.path.basename(other_path)],
+                         os.listdir(os.path.dirname(bytecode_path)))
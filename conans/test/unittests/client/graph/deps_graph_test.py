@@ -1,6 +1,7 @@
+import random
 import unittest
 
-from conans.client.graph.graph import CONTEXT_HOST
+from conans.client.graph.graph import CONTEXT_HOST, _NodeOrderedDict
 from conans.client.graph.graph_builder import DepsGraph, Node
 from conans.model.conan_file import ConanFile
 from conans.model.ref import ConanFileReference
@@ -110,3 +111,66 @@ class DepsGraphTest(unittest.TestCase):
         deps.add_edge(n2, n32, None)
         deps.add_edge(n32, n5, None)
         self.assertEqual([[n5, n31], [n32], [n2], [n1]], deps.by_levels())
+        self.assertEqual([[n1], [n2], [n31, n32], [n5]], deps.inverse_levels())
+        self.assertEqual([[n5], [n32], [n2]], deps.by_levels(nodes_subset={n2, n32, n5}))
+
+    def test_closure_copy_on_write(self):
+        nodes = [Node(ConanFileReference.loads("pkg%s/1.0@user/stable" % i), i,
+                      context=CONTEXT_HOST) for i in range(40)]
+        parent = _NodeOrderedDict()
+        parent.add(nodes[0])
+        children = []
+        for node in nodes[1:]:  # Long enough to flatten the shared layers
+            child = _NodeOrderedDict()
+            child.assign(parent)
+            child.add(node)
+            children.append(child)
+            parent = child
+
+        self.assertEqual(nodes, list(parent))
+        self.assertEqual(nodes[:2], list(children[0]))
+        self.assertIs(nodes[0], children[20].get("pkg0", CONTEXT_HOST))
+        self.assertIsNone(children[20].get("pkg30", CONTEXT_HOST))
+
+        # Modifying one of them doesn't affect the others
+        other = Node(ConanFileReference.loads("pkg0/2.0@user/stable"), 0, context=CONTEXT_HOST)
+        children[10].add(other)
+        children[11].pop("pkg1", CONTEXT_HOST)
+        children[12].sort(key_fn=lambda n: -n.conanfile)
+        self.assertEqual([other] + nodes[1:12], list(children[10]))
+        self.assertEqual([nodes[0]] + nodes[2:13], list(children[11]))
+        self.assertEqual(list(reversed(nodes[:14])), list(children[12]))
+        self.assertEqual(nodes[:15], list(children[13]))
+        self.assertEqual(nodes, list(parent))
+        children[13].add(nodes[0])
+        self.assertEqual(nodes[:15], list(children[13]))
+
+    def test_levels_random_graph(self):
+        random.seed(7)
+        deps = DepsGraph()
+        nodes = []
+        for i in range(300):
+            node = Node(ConanFileReference.loads("Hello/%s.0@user/stable" % i), i,
+                        context=CONTEXT_HOST)
+            deps.add_node(node)
+            for dep in random.sample(nodes, min(len(nodes), random.randint(0, 5))):
+                deps.add_edge(node, dep, None)
+            nodes.append(node)
+
+        def check_levels(levels, neighbors, nodes_subset):
+            level_of = {}
+            for i, level in enumerate(levels):
+                self.assertEqual(sorted(level), level)
+                for node in level:
+                    level_of[node] = i
+            self.assertEqual(len(nodes_subset), sum(len(level) for level in levels))
+            self.assertEqual(set(nodes_subset), set(level_of))
+            for node in nodes_subset:
+                node_levels = [level_of[n] for n in neighbors(node) if n in level_of]
+                # Every node in the level right after its last neighbor
+                self.assertEqual(max(node_levels) + 1 if node_levels else 0, level_of[node])
+
+        check_levels(deps.by_levels(), Node.neighbors, nodes)
+        check_levels(deps.inverse_levels(), Node.inverse_neighbors, nodes)
+        subset = set(nodes[::3])
+        check_levels(deps.by_levels(nodes_subset=subset), Node.neighbors, subset)
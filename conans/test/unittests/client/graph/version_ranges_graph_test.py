@@ -2,11 +2,13 @@ from collections import OrderedDict
 from collections import namedtuple
 
 import six
+from mock import patch
 from parameterized import parameterized
 
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference
 from conans.model.requires import Requirements
+from conans.search.search import search_recipes
 from conans.test.unittests.model.transitive_reqs_test import GraphTest
 from conans.test.utils.tools import GenConanfile, TurboTestClient, TestServer, \
     NO_SETTINGS_PACKAGE_ID
@@ -83,6 +85,27 @@ class VersionRangesTest(GraphTest):
             say_ref = ConanFileReference.loads("Say/%s@myuser/testing" % solution)
             self.assertEqual(_clear_revs(conanfile.requires), Requirements(str(say_ref)))
 
+    def test_local_memo(self):
+        def hello(require):
+            return GenConanfile().with_name("Hello").with_version("1.2").with_require(require)
+
+        with patch("conans.client.graph.range_resolver.search_recipes",
+                   wraps=search_recipes) as search:
+            deps_graph = self.build_graph(hello("Say/[>0.0]@myuser/testing"))
+            self.assertEqual(_get_nodes(deps_graph, "Say")[0].ref.version, "2.2.1")
+            deps_graph = self.build_graph(hello("Say/[~0]@myuser/testing"))
+            self.assertEqual(_get_nodes(deps_graph, "Say")[0].ref.version, "0.3")
+            self.assertEqual(search.call_count, 1)
+
+            # The cache is searched again when it is written
+            ref = ConanFileReference.loads("Say/0.4@myuser/testing")
+            self.retriever.save_recipe(ref, GenConanfile().with_name("Say").with_version("0.4"))
+            with self.resolver._cache.package_layout(ref).update_metadata() as metadata:
+                metadata.recipe.revision = "123"
+            deps_graph = self.build_graph(hello("Say/[~0]@myuser/testing"))
+            self.assertEqual(_get_nodes(deps_graph, "Say")[0].ref.version, "0.4")
+            self.assertEqual(search.call_count, 2)
+
     def test_remote_basic(self):
         self.resolver._local_search = None
         remote_packages = []
@@ -1,7 +1,13 @@
 import os
+import threading
+import time
 import unittest
 
+from conans.client.cache.remote_registry import Remote
 from conans.client.cmd.uploader import compress_files
+from conans.client.remote_manager import RemoteManager
+from conans.errors import NoRestV2Available, PackageNotFoundException
+from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import PACKAGE_TGZ_NAME
 from conans.test.utils.test_files import temp_folder
 from conans.util.files import save
@@ -23,3 +29,38 @@ class RemoteManagerTest(unittest.TestCase):
         self.assertTrue(os.path.exists(path))
         expected_path = os.path.join(folder, PACKAGE_TGZ_NAME)
         self.assertEqual(path, expected_path)
+
+    def test_get_packages_info_fallback(self):
+        ref = ConanFileReference.loads("lib/1.0@user/channel#rrev")
+        prefs = [PackageReference(ref, "id%s" % i) for i in range(6)]
+        threads = set()
+
+        class AuthManager(object):
+            @staticmethod
+            def call_rest_api_method(_, method, *args, **kwargs):
+                if method == "get_packages_info":
+                    raise NoRestV2Available("The remote doesn't support revisions")
+                pref = args[0]
+                if method == "get_latest_package_revision":
+                    if pref.id == "id3":
+                        raise PackageNotFoundException(pref)
+                    return pref.copy_with_revs(pref.ref.revision, "prev")
+                assert method == "get_package_info"
+                threads.add(threading.current_thread().name)
+                time.sleep(0.05)
+                return "info_%s" % pref.id
+
+        remote = Remote("default", "http://fake", True, False)
+        remote_manager = RemoteManager(None, AuthManager(), None, None)
+        for parallel in (None, 3):
+            threads.clear()
+            ret = remote_manager.get_packages_info(prefs, remote, parallel=parallel)
+            self.assertIsNone(ret.pop(prefs[3]))
+            self.assertEqual(5, len(ret))
+            for pref, (info, pref_rev) in ret.items():
+                self.assertEqual("info_%s" % pref.id, info)
+                self.assertEqual("prev", pref_rev.revision)
+            if parallel is None:
+                self.assertEqual(1, len(threads))
+            else:
+                self.assertGreater(len(threads), 1)
@@ -1,17 +1,24 @@
+import hashlib
+import os
 import re
+import tarfile
 import tempfile
 import unittest
 
+from mock import patch
+
 from conans.client.downloaders.file_downloader import FileDownloader
 from conans.errors import ConanException
 from conans.test.utils.mocks import TestBufferConanOutput
-from conans.util.files import load
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, save
 
 
 class _ConfigMock:
-    def __init__(self):
+    def __init__(self, download_segments=None):
         self.retry = 0
         self.retry_wait = 0
+        self.download_segments = download_segments
 
 
 class MockResponse(object):
@@ -39,11 +46,14 @@ class MockRequester(object):
         self._chunk_size = chunk_size if chunk_size is not None else len(data)
         self._accept_ranges = accept_ranges
         self._echo_header = echo_header.copy() if echo_header else {}
+        self.ranges = []
 
     def get(self, *_args, **kwargs):
         start = 0
         headers = kwargs.get("headers") or {}
         transfer_range = headers.get("range", "")
+        if transfer_range:
+            self.ranges.append(transfer_range)
         match = re.match(r"bytes=([0-9]+)-", transfer_range)
         status = 200
         headers = {"Content-Length": len(self._data), "Accept-Ranges": "bytes"}
@@ -139,3 +149,75 @@ class DownloaderUnitTest(unittest.TestCase):
         downloader.download("fake_url", file_path=self.target)
         actual_content = load(self.target, binary=True)
         self.assertEqual(expected_content, actual_content)
+
+    @patch("conans.client.downloaders.file_downloader._MIN_SEGMENT_SIZE", 10)
+    def test_download_segments(self):
+        expected_content = b"".join(str(i).encode() for i in range(100))
+        requester = MockRequester(expected_content)
+        downloader = FileDownloader(requester=requester, output=self.out, verify=None,
+                                    config=_ConfigMock(download_segments=4))
+        downloader.download("fake_url", file_path=self.target,
+                            sha1=hashlib.sha1(expected_content).hexdigest())
+        self.assertEqual(expected_content, load(self.target, binary=True))
+        # The first segment comes from the first response, the file has 190 bytes
+        self.assertEqual(3, len(requester.ranges))
+        self.assertEqual({"bytes=48-95", "bytes=96-143", "bytes=144-189"}, set(requester.ranges))
+
+    @patch("conans.client.downloaders.file_downloader._MIN_SEGMENT_SIZE", 10)
+    def test_download_segments_small_file(self):
+        expected_content = b"some data"
+        requester = MockRequester(expected_content)
+        downloader = FileDownloader(requester=requester, output=self.out, verify=None,
+                                    config=_ConfigMock(download_segments=4))
+        downloader.download("fake_url", file_path=self.target)
+        self.assertEqual(expected_content, load(self.target, binary=True))
+        self.assertEqual([], requester.ranges)
+
+    @patch("conans.client.downloaders.file_downloader._MIN_SEGMENT_SIZE", 10)
+    def test_download_segments_not_accepting_ranges(self):
+        expected_content = b"".join(str(i).encode() for i in range(100))
+        requester = MockRequester(expected_content, accept_ranges=False)
+        downloader = FileDownloader(requester=requester, output=self.out, verify=None,
+                                    config=_ConfigMock(download_segments=4))
+        with self.assertRaisesRegexp(ConanException, r"Incorrect Content-Range header"):
+            downloader.download("fake_url", file_path=self.target)
+        self.assertFalse(os.path.exists(self.target))
+
+    @patch("conans.client.downloaders.file_downloader._MIN_SEGMENT_SIZE", 10)
+    def test_download_segments_checksum(self):
+        expected_content = b"".join(str(i).encode() for i in range(100))
+        requester = MockRequester(expected_content, echo_header={"X-Checksum-Sha1": "1234"})
+        downloader = FileDownloader(requester=requester, output=self.out, verify=None,
+                                    config=_ConfigMock(download_segments=4))
+        with self.assertRaisesRegexp(ConanException, r"sha1 signature failed"):
+            downloader.download("fake_url", file_path=self.target)
+
+    def _tgz_data(self):
+        tmp_folder = temp_folder()
+        save(os.path.join(tmp_folder, "include", "header.h"), "//header")
+        save(os.path.join(tmp_folder, "lib", "mylib.a"), "mylib")
+        tgz = os.path.join(temp_folder(), "conan_package.tgz")
+        with tarfile.open(tgz, "w:gz") as tar:
+            tar.add(os.path.join(tmp_folder, "include"), arcname="include")
+            tar.add(os.path.join(tmp_folder, "lib"), arcname="lib")
+        return load(tgz, binary=True)
+
+    def test_download_extract(self):
+        data = self._tgz_data()
+        requester = MockRequester(data)
+        downloader = FileDownloader(requester=requester, output=self.out, verify=None,
+                                    config=_ConfigMock())
+        checksums = downloader.download_extract("fake_url", self.target)
+        self.assertEqual(load(os.path.join(self.target, "include", "header.h")), "//header")
+        self.assertEqual(load(os.path.join(self.target, "lib", "mylib.a")), "mylib")
+        self.assertEqual(checksums, {"md5": hashlib.md5(data).hexdigest(),
+                                     "sha1": hashlib.sha1(data).hexdigest()})
+
+    def test_download_extract_interrupted(self):
+        data = self._tgz_data()
+        requester = MockRequester(data, chunk_size=len(data) - 10)
+        downloader = FileDownloader(requester=requester, output=self.out, verify=None,
+                                    config=_ConfigMock())
+        with self.assertRaisesRegexp(ConanException, r"Download failed"):
+            downloader.download_extract("fake_url", self.target)
+        self.assertFalse(os.path.exists(self.target))
@@ -2,10 +2,14 @@ import os
 import time
 import unittest
 
+from mock import patch
+from parameterized import parameterized
+
 from conans.client.cmd.uploader import compress_files
-from conans.paths import PACKAGE_TGZ_NAME
+from conans.paths import PACKAGE_TGZ_NAME, PACKAGE_ARCHIVE_NAMES
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import md5sum, mkdir, path_exists, save
+from conans.util.files import md5sum, mkdir, path_exists, save, load, tar_extract, zstandard, \
+    gzopen_without_timestamps
 
 
 class FilesTest(unittest.TestCase):
@@ -39,6 +43,61 @@ class FilesTest(unittest.TestCase):
 
         self.assertEqual(md5_a, md5_b)
 
+    @parameterized.expand([("gzip",), ("xz",), ("zstd",), ("none",)])
+    def test_compression_formats(self, compression):
+        if compression == "zstd" and zstandard is None:
+            raise unittest.SkipTest("zstandard not installed")
+        folder = temp_folder()
+        save(os.path.join(folder, "one_file.txt"), b"The contents")
+        save(os.path.join(folder, "subdir", "Two_file.txt"), b"Two contents")
+        files = {"one_file.txt": os.path.join(folder, "one_file.txt"),
+                 "subdir/Two_file.txt": os.path.join(folder, "subdir", "Two_file.txt")}
+
+        name = PACKAGE_ARCHIVE_NAMES[compression]
+        path = compress_files(files, {}, name, dest_dir=temp_folder(), compression=compression)
+        md5_a = md5sum(path)
+        time.sleep(1)  # Timestamps change
+        path = compress_files(files, {}, name, dest_dir=temp_folder(), compression=compression)
+        self.assertEqual(md5_a, md5sum(path))
+
+        for stream in (False, True):
+            dest = temp_folder()
+            with open(path, "rb") as f:
+                tar_extract(f, dest, stream=stream)
+            self.assertEqual("The contents", load(os.path.join(dest, "one_file.txt")))
+            self.assertEqual("Two contents", load(os.path.join(dest, "subdir", "Two_file.txt")))
+
+    @parameterized.expand([("gzip",), ("zstd",)])
+    def test_parallel_compression(self, compression):
+        if compression == "zstd" and zstandard is None:
+            raise unittest.SkipTest("zstandard not installed")
+        folder = temp_folder()
+        files = {}
+        for i in range(20):
+            name = "file%s.txt" % i
+            save(os.path.join(folder, name), ("contents %s\n" % i) * 1000 * i)
+            files[name] = os.path.join(folder, name)
+
+        name = PACKAGE_ARCHIVE_NAMES[compression]
+        with patch("conans.util.files._ParallelGzipWriter.block_size", 10000):
+            path = compress_files(files, {}, name, dest_dir=temp_folder(),
+                                  compression=compression, threads=4)
+            path2 = compress_files(files, {}, name, dest_dir=temp_folder(),
+                                   compression=compression, threads=4)
+        self.assertEqual(md5sum(path), md5sum(path2))
+
+        if compression == "gzip":
+            # Standard gzip readers decompress all the members
+            with gzopen_without_timestamps(path) as tgz:
+                self.assertEqual(sorted(files), sorted(tgz.getnames()))
+        for stream in (False, True):
+            dest = temp_folder()
+            with open(path, "rb") as f:
+                tar_extract(f, dest, stream=stream)
+            for i in range(20):
+                self.assertEqual(("contents %s\n" % i) * 1000 * i,
+                                 load(os.path.join(dest, "file%s.txt" % i)))
+
     def test_path_exists(self):
         """
         Unit test of path_exists
@@ -215,6 +215,42 @@ VAR2=23
         self.assertListEqual(["sysdep1"], list(deps_cpp_info["dep1"].system_libs))
         self.assertListEqual(["sysdep2", "sysdep3"], list(deps_cpp_info["dep2"].system_libs))
 
+    def test_deps_cpp_info_merge_order(self):
+        deps_cpp_info = DepsCppInfo()
+        for name, libs, flags in (("dep1", ["a", "b", "m"], ["-framework", "A", "-g"]),
+                                  ("dep2", ["b", "c", "m"], ["-framework", "B"]),
+                                  ("dep3", ["a"], ["-g", "-O2"])):
+            info = CppInfo(name, "folder")
+            info.libs = libs
+            info.exelinkflags = flags
+            deps_cpp_info.add(name, DepCppInfo(info))
+            if name == "dep2":  # Reading the values in the middle doesn't change the result
+                self.assertListEqual(["a", "b", "c", "m"], deps_cpp_info.libs)
+        # The last appearance wins, duplicates of the same package are kept
+        self.assertListEqual(["b", "c", "m", "a"], deps_cpp_info.libs)
+        # The flags are in reverse order, the first appearance wins
+        self.assertListEqual(["-O2", "B", "-framework", "A", "-g"], deps_cpp_info.exelinkflags)
+
+    def test_update_deps_cpp_info(self):
+        def merged(*deps):
+            result = DepsCppInfo()
+            for name, libs in deps:
+                info = CppInfo(name, "folder")
+                info.libs = libs
+                info.exelinkflags = ["-" + name]
+                result.add(name, DepCppInfo(info))
+            return result
+
+        deps = [("dep1", ["a", "b"]), ("dep2", ["b", "c"]), ("dep3", ["a"])]
+        expected = merged(*deps)
+        # Adding the already merged info of a block of dependencies is the same as adding them
+        deps_cpp_info = merged(deps[0])
+        deps_cpp_info.update_deps_cpp_info(merged(*deps[1:]))
+        self.assertEqual(["dep1", "dep2", "dep3"], list(deps_cpp_info.deps))
+        self.assertListEqual(expected.libs, deps_cpp_info.libs)
+        self.assertListEqual(expected.exelinkflags, deps_cpp_info.exelinkflags)
+        self.assertListEqual(expected.rootpaths, deps_cpp_info.rootpaths)
+
     def test_cpp_info_name(self):
         folder = temp_folder()
         info = CppInfo("myname", folder)
@@ -145,3 +145,29 @@ class EnvInfoTest(unittest.TestCase):
         self.assertEqual(env.vars, {"foo": ["var", "var2", "new_value"],
                                      "foo2": "var4", "foo3": ["var3"],
                                      "foo63": "other"})
+
+    def test_update_deps_env_info(self):
+        def deps_env_info(*deps):
+            result = DepsEnvInfo()
+            for name, path, var in deps:
+                env_info = EnvInfo()
+                env_info.PATH.append(path)
+                if var is not None:
+                    env_info.MYVAR = var
+                result.update(env_info, name)
+            return result
+
+        deps = [("dep1", "path1", None), ("dep2", "path2", "value2"), ("dep3", "path3", "value3")]
+        expected = deps_env_info(*deps)
+        # Adding the already merged info of a block of dependencies is the same as adding them
+        env = deps_env_info(deps[0])
+        env.update_deps_env_info(deps_env_info(*deps[1:]))
+        self.assertEqual(["dep1", "dep2", "dep3"], list(env.deps))
+        self.assertEqual(expected.vars, env.vars)
+        self.assertEqual({"PATH": ["path1", "path2", "path3"], "MYVAR": "value2"}, env.vars)
+
+        # A variable already defined as a list gets the values of the block appended
+        env = DepsEnvInfo()
+        env.MYVAR = ["first"]
+        env.update_deps_env_info(deps_env_info(*deps[1:]))
+        self.assertEqual(["first", "value2", "value3"], env.vars["MYVAR"])
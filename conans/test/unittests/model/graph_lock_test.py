@@ -0,0 +1,36 @@
+import unittest
+
+from conans.errors import ConanException
+from conans.model.graph_lock import GraphLock
+from conans.model.ref import ConanFileReference
+
+
+class GraphLockLookupTest(unittest.TestCase):
+
+    def setUp(self):
+        data = {"nodes": {"0": {"path": "conanfile.txt", "requires": ["1", "2"]},
+                          "1": {"ref": "pkg/1.0@user/testing#rrev1", "requires": ["3"],
+                                "context": "host"},
+                          "2": {"ref": "app/1.0@user/testing", "path": "conanfile.py",
+                                "context": "host"},
+                          "3": {"ref": "dep/1.0@user/testing#rrev3", "context": "host"}},
+                "revisions_enabled": True}
+        self.graph_lock = GraphLock.deserialize(data, revisions_enabled=True)
+
+    def test_get_consumer(self):
+        self.assertEqual("0", self.graph_lock.get_consumer(None))
+        self.assertEqual("1", self.graph_lock.get_consumer(
+            ConanFileReference.loads("pkg/1.0@user/testing")))
+        # Only by name, when it is a local consumer
+        self.assertEqual("2", self.graph_lock.get_consumer(
+            ConanFileReference.loads("app/2.0@other/stable")))
+        with self.assertRaisesRegex(ConanException, "Couldn't find 'dep/2.0@user/testing'"):
+            self.graph_lock.get_consumer(ConanFileReference.loads("dep/2.0@user/testing"))
+
+    def test_update_exported_ref(self):
+        new_ref = ConanFileReference.loads("app/1.0@user/testing#rrev2")
+        self.graph_lock.update_exported_ref("2", new_ref)
+        self.assertEqual("2", self.graph_lock._find_node_by_requirement(new_ref))
+        # The local consumer has not path anymore, cannot be found only by name
+        with self.assertRaisesRegex(ConanException, "Couldn't find 'app/2.0@other/stable'"):
+            self.graph_lock.get_consumer(ConanFileReference.loads("app/2.0@other/stable"))
@@ -280,6 +280,50 @@ class OptionsValuesTest(unittest.TestCase):
         Boost:thread.multi=off
         """)
 
+    def test_copy_on_write(self):
+        copy = self.sut.copy()
+        copy.static = False
+        copy["Boost"].thread = False
+        copy["Poco"].remove("deps_bundled")
+        copy["Boost"].update(PackageOptionValues())
+        self.assertEqual(self.sut.dumps(), "optimized=3\nstatic=True\nBoost:static=False\n"
+                                           "Boost:thread=True\nBoost:thread.multi=off\n"
+                                           "Poco:deps_bundled=True")
+        self.assertEqual(copy.dumps(), "optimized=3\nstatic=False\nBoost:static=False\n"
+                                       "Boost:thread=False\nBoost:thread.multi=off")
+        # Modifying the original doesn't modify the copies either
+        copy = self.sut.copy()
+        self.sut.clear()
+        self.assertEqual(self.sut.dumps(), "")
+        self.assertIn("Boost:thread=True", copy.dumps())
+
+        values = PackageOptionValues()
+        values.add_option("shared", True)
+        copy = values.copy()
+        values.propagate_upstream(copy, "down/1.0", "own/1.0", "own")
+        self.assertEqual(copy.items(), [("shared", "True")])
+        down = PackageOptionValues()
+        down.add_option("shared", False)
+        copy.propagate_upstream(down, "down/1.0", "own/1.0", "own")
+        self.assertEqual(values.items(), [("shared", "True")])
+        self.assertEqual(copy.items(), [("shared", "False")])
+        with six.assertRaisesRegex(self, ConanException, "already assigned to False"):
+            copy.propagate_upstream(values, "other/1.0", "own/1.0", "own")
+
+    def test_sha_memo(self):
+        sha = self.sut.sha
+        copy = self.sut.copy()
+        # The copies share the computed sha while they are not modified
+        self.assertIs(copy._package_values._sha, self.sut._package_values._sha)
+        self.assertEqual(copy.sha, sha)
+        copy.static = False
+        self.assertNotEqual(copy.sha, sha)
+        self.assertEqual(self.sut.sha, sha)
+        self.sut.static = False
+        self.assertEqual(self.sut.sha, copy.sha)
+        copy.clear()
+        self.assertEqual(copy.sha, OptionsValues("").sha)
+
     def test_from_list(self):
         option_values = OptionsValues(self.sut.as_list())
         self.assertEqual(option_values.dumps(), self.sut.dumps())
@@ -153,6 +153,32 @@ class SettingsTest(unittest.TestCase):
                 "os": ["Windows", "Linux"]}
         self.sut = Settings(data)
 
+    def test_copy_on_write(self):
+        self.sut.compiler = "gcc"
+        copy = self.sut.copy()
+        self.assertIs(copy._data, self.sut._data)
+        copy.compiler.arch = "x86"
+        copy.compiler.arch.speed = "A"
+        copy.compiler.remove("Visual Studio")
+        copy.compiler.version.remove("4.8")
+        copy.remove("os")
+        self.assertEqual(copy.values_list, [("compiler", "gcc"), ("compiler.arch", "x86"),
+                                            ("compiler.arch.speed", "A")])
+        self.assertEqual(copy.compiler.values_range, ["gcc"])
+        self.assertEqual(copy.compiler.version.values_range, ["4.9"])
+        # The original is not modified
+        self.assertEqual(self.sut.values_list, [("compiler", "gcc")])
+        self.assertEqual(self.sut.fields, ["compiler", "os"])
+        self.assertEqual(self.sut.compiler.values_range, ["Visual Studio", "gcc"])
+        self.assertEqual(self.sut.compiler.version.values_range, ["4.8", "4.9"])
+        self.sut.compiler.arch = "x64"
+        self.assertEqual(self.sut.compiler.arch.speed.values_range, ["C", "D"])
+        # Neither a copy of the modified copy
+        copy2 = copy.copy()
+        copy2.compiler.arch.speed = "B"
+        self.assertEqual(copy.compiler.arch.speed, "A")
+        self.assertEqual(copy2.compiler.arch.speed, "B")
+
     def test_in_contains(self):
         self.sut.compiler = "Visual Studio"
         self.assertTrue("Visual" in self.sut.compiler)
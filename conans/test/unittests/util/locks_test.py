@@ -0,0 +1,100 @@
+import multiprocessing
+import os
+import platform
+import threading
+import time
+import unittest
+
+from conans.client.cache.cache import ClientCache
+from conans.client.tools import environment_append
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.mocks import TestBufferConanOutput
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, save
+from conans.util.locks import FcntlReadLock, FcntlWriteLock, LockBusy
+
+
+def _update_counter(cache_folder, iterations):
+    """ one of the concurrent processes: a read-modify-write of a counter under the write lock
+    of the recipe, some readers and the lock of a package
+    """
+    with environment_append({"CONAN_CACHE_LOCKS": "fcntl"}):
+        cache = ClientCache(cache_folder, TestBufferConanOutput())
+        ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        layout = cache.package_layout(ref)
+        counter = os.path.join(cache_folder, "counter.txt")
+        for _ in range(iterations):
+            with layout.conanfile_write_lock(TestBufferConanOutput()):
+                value = int(load(counter))
+                save(counter, str(value + 1))
+            for _ in range(3):
+                with layout.conanfile_read_lock(TestBufferConanOutput()):
+                    int(load(counter))
+            with layout.package_lock(PackageReference(ref, "id")):
+                pass
+
+
+@unittest.skipIf(platform.system() == "Windows", "Requires fcntl")
+class FcntlLocksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = os.path.join(temp_folder(), "pkg", "0.1", "user", "testing")
+        self.output = TestBufferConanOutput()
+
+    def test_shared_readers(self):
+        with FcntlReadLock(self.folder, "pkg/0.1", self.output):
+            with FcntlReadLock(self.folder, "pkg/0.1", self.output):
+                pass
+            with self.assertRaises(LockBusy):
+                with FcntlWriteLock(self.folder, "pkg/0.1", self.output, blocking=False):
+                    pass
+        with FcntlWriteLock(self.folder, "pkg/0.1", self.output, blocking=False):
+            pass
+        self.assertEqual("", str(self.output))
+        self.assertEqual((self.folder + ".lock", ),
+                         FcntlWriteLock(self.folder, "pkg/0.1", self.output).files)
+
+    def test_blocking_writer(self):
+        entered = threading.Event()
+        release = threading.Event()
+        events = []
+
+        def reader():
+            with FcntlReadLock(self.folder, "pkg/0.1", self.output):
+                entered.set()
+                release.wait()
+                time.sleep(0.1)
+                events.append("read")
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        entered.wait()
+        release.set()
+        with FcntlWriteLock(self.folder, "pkg/0.1", self.output):
+            events.append("write")
+        thread.join()
+        self.assertEqual(["read", "write"], events)
+        self.assertIn("pkg/0.1 is locked by another concurrent conan process, wait...",
+                      self.output)
+
+    def test_released_on_error(self):
+        with self.assertRaises(ValueError):
+            with FcntlWriteLock(self.folder, "pkg/0.1", self.output):
+                raise ValueError()
+        # Other processes might be waiting for it, removing it would let two writers in
+        self.assertTrue(os.path.exists(self.folder + ".lock"))
+        with FcntlWriteLock(self.folder, "pkg/0.1", self.output, blocking=False):
+            pass
+
+    def test_concurrent_processes(self):
+        cache_folder = temp_folder()
+        save(os.path.join(cache_folder, "counter.txt"), "0")
+        processes = [multiprocessing.Process(target=_update_counter, args=(cache_folder, 20))
+                     for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual([0] * 4, [process.exitcode for process in processes])
+        # No lost updates, the writers excluded each other
+        self.assertEqual("80", load(os.path.join(cache_folder, "counter.txt")))
@@ -75,10 +75,10 @@ class Pkg(ConanFile):
         package = server.server_store.package(pref)
         save_files(package, {"conaninfo.txt": "#",
                              "conanmanifest.txt": "1",
-                             "conan_package.txz": "#"})
+                             "conan_package.tbz2": "#"})
         client.run("install Pkg/0.1@user/channel", assert_error=True)
         self.assertIn("ERROR: This Conan version is not prepared to handle "
-                      "'conan_package.txz' file format", client.out)
+                      "'conan_package.tbz2' file format", client.out)
 
     @unittest.skipUnless(six.PY3, "only Py3")
     def test(self):
@@ -100,7 +100,7 @@ class TestingResponse(object):
 
     @property
     def ok(self):
-        return self.test_response.status_code == 200
+        return self.test_response.status_code in (200, 206)  # 206 for Range requests
 
     def raise_for_status(self):
         """Raises stored :class:`HTTPError`, if one occurred."""
@@ -42,3 +42,13 @@ def timedelta_from_text(interval):
             return datetime.timedelta(days=float(value))
     except Exception:
         raise ConanException("Incorrect time interval definition: %s" % interval)
+
+
+def size_from_text(size):
+    """ "500MB", "10G", "1024" (bytes) to bytes
+    """
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)B?\s*$", size, re.IGNORECASE)
+    if not match:
+        raise ConanException("Incorrect size definition: %s" % size)
+    exponent = " KMGT".index(match.group(2).upper() or " ")
+    return int(float(match.group(1)) * 1024 ** exponent)
@@ -9,8 +9,12 @@ import stat
 import sys
 import tarfile
 import tempfile
+import zlib
 
 
+from collections import deque
+from io import BytesIO
+from multiprocessing.pool import ThreadPool
 from os.path import abspath, join as joinpath, realpath
 from contextlib import contextmanager
 
@@ -18,6 +22,14 @@ import six
 
 from conans.util.log import logger
 
+try:
+    import zstandard
+except ImportError:  # zstandard is an optional dependency, only needed for zstd archives
+    zstandard = None
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_MAGIC = b"\x1f\x8b"
+
 
 def walk(top, **kwargs):
     if six.PY2:
@@ -342,9 +354,157 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None,
     return t
 
 
-def tar_extract(fileobj, destination_dir):
+def _gzip_block(data, compresslevel):
+    out = BytesIO()
+    gzip_file = gzip.GzipFile(fileobj=out, mode="wb", compresslevel=compresslevel, mtime=0)
+    gzip_file.write(data)
+    gzip_file.close()
+    return out.getvalue()
+
+
+class _ParallelGzipWriter(object):
+    """ Compresses the written data in independent gzip members of block_size bytes, using a pool
+    of threads, and writes them in order to fileobj. The result is a standard multi-member gzip
+    file, that any gzip reader can decompress
+    """
+    block_size = 1024 * 1024
+
+    def __init__(self, fileobj, compresslevel, threads):
+        self._fileobj = fileobj
+        self._compresslevel = compresslevel
+        self._pool = ThreadPool(threads)
+        self._max_pending = 2 * threads  # Bounds the memory used by the blocks being compressed
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._pos = 0
+
+    def tell(self):
+        return self._pos
+
+    def write(self, data):
+        self._buffer += data
+        self._pos += len(data)
+        while len(self._buffer) >= self.block_size:
+            block = bytes(self._buffer[:self.block_size])
+            del self._buffer[:self.block_size]
+            self._submit(block)
+        return len(data)
+
+    def _submit(self, block):
+        self._pending.append(self._pool.apply_async(_gzip_block, (block, self._compresslevel)))
+        while len(self._pending) >= self._max_pending:
+            self._fileobj.write(self._pending.popleft().get())
+
+    def close(self):
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer = bytearray()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().get())
+        finally:
+            self._pool.close()
+            self._pool.join()
+
+
+def parallel_gzopen_without_timestamps(name, fileobj, threads, compresslevel=None):
+    """ Same as gzopen_without_timestamps() for writing, but the compression is done in several
+    threads, each one compressing a different block of the tar file
+    """
+    compresslevel = compresslevel or int(os.getenv("CONAN_COMPRESSION_LEVEL", 9))
+    gzip_file = _ParallelGzipWriter(fileobj, compresslevel, threads)
+    t = tarfile.TarFile.taropen(name, "w", gzip_file, format=tarfile.GNU_FORMAT)
+    t._extfileobj = False  # closing the tar will compress the last block
+    return t
+
+
+class _GzipMembersReader(object):
+    """ Decompresses a gzip stream made of one or several members, as the ones written by
+    parallel_gzopen_without_timestamps(). The tarfile stream mode only reads the first member
+    """
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._buffer = b""
+        self._offset = 0
+
+    def read(self, size=-1):
+        if size is None:
+            size = -1
+        while size < 0 or len(self._buffer) - self._offset < size:
+            data = self._fileobj.read(64 * 1024)
+            if not data:
+                break
+            chunks = [self._buffer[self._offset:], self._decompressor.decompress(data)]
+            while self._decompressor.unused_data:  # A new member starts
+                data = self._decompressor.unused_data
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                chunks.append(self._decompressor.decompress(data))
+            self._buffer = b"".join(chunks)
+            self._offset = 0
+        end = len(self._buffer) if size < 0 else min(self._offset + size, len(self._buffer))
+        ret = self._buffer[self._offset:end]
+        self._offset = end
+        return ret
+
+
+def _zstandard():
+    if zstandard is None:
+        raise ImportError("The 'zstandard' python package is needed to handle zstd archives, "
+                          "install it with 'pip install zstandard'")
+    return zstandard
+
+
+def taropen_without_timestamps(name, compression, fileobj, compresslevel=None, threads=None):
+    """ Opens a tar file to be written in fileobj, compressed with the given compression:
+    "xz", "zstd" or "none" (gzip is gzopen_without_timestamps()). As gzopen_without_timestamps(),
+    the result only depends on the contents, so the checksums do not change if the files are
+    the same. The zstd compression can use several threads
+    """
+    if compresslevel is None:
+        compresslevel = os.getenv("CONAN_COMPRESSION_LEVEL")
+        compresslevel = int(compresslevel) if compresslevel is not None else None
+    if compression == "none":
+        return tarfile.TarFile.taropen(name, "w", fileobj, format=tarfile.GNU_FORMAT)
+    if compression == "xz":
+        return tarfile.TarFile.xzopen(name, "w", fileobj, preset=compresslevel,
+                                      format=tarfile.GNU_FORMAT)
+    if compression == "zstd":
+        params = {"level": compresslevel} if compresslevel is not None else {}
+        if threads and threads > 1:
+            params["threads"] = threads
+        compressor = _zstandard().ZstdCompressor(**params)
+        zstd_file = compressor.stream_writer(fileobj, closefd=False)
+        t = tarfile.TarFile.taropen(name, "w", zstd_file, format=tarfile.GNU_FORMAT)
+        t._extfileobj = False  # closing the tar will flush the zstd frame
+        return t
+    raise ValueError("Unknown compression format '%s'" % compression)
+
+
+class _HeadReader(object):
+    """ Reads from fileobj, but returning first the already read head bytes
+    """
+    def __init__(self, head, fileobj):
+        self._head = head
+        self._fileobj = fileobj
+
+    def read(self, size=-1):
+        if not self._head:
+            return self._fileobj.read(size)
+        if size is None or size < 0:
+            ret, self._head = self._head + self._fileobj.read(), b""
+            return ret
+        ret, self._head = self._head[:size], self._head[size:]
+        if len(ret) < size:
+            ret += self._fileobj.read(size - len(ret))
+        return ret
+
+
+def tar_extract(fileobj, destination_dir, stream=False):
     """Extract tar file controlling not absolute paths and fixing the routes
-    if the tar was zipped in windows"""
+    if the tar was zipped in windows. With stream=True the fileobj is read sequentially, without
+    seeking, so it can be a non-seekable stream as a network response. Besides the compressions
+    supported by tarfile, zstd compressed tars are also detected and extracted"""
     def badpath(path, base):
         # joinpath will ignore base if path is absolute
         return not realpath(abspath(joinpath(base, path))).startswith(base)
@@ -361,7 +521,19 @@ def tar_extract(fileobj, destination_dir):
                 finfo.name = finfo.name.replace("\\", "/")
                 yield finfo
 
-    the_tar = tarfile.open(fileobj=fileobj)
+    head = fileobj.read(len(_ZSTD_MAGIC))
+    if head == _ZSTD_MAGIC:
+        decompressor = _zstandard().ZstdDecompressor()
+        fileobj = decompressor.stream_reader(_HeadReader(head, fileobj))
+        stream = True
+    elif stream and head[:2] == _GZIP_MAGIC:
+        fileobj = _GzipMembersReader(_HeadReader(head, fileobj))
+    elif stream:
+        fileobj = _HeadReader(head, fileobj)
+    else:
+        fileobj.seek(-len(head), os.SEEK_CUR)
+
+    the_tar = tarfile.open(fileobj=fileobj, mode="r|*" if stream else "r")
     # NOTE: The errorlevel=2 has been removed because it was failing in Win10, it didn't allow to
     # "could not change modification time", with time=0
     # the_tar.errorlevel = 2  # raise exception if any error
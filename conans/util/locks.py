@@ -1,10 +1,24 @@
+import errno
 import os
 import time
 
 import fasteners
 
-from conans.util.files import load, save
+from conans.util.files import load, mkdir, save
 from conans.util.log import logger
+from conans.util.tracer import log_lock_wait
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FCNTL_LOCK_EXTENSION = ".lock"
+
+
+class LockBusy(Exception):
+    """ Raised entering a non-blocking lock held by another process
+    """
 
 
 class NoLock(object):
@@ -18,16 +32,39 @@ class NoLock(object):
 
 class SimpleLock(object):
 
-    def __init__(self, filename):
+    def __init__(self, filename, blocking=True):
+        self._filename = filename
         self._lock = fasteners.InterProcessLock(filename, logger=logger)
+        self._blocking = blocking
 
     def __enter__(self):
-        self._lock.acquire()
+        if not self._lock.acquire(blocking=self._blocking):
+            raise LockBusy(self._filename)
 
     def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
         self._lock.release()
 
 
+def _log_lock_wait(locked_item, lock_type, duration):
+    logger.debug("LOCK: waited %.3fs for the %s lock of %s" % (duration, lock_type, locked_item))
+    log_lock_wait(str(locked_item), lock_type, duration)
+
+
+def _remove_lock_files(files):
+    try:
+        for f in files:
+            os.remove(f)
+        path = os.path.dirname(files[0])
+        for _ in range(3):
+            try:  # Take advantage that os.rmdir does not delete non-empty dirs
+                os.rmdir(path)
+            except Exception:
+                break  # not empty
+            path = os.path.dirname(path)
+    except Exception:
+        pass
+
+
 READ_BUSY_DELAY = 0.5
 WRITE_BUSY_DELAY = 0.25
 
@@ -35,18 +72,21 @@ WRITE_BUSY_DELAY = 0.25
 class Lock(object):
 
     @staticmethod
-    def clean(folder):
+    def clean(folder, fcntl_locks=False):
         if os.path.exists(folder + ".count"):
             os.remove(folder + ".count")
         if os.path.exists(folder + ".count.lock"):
             os.remove(folder + ".count.lock")
+        if fcntl_locks and os.path.exists(folder + FCNTL_LOCK_EXTENSION):
+            os.remove(folder + FCNTL_LOCK_EXTENSION)
 
-    def __init__(self, folder, locked_item, output):
+    def __init__(self, folder, locked_item, output, blocking=True):
         self._count_file = folder + ".count"
         self._count_lock_file = folder + ".count.lock"
         self._locked_item = locked_item
         self._output = output
         self._first_lock = True
+        self._blocking = blocking
 
     @property
     def files(self):
@@ -58,6 +98,11 @@ class Lock(object):
             self._output.info("%s is locked by another concurrent conan process, wait..."
                               % str(self._locked_item))
             self._output.info("If not the case, quit, and do 'conan remove --locks'")
+            self._wait_start = time.time()
+
+    def _log_wait(self, lock_type):
+        if not self._first_lock:
+            _log_lock_wait(self._locked_item, lock_type, time.time() - self._wait_start)
 
     def _readers(self):
         try:
@@ -80,6 +125,7 @@ class ReadLock(Lock):
                     break
             self._info_locked()
             time.sleep(READ_BUSY_DELAY)
+        self._log_wait("read")
 
     def __exit__(self, exc_type, exc_val, exc_tb):   # @UnusedVariable
         with fasteners.InterProcessLock(self._count_lock_file, logger=logger):
@@ -96,8 +142,11 @@ class WriteLock(Lock):
                 if readers == 0:
                     save(self._count_file, "-1")
                     break
+            if not self._blocking:
+                raise LockBusy(str(self._locked_item))
             self._info_locked()
             time.sleep(WRITE_BUSY_DELAY)
+        self._log_wait("write")
 
     def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
         with fasteners.InterProcessLock(self._count_lock_file, logger=logger):
@@ -106,15 +155,71 @@ class WriteLock(Lock):
         if exc_type is not None:
             # If there was an exception while locking this, might be empty
             # Try to clean up the trailing filelocks
+            _remove_lock_files(self.files)
+
+
+class FcntlLock(object):
+    """ shared (readers) or exclusive (writer) flock() of the 'folder.lock' file. Waiting is done
+    by the kernel, there is no polling and nothing is written, and the lock is released if the
+    process dies, so there are no stale locks to clean. Not available in Windows.
+
+    flock() is used instead of the POSIX record locks (lockf) because the latter belong to the
+    process: the threads of the same process wouldn't exclude each other and closing any
+    descriptor of the file would release all of them
+    """
+
+    def __init__(self, folder, locked_item, output, shared=False, blocking=True):
+        self._lock_file = folder + FCNTL_LOCK_EXTENSION
+        self._locked_item = locked_item
+        self._output = output
+        self._shared = shared
+        self._blocking = blocking
+        self._fd = None
+
+    @property
+    def files(self):
+        return self._lock_file,
+
+    def __enter__(self):
+        mkdir(os.path.dirname(self._lock_file))
+        fd = os.open(self._lock_file, os.O_RDWR | os.O_CREAT, 0o666)
+        operation = fcntl.LOCK_SH if self._shared else fcntl.LOCK_EX
+        try:
             try:
-                os.remove(self._count_file)
-                os.remove(self._count_lock_file)
-                path = os.path.dirname(self._count_file)
-                for _ in range(3):
-                    try:  # Take advantage that os.rmdir does not delete non-empty dirs
-                        os.rmdir(path)
-                    except Exception:
-                        break  # not empty
-                    path = os.path.dirname(path)
-            except Exception:
-                pass
+                fcntl.flock(fd, operation | fcntl.LOCK_NB)
+            except (IOError, OSError) as e:
+                if e.errno not in (errno.EAGAIN, errno.EACCES, errno.EWOULDBLOCK):
+                    raise
+                if not self._blocking:
+                    raise LockBusy(str(self._locked_item))
+                if self._output:
+                    self._output.info("%s is locked by another concurrent conan process, wait..."
+                                      % str(self._locked_item))
+                t1 = time.time()
+                fcntl.flock(fd, operation)
+                _log_lock_wait(self._locked_item, "read" if self._shared else "write",
+                               time.time() - t1)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
+        fd, self._fd = self._fd, None
+        # The lock file is never removed here (not even after an exception, as WriteLock does),
+        # other processes might be waiting in flock() for this inode, and a new one would let
+        # two writers in. Only 'conan remove --locks' removes them
+        os.close(fd)  # Releases the lock
+
+
+class FcntlReadLock(FcntlLock):
+
+    def __init__(self, folder, locked_item, output):
+        super(FcntlReadLock, self).__init__(folder, locked_item, output, shared=True)
+
+
+class FcntlWriteLock(FcntlLock):
+
+    def __init__(self, folder, locked_item, output, blocking=True):
+        super(FcntlWriteLock, self).__init__(folder, locked_item, output, shared=False,
+                                             blocking=blocking)
@@ -60,6 +60,13 @@ class Progress(object):
             self._last_time = time.time()
             self._output.write(TIMEOUT_BEAT_CHARACTER)
 
+    def update_size(self, size):
+        """ for data that is not consumed through update(), as the concurrent segments of a
+        download. Not thread safe, the callers have to synchronize it
+        """
+        self._processed_size += size
+        self._pb_update(size)
+
     def update(self, chunks):
         for chunk in chunks:
             yield chunk
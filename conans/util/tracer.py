@@ -21,7 +21,9 @@ TRACER_ACTIONS = ["UPLOADED_RECIPE", "UPLOADED_PACKAGE",
                   "REST_API_CALL", "COMMAND",
                   "EXCEPTION",
                   "DOWNLOAD",
-                  "UNZIP", "ZIP"]
+                  "UNZIP", "ZIP",
+                  "PACKAGE_IDS_COMPUTED",
+                  "LOCK_WAIT"]
 
 MASKED_FIELD = "**********"
 
@@ -136,7 +138,7 @@ def log_package_built(pref, duration, log_run=None):
                    {"_id": repr(pref.copy_clear_revs()), "duration": duration, "log": log_run})
 
 
-def log_client_rest_api_call(url, method, duration, headers):
+def log_client_rest_api_call(url, method, duration, headers, connection_stats=None):
     headers = copy.copy(headers)
     if "Authorization" in headers:
         headers["Authorization"] = MASKED_FIELD
@@ -144,8 +146,14 @@ def log_client_rest_api_call(url, method, duration, headers):
         headers["X-Client-Anonymous-Id"] = MASKED_FIELD
     if "signature=" in url:
         url = url.split("signature=")[0] + "signature=%s" % MASKED_FIELD
-    _append_action("REST_API_CALL", {"method": method, "url": url,
-                                     "duration": duration, "headers": headers})
+    action = {"method": method, "url": url, "duration": duration, "headers": headers}
+    if connection_stats:
+        # Accumulated for all the calls: connections opened and requests done through them
+        action["connections"] = connection_stats["connections"]
+        action["requests"] = connection_stats["requests"]
+        action["reused_connections"] = connection_stats["requests"] - \
+            connection_stats["connections"]
+    _append_action("REST_API_CALL", action)
 
 
 def log_command(name, parameters):
@@ -173,3 +181,16 @@ def log_compressed_files(files, duration, tgz_path):
     files = files or {}
     files_compressed = [_file_document(name, path) for name, path in files.items()]
     _append_action("ZIP", {"src": files_compressed, "dst": tgz_path, "duration": duration})
+
+
+def log_package_ids_computed(computed, duration, package_id_methods_duration, slowest):
+    """ accumulated for the whole command, slowest are the [ref, duration] of the recipes with
+    the most expensive package_id() methods
+    """
+    _append_action("PACKAGE_IDS_COMPUTED", {"computed": computed, "duration": duration,
+                                            "package_id_methods": package_id_methods_duration,
+                                            "slowest": slowest})
+
+
+def log_lock_wait(locked_item, lock_type, duration):
+    _append_action("LOCK_WAIT", {"item": locked_item, "lock": lock_type, "duration": duration})